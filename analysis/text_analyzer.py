@@ -1,12 +1,74 @@
-import sys
-import os
 import json
 import re
+import threading
+import time
 from collections import Counter
 
-# 상위 디렉토리 추가하여 api 모듈 import 가능하게 함
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from api.gemini_client import GeminiClient
+from api.gemini_client import GeminiClient, estimate_tokens, parse_json_text, response_text
+from cache.result_cache import normalize_passage
+from monitoring.metrics import metrics
+
+# 분석 결과의 단어 정보에서 단어/구문을 담는 키
+ENTRY_WORD_KEYS = ("word", "phrase", "term", "expression", "단어", "구문", "단어/구문")
+
+def split_sentences(text):
+    """
+    지문을 문장 단위로 분리 (공백/줄바꿈 차이는 무시)
+    
+    Args:
+        text (str): 지문
+        
+    Returns:
+        list: 문장 목록
+    """
+    return [sentence for sentence in re.split(r'(?<=[.!?])\s+', normalize_passage(text)) if sentence]
+
+def _entry_word(item):
+    """분석 결과 항목의 단어/구문 (단어 정보가 아니면 None)"""
+    if isinstance(item, dict):
+        for key in ENTRY_WORD_KEYS:
+            value = item.get(key)
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+    return None
+
+def _filter_entries(value, lowered_text):
+    """
+    지문에 더 이상 나오지 않는 단어/구문 항목 제거 (중첩된 목록과 dict 포함)
+    """
+    if isinstance(value, dict):
+        return {key: _filter_entries(item, lowered_text) for key, item in value.items()}
+    if isinstance(value, list):
+        return [
+            _filter_entries(item, lowered_text) for item in value
+            if _entry_word(item) is None
+            or re.search(r'(?<!\w)' + re.escape(_entry_word(item).lower()) + r'(?!\w)', lowered_text)
+        ]
+    return value
+
+def _merge_entries(base, delta):
+    """
+    기존 분석 결과에 달라진 문장의 분석 결과 병합
+    목록은 없는 단어/구문만 이어 붙이고, dict는 키별로 병합하며, 그 외 값은 기존 값 유지
+    """
+    if isinstance(base, dict) and isinstance(delta, dict):
+        merged = dict(base)
+        for key, item in delta.items():
+            merged[key] = _merge_entries(base[key], item) if key in base else item
+        return merged
+    if isinstance(base, list) and isinstance(delta, list):
+        known = {_entry_word(item).lower() for item in base if _entry_word(item) is not None}
+        merged = list(base)
+        for item in delta:
+            word = _entry_word(item)
+            if word is None:
+                if item not in merged:
+                    merged.append(item)
+            elif word.lower() not in known:
+                known.add(word.lower())
+                merged.append(item)
+        return merged
+    return base if base is not None else delta
 
 class TextAnalyzer:
     """
@@ -14,14 +76,27 @@ class TextAnalyzer:
     어휘-의미-문법-구문적 측면을 분석하여 갭필 문제 생성을 위한 데이터 제공
     """
     
-    def __init__(self, gemini_client=None):
+    def __init__(self, gemini_client=None, batch_token_budget=6000, max_batch_size=5):
         """
         TextAnalyzer 초기화
         
         Args:
             gemini_client (GeminiClient, optional): Gemini API 클라이언트 인스턴스
+            batch_token_budget (int): 배치 분석 요청 하나에 담을 지문의 최대 추정 토큰 수
+            max_batch_size (int): 배치 분석 요청 하나에 담을 최대 지문 수
         """
         self.gemini_client = gemini_client or GeminiClient()
+        self.batch_token_budget = batch_token_budget
+        self.max_batch_size = max_batch_size
+        
+        # 배치 분석 처리량 통계
+        self._stats_lock = threading.Lock()
+        self.batch_stats = {
+            "api_calls": 0,
+            "passages": 0,
+            "fallback_calls": 0,
+            "elapsed_seconds": 0.0
+        }
         
     def analyze(self, text):
         """
@@ -34,10 +109,12 @@ class TextAnalyzer:
             dict: 분석 결과
         """
         # 기본 텍스트 통계 분석
-        basic_stats = self._analyze_basic_stats(text)
+        with metrics.span("analysis.basic_stats"):
+            basic_stats = self._analyze_basic_stats(text)
         
         # Gemini API를 통한 언어적 분석
-        linguistic_analysis = self._analyze_linguistic_features(text)
+        with metrics.span("analysis.linguistic"):
+            linguistic_analysis = self._analyze_linguistic_features(text)
         
         # 분석 결과 통합
         analysis_result = {
@@ -47,6 +124,45 @@ class TextAnalyzer:
         
         return analysis_result
     
+    def analyze_incremental(self, text, base_text, base_analysis):
+        """
+        거의 같은 이전 지문의 분석 결과를 재사용하여 달라진 문장만 분석
+        
+        Args:
+            text (str): 분석할 수능영어 지문
+            base_text (str): 이전에 분석한 유사 지문
+            base_analysis (dict): 유사 지문의 analyze() 결과
+            
+        Returns:
+            dict: 분석 결과 (analyze()와 같은 형식)
+        """
+        base_linguistic = base_analysis.get("linguistic_analysis")
+        if not isinstance(base_linguistic, dict) or not base_linguistic or "raw_analysis" in base_linguistic:
+            # 구조화되지 않은 분석 결과는 병합할 수 없으므로 전체 분석
+            return self.analyze(text)
+        
+        with metrics.span("analysis.basic_stats"):
+            basic_stats = self._analyze_basic_stats(text)
+        
+        base_sentences = set(split_sentences(base_text))
+        changed_sentences = [sentence for sentence in split_sentences(text) if sentence not in base_sentences]
+        metrics.inc("gapfill_incremental_sentences_total", len(changed_sentences))
+        
+        # 삭제되거나 고친 문장에만 있던 단어/구문 제거
+        linguistic_analysis = _filter_entries(base_linguistic, normalize_passage(text).lower())
+        
+        if changed_sentences:
+            with metrics.span("analysis.linguistic_incremental"):
+                delta = self._analyze_linguistic_features(" ".join(changed_sentences))
+            if not delta or "raw_analysis" in delta:
+                return self.analyze(text)
+            linguistic_analysis = _merge_entries(linguistic_analysis, delta)
+        
+        return {
+            "basic_stats": basic_stats,
+            "linguistic_analysis": linguistic_analysis
+        }
+    
     def _analyze_basic_stats(self, text):
         """
         기본 텍스트 통계 분석
@@ -91,33 +207,180 @@ class TextAnalyzer:
         response = self.gemini_client.analyze_text(text)
         
         # 응답 처리
-        if response and 'candidates' in response:
-            for part in response['candidates'][0]['content']['parts']:
-                if 'text' in part:
-                    # JSON 형식 데이터 추출
-                    text_content = part['text']
-                    try:
-                        # JSON 형식 문자열 찾기
-                        json_match = re.search(r'```json\s*([\s\S]*?)\s*```', text_content)
-                        if json_match:
-                            json_str = json_match.group(1)
-                            return json.loads(json_str)
-                        
-                        # 중괄호로 둘러싸인 JSON 찾기
-                        json_match = re.search(r'({[\s\S]*})', text_content)
-                        if json_match:
-                            json_str = json_match.group(1)
-                            return json.loads(json_str)
-                        
-                        # 전체 텍스트가 JSON인지 확인
-                        return json.loads(text_content)
-                    except json.JSONDecodeError:
-                        # JSON 파싱 실패 시 텍스트 그대로 반환
-                        return {"raw_analysis": text_content}
+        text_content = self._get_response_text(response)
+        if text_content is not None:
+            try:
+                return self._parse_json_text(text_content)
+            except json.JSONDecodeError:
+                # JSON 파싱 실패 시 텍스트 그대로 반환
+                return {"raw_analysis": text_content}
         
         # 응답이 없거나 처리 실패 시 빈 결과 반환
         return {}
     
+    def _get_response_text(self, response):
+        """
+        Gemini API 응답에서 첫 번째 텍스트 파트 추출
+        
+        Args:
+            response (dict): Gemini API 응답
+            
+        Returns:
+            str: 응답 텍스트 (없으면 None)
+        """
+        return response_text(response)
+    
+    def _parse_json_text(self, text_content):
+        """
+        응답 텍스트에서 JSON 데이터 추출
+        
+        Args:
+            text_content (str): 응답 텍스트
+            
+        Returns:
+            dict: 파싱된 JSON 데이터
+            
+        Raises:
+            json.JSONDecodeError: JSON 파싱 실패 시
+        """
+        return parse_json_text(text_content)
+    
+    def pack_passages(self, texts):
+        """
+        지문들을 토큰 예산과 최대 지문 수에 맞춰 배치 요청 단위로 묶기
+        
+        Args:
+            texts (list): 지문 목록
+            
+        Returns:
+            list: 지문 목록의 목록 (요청 하나당 하나의 묶음)
+        """
+        groups = []
+        current = []
+        current_tokens = 0
+        
+        for text in texts:
+            tokens = estimate_tokens(text)
+            if current and (current_tokens + tokens > self.batch_token_budget or len(current) >= self.max_batch_size):
+                groups.append(current)
+                current = []
+                current_tokens = 0
+            current.append(text)
+            current_tokens += tokens
+        
+        if current:
+            groups.append(current)
+        
+        return groups
+    
+    def analyze_batch(self, texts):
+        """
+        여러 수능영어 지문을 배치 요청으로 분석
+        
+        Args:
+            texts (list): 분석할 지문 목록
+            
+        Returns:
+            list: 지문별 분석 결과 (입력 순서와 동일, analyze()와 같은 형식)
+        """
+        results = []
+        for group in self.pack_passages(texts):
+            with metrics.span("analysis.linguistic_batch"):
+                linguistic_analyses = self._analyze_linguistic_features_batch(group)
+            for text, linguistic_analysis in zip(group, linguistic_analyses):
+                results.append({
+                    "basic_stats": self._analyze_basic_stats(text),
+                    "linguistic_analysis": linguistic_analysis
+                })
+        return results
+    
+    def _analyze_linguistic_features_batch(self, texts):
+        """
+        Gemini API 한 번의 호출로 여러 지문의 언어적 특성 분석
+        응답을 지문별로 나누지 못하면 해당 지문만 단일 호출로 다시 분석
+        
+        Args:
+            texts (list): 분석할 지문 목록
+            
+        Returns:
+            list: 지문별 언어적 특성 분석 결과
+        """
+        start_time = time.perf_counter()
+        passage_ids = [f"p{i + 1}" for i in range(len(texts))]
+        results = {}
+        api_calls = 0
+        
+        if len(texts) > 1:
+            response = self.gemini_client.analyze_texts(list(zip(passage_ids, texts)))
+            api_calls += 1
+            results = self._split_batch_response(response, passage_ids)
+        
+        # 분리되지 않은 지문은 단일 호출로 대체
+        fallback_calls = 0
+        for passage_id, text in zip(passage_ids, texts):
+            if passage_id not in results:
+                results[passage_id] = self._analyze_linguistic_features(text)
+                fallback_calls += 1
+        
+        with self._stats_lock:
+            self.batch_stats["api_calls"] += api_calls + fallback_calls
+            self.batch_stats["passages"] += len(texts)
+            self.batch_stats["fallback_calls"] += fallback_calls if len(texts) > 1 else 0
+            self.batch_stats["elapsed_seconds"] += time.perf_counter() - start_time
+        
+        return [results[passage_id] for passage_id in passage_ids]
+    
+    def _split_batch_response(self, response, passage_ids):
+        """
+        배치 분석 응답을 지문별 분석 결과로 분리
+        
+        Args:
+            response (dict): Gemini API 응답
+            passage_ids (list): 요청에 사용한 지문 id 목록
+            
+        Returns:
+            dict: 지문 id별 분석 결과 (분리에 실패한 지문은 포함되지 않음)
+        """
+        text_content = self._get_response_text(response)
+        if text_content is None:
+            return {}
+        
+        try:
+            data = self._parse_json_text(text_content)
+        except json.JSONDecodeError:
+            return {}
+        
+        # {"passages": [{"id": ..., "analysis": ...}]} 형식도 허용
+        if isinstance(data, dict) and isinstance(data.get("passages"), list):
+            data = {
+                item.get("id"): item.get("analysis", item)
+                for item in data["passages"]
+                if isinstance(item, dict)
+            }
+        
+        if not isinstance(data, dict):
+            return {}
+        
+        return {
+            passage_id: data[passage_id]
+            for passage_id in passage_ids
+            if isinstance(data.get(passage_id), dict)
+        }
+    
+    def get_batch_stats(self):
+        """
+        배치 분석 처리량 통계 반환
+        
+        Returns:
+            dict: API 호출 수, 지문 수, 호출당 지문 수, 분당 지문 수
+        """
+        with self._stats_lock:
+            stats = dict(self.batch_stats)
+        
+        stats["passages_per_call"] = stats["passages"] / stats["api_calls"] if stats["api_calls"] else 0
+        stats["passages_per_minute"] = stats["passages"] * 60 / stats["elapsed_seconds"] if stats["elapsed_seconds"] else 0
+        return stats
+    
     def categorize_words(self, analysis_result):
         """
         분석 결과를 바탕으로 단어 분류
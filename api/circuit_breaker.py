@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+from collections import deque
+
+from monitoring.metrics import metrics
+
+class CircuitOpenError(RuntimeError):
+    """
+    Gemini API 회로가 열려 있어 요청을 보내지 않았고, 사용할 수 있는 이전 결과도 없음
+    """
+
+    def __init__(self, retry_after):
+        super().__init__("Gemini API 응답이 불안정하여 잠시 요청을 중단했습니다. 잠시 후 다시 시도해주세요.")
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    Gemini API 회로 차단기
+    최근 요청 중 실패(또는 느린 응답) 비율이 기준을 넘으면 회로를 열어 일정 시간 동안 요청을 바로 거절하고,
+    이후 일부 요청만 시험적으로 보내(half-open) 성공하면 다시 닫음
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_rate=0.5, min_requests=10, window=20, slow_call_seconds=None,
+                 open_seconds=30, half_open_trials=1, clock=time.monotonic):
+        """
+        CircuitBreaker 초기화
+
+        Args:
+            failure_rate (float): 회로를 여는 최근 요청 실패 비율 (0~1)
+            min_requests (int): 실패 비율을 판단하기 위한 최소 요청 수
+            window (int): 실패 비율을 계산할 최근 요청 수
+            slow_call_seconds (float, optional): 이 시간보다 오래 걸린 요청은 실패로 처리 (없으면 지연 시간은 보지 않음)
+            open_seconds (float): 회로를 연 뒤 시험 요청을 보내기까지 기다리는 시간(초)
+            half_open_trials (int): 회로를 닫기 위해 성공해야 하는 시험 요청 수
+            clock (callable): 현재 시각 함수 (테스트용)
+        """
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_trials = half_open_trials
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self.stats = {"opened": 0, "rejected": 0}
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """
+        환경 변수로 생성 (GEMINI_BREAKER_FAILURE_RATE=0이면 사용하지 않음)
+        GEMINI_BREAKER_FAILURE_RATE: 실패 비율 (기본값 0.5), GEMINI_BREAKER_SLOW_SECONDS: 느린 응답 기준(초),
+        GEMINI_BREAKER_OPEN_SECONDS: 차단 시간 (기본값 30)
+
+        Args:
+            environ (dict, optional): 환경 변수 (없으면 os.environ)
+
+        Returns:
+            CircuitBreaker: 회로 차단기 (사용하지 않으면 None)
+        """
+        environ = os.environ if environ is None else environ
+        failure_rate = float(environ.get("GEMINI_BREAKER_FAILURE_RATE", 0.5))
+        if failure_rate <= 0:
+            return None
+        slow_call_seconds = environ.get("GEMINI_BREAKER_SLOW_SECONDS")
+        return cls(
+            failure_rate=failure_rate,
+            slow_call_seconds=float(slow_call_seconds) if slow_call_seconds else None,
+            open_seconds=float(environ.get("GEMINI_BREAKER_OPEN_SECONDS", 30))
+        )
+
+    @property
+    def state(self):
+        """현재 상태 (closed, open, half_open)"""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        """차단 시간이 지난 열린 회로는 half-open으로 전환 (잠금을 잡은 상태에서 호출)"""
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state):
+        """상태 전환 (잠금을 잡은 상태에서 호출)"""
+        self._state = state
+        if state == self.OPEN:
+            self._opened_at = self.clock()
+            self.stats["opened"] += 1
+        elif state == self.HALF_OPEN:
+            self._trials = 0
+            self._trial_successes = 0
+        else:
+            self._outcomes.clear()
+        metrics.inc("gapfill_circuit_transitions_total", state=state)
+
+    def allow(self):
+        """
+        요청을 보내도 되는지 확인 (half-open 상태에서는 시험 요청 수만큼만 허용)
+
+        Returns:
+            bool: 요청 허용 여부
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN and self._trials < self.half_open_trials:
+                self._trials += 1
+                return True
+            if state == self.CLOSED:
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    def is_open(self):
+        """
+        새 요청을 거절하는 상태인지 확인 (열려 있거나, half-open 시험 요청이 모두 진행 중)
+
+        Returns:
+            bool: 요청 거절 여부
+        """
+        with self._lock:
+            state = self._current_state()
+            return state == self.OPEN or (state == self.HALF_OPEN and self._trials >= self.half_open_trials)
+
+    def retry_after(self):
+        """
+        다시 요청해 볼 수 있을 때까지 남은 시간
+
+        Returns:
+            int: 남은 시간(초, 최소 1)
+        """
+        with self._lock:
+            remaining = self.open_seconds - (self.clock() - self._opened_at) if self._state == self.OPEN else 0
+        return max(1, int(remaining + 0.999))
+
+    def record(self, success, elapsed=None):
+        """
+        요청 결과 기록
+
+        Args:
+            success (bool): 응답 성공 여부
+            elapsed (float, optional): 지연 시간(초)
+        """
+        failed = not success or (
+            self.slow_call_seconds is not None and elapsed is not None and elapsed > self.slow_call_seconds
+        )
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN:
+                if failed:
+                    self._transition(self.OPEN)
+                else:
+                    self._trial_successes += 1
+                    if self._trial_successes >= self.half_open_trials:
+                        self._transition(self.CLOSED)
+                return
+            if state == self.OPEN:
+                # 회로를 열기 전에 시작한 요청의 결과는 무시
+                return
+            self._outcomes.append(failed)
+            if len(self._outcomes) >= self.min_requests and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                self._transition(self.OPEN)
+
+    def get_stats(self):
+        """
+        회로 차단기 통계
+
+        Returns:
+            dict: 상태, 회로를 연 횟수, 거절한 요청 수, 최근 실패 비율
+        """
+        with self._lock:
+            state = self._current_state()
+            outcomes = list(self._outcomes)
+            stats = dict(self.stats)
+        stats["state"] = state
+        stats["recent_failure_rate"] = round(sum(outcomes) / len(outcomes), 4) if outcomes else 0.0
+        return stats
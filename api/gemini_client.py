@@ -1,35 +1,282 @@
 import base64
 import os
+import re
+import time
 import requests
 import json
 
+from api.circuit_breaker import CircuitBreaker
+from api.generation_sizing import GenerationSizer
+from api.hedging import HedgingPolicy
+from api.key_pool import KeyPool
+from api.model_router import ModelRouter
+from generator.models import TIER_NAMES, to_serializable
+from monitoring.metrics import metrics
+
+# Gemini API 기본 URL
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+# 지문 분석용 시스템 지시사항 (단일/배치 분석 공통)
+ANALYSIS_SYSTEM_INSTRUCTION = """
+        당신은 영어 교육 전문가로서 수능영어 지문을 분석하는 역할을 합니다.
+        주어진 영어 지문을 다음 언어적 측면에서 분석하세요:
+        1. 어휘-의미적 특성 (내용어, 학술 어휘, 전문 용어)
+        2. 문법-구문적 특성 (구조적 요소, 기능어)
+        3. 담화-화용적 특성 (응집 장치, 태도 표지, 화행)
+        4. 개념-인지적 특성 (은유, 이미지 스키마, 프레임)
+        5. 문화-번역적 특성 (문화 특정적 참조, 번역 과제)
+        
+        분석 결과는 JSON 형식으로 반환하세요. 각 단어나 구문에 대해 다음 정보를 포함하세요:
+        - 단어/구문
+        - 언어적 범주 (위 5가지 중 하나)
+        - 세부 유형 (예: 학술 어휘, 접속사, 은유 등)
+        - 교육적 중요성 (언어 학습자에게 왜 중요한지)
+        - 난이도 (기초, 중급, 고급, 전문가)
+        """
+
+# 여러 지문을 한 번에 분석할 때 추가하는 지시사항
+BATCH_ANALYSIS_INSTRUCTION = """
+        여러 지문이 <passage id="..."> 태그로 구분되어 주어지면, 각 지문을 독립적으로 분석하세요.
+        응답은 지문 id를 키로, 해당 지문의 분석 결과를 값으로 하는 하나의 JSON 객체로 반환하세요.
+        모든 지문 id가 응답에 포함되어야 합니다.
+        """
+
+# 갭필 난이도별 설명 (생성 순서 유지)
+GAPFILL_TIERS = dict(zip(TIER_NAMES, (
+    "기초 단계: 핵심 의미 전달 요소 (기본 어휘)",
+    "중급 단계: 구조적 및 연어 패턴 (문법 요소)",
+    "고급 단계: 담화 구성 및 화용적 특성 (응집성, 일관성)",
+    "전문가 단계: 개념적 이해 및 문화적 뉘앙스 (은유, 함축)"
+)))
+
+TIER_COUNT_WORDS = {1: "한", 2: "두", 3: "세", 4: "네"}
+
+# MAX_TOKENS로 잘린 응답을 이어서 생성할 때의 지시사항
+CONTINUE_INSTRUCTION = "출력 한도에 도달하여 응답이 중간에 끊겼습니다. 앞의 내용을 반복하지 말고 끊긴 지점부터 그대로 이어서 작성하세요."
+
+# 잘린 응답을 이어서 생성하는 최대 횟수
+MAX_CONTINUATIONS = 2
+
+def response_text(response):
+    """
+    Gemini API 응답에서 첫 번째 텍스트 파트 추출
+    
+    Args:
+        response (dict): Gemini API 응답
+        
+    Returns:
+        str: 응답 텍스트 (없으면 None)
+    """
+    if response and 'candidates' in response:
+        for part in response['candidates'][0].get('content', {}).get('parts', []):
+            if 'text' in part:
+                return part['text']
+    return None
+
+def parse_json_text(text_content):
+    """
+    응답 텍스트에서 JSON 데이터 추출 (```json 코드 블록, 중괄호 블록, 전체 텍스트 순)
+    
+    Args:
+        text_content (str): 응답 텍스트
+        
+    Returns:
+        object: 파싱된 JSON 데이터
+        
+    Raises:
+        json.JSONDecodeError: JSON 파싱 실패 시
+    """
+    # JSON 형식 문자열 찾기
+    json_match = re.search(r'```json\s*([\s\S]*?)\s*```', text_content)
+    if json_match:
+        return json.loads(json_match.group(1))
+    
+    # 중괄호로 둘러싸인 JSON 찾기
+    json_match = re.search(r'({[\s\S]*})', text_content)
+    if json_match:
+        return json.loads(json_match.group(1))
+    
+    # 전체 텍스트가 JSON인지 확인
+    return json.loads(text_content)
+
+def finish_reason(response):
+    """
+    Gemini API 응답의 종료 이유 (STOP, MAX_TOKENS 등)
+    
+    Args:
+        response (dict): Gemini API 응답
+        
+    Returns:
+        str: 종료 이유 (없으면 None)
+    """
+    if response and response.get('candidates'):
+        return response['candidates'][0].get('finishReason')
+    return None
+
+def output_token_count(usage):
+    """
+    응답 usageMetadata의 출력 토큰 수 (thinking 모델의 생각 토큰 포함)
+    
+    Args:
+        usage (dict): Gemini API 응답의 usageMetadata
+        
+    Returns:
+        int: candidatesTokenCount + thoughtsTokenCount (생각 토큰도 maxOutputTokens에 포함되고 출력 토큰으로 과금됨)
+    """
+    return usage.get("candidatesTokenCount", 0) + usage.get("thoughtsTokenCount", 0)
+
+def _response_json(response):
+    """응답 텍스트의 JSON 객체 (없거나 파싱 실패 시 None)"""
+    text_content = response_text(response)
+    if text_content is None:
+        return None
+    try:
+        data = parse_json_text(text_content)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def is_valid_json_response(response):
+    """
+    모델 cascade 검증: 응답이 비어 있지 않은 JSON 객체인지 확인
+    """
+    return bool(_response_json(response))
+
+def passage_ids_validator(passage_ids):
+    """
+    모델 cascade 검증 함수 생성: 배치 분석 응답에 모든 지문 id가 있는지 확인
+    
+    Args:
+        passage_ids (list): 지문 id 목록
+        
+    Returns:
+        callable: 응답을 받아 검증 결과를 반환하는 함수
+    """
+    def validate(response):
+        data = _response_json(response)
+        return data is not None and all(isinstance(data.get(passage_id), dict) for passage_id in passage_ids)
+    return validate
+
+def gapfill_validator(tiers):
+    """
+    모델 cascade 검증 함수 생성: 요청한 난이도 수만큼 정답이 있는 난이도 결과가 있는지 확인
+    
+    Args:
+        tiers (list): 요청한 난이도 목록
+        
+    Returns:
+        callable: 응답을 받아 검증 결과를 반환하는 함수
+    """
+    def validate(response):
+        data = _response_json(response)
+        if data is None:
+            return False
+        tier_results = [
+            value for value in data.values()
+            if isinstance(value, dict) and value.get("text") and value.get("answers")
+        ]
+        return len(tier_results) >= len(tiers)
+    return validate
+
+def is_valid_html_response(response):
+    """
+    모델 cascade 검증: 응답에 HTML 문서가 있는지 확인
+    """
+    text_content = (response_text(response) or "").lower()
+    return "<html" in text_content and "</html>" in text_content
+
+def retry_after_seconds(response):
+    """
+    429 응답에서 다시 요청할 수 있을 때까지의 시간 추출 (Retry-After 헤더, 오류 본문의 RetryInfo.retryDelay 순)
+    
+    Args:
+        response (requests.Response): 429 응답
+        
+    Returns:
+        float: 대기 시간(초) (없으면 None)
+    """
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+    try:
+        details = response.json().get("error", {}).get("details", [])
+    except ValueError:
+        return None
+    for detail in details:
+        delay = re.fullmatch(r"([\d.]+)s", str(detail.get("retryDelay", "")))
+        if delay:
+            return float(delay.group(1))
+    return None
+
+def estimate_tokens(text):
+    """
+    텍스트의 대략적인 토큰 수 추정 (영어 기준 약 4자당 1토큰)
+    
+    Args:
+        text (str): 토큰 수를 추정할 텍스트
+        
+    Returns:
+        int: 추정 토큰 수
+    """
+    return len(text) // 4 + 1
+
 class GeminiClient:
     """
     Gemini API 클라이언트 클래스
     수능영어 지문 분석 및 갭필 문제 생성을 위한 Gemini API 통합
     """
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, base_url=None, router=None, hedging=None, circuit_breaker=None, key_pool=None, sizer=None):
         """
         GeminiClient 초기화
         
         Args:
             api_key (str, optional): Gemini API 키. 없으면 환경 변수에서 가져옴
+            base_url (str, optional): API 기본 URL. 없으면 환경 변수 GEMINI_API_BASE_URL 또는 공식 엔드포인트
+                (로컬 스텁 서버로 오프라인 테스트할 때 사용)
+            router (ModelRouter, optional): 작업별 모델 선택기. 없으면 환경 변수(GEMINI_MODEL_*, GEMINI_CASCADE_*)로 생성
+            hedging (HedgingPolicy, optional): 요청 헤징 정책. 없으면 환경 변수(GEMINI_HEDGE_*)로 생성 (설정이 없으면 사용 안 함)
+            circuit_breaker (CircuitBreaker, optional): 회로 차단기. 없으면 환경 변수(GEMINI_BREAKER_*)로 생성
+            key_pool (KeyPool, optional): 여러 API 키를 번갈아 사용하는 키 풀. 없으면 api_key 또는 환경 변수(GEMINI_API_KEYS, GEMINI_API_KEY)로 생성
+            sizer (GenerationSizer, optional): 요청별 generationConfig 결정기. 없으면 환경 변수(GEMINI_MAX_OUTPUT_TOKENS 등)로 생성
+            
+        Raises:
+            ValueError: API 키가 없는 경우
         """
-        self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
-        if not self.api_key:
-            raise ValueError("Gemini API 키가 필요합니다. 환경 변수 GEMINI_API_KEY를 설정하거나 초기화 시 제공하세요.")
+        self.key_pool = key_pool or KeyPool.from_env(api_key)
+        self.api_key = self.key_pool.get_keys()[0]
+        
+        self.base_url = (base_url or os.environ.get("GEMINI_API_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.router = router or ModelRouter.from_env()
+        self.hedging = hedging or HedgingPolicy.from_env()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker.from_env()
+        self.sizer = sizer or GenerationSizer.from_env()
+        self.model = self.router.default_model
+        self.api_url = self._model_url(self.model)
+    
+    def _model_url(self, model):
+        """
+        모델별 generateContent URL
         
-        self.model = "gemini-2.5-pro-preview-03-25"  # 최신 모델 사용
-        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent"
+        Args:
+            model (str): 모델 이름
+            
+        Returns:
+            str: 요청 URL
+        """
+        return f"{self.base_url}/models/{model}:generateContent"
         
-    def _prepare_request(self, prompt, system_instruction=None):
+    def _prepare_request(self, prompt, system_instruction=None, generation_config=None):
         """
         API 요청 데이터 준비
         
         Args:
             prompt (str): 사용자 프롬프트
             system_instruction (str, optional): 시스템 지시사항
+            generation_config (dict, optional): 생성 설정 (없으면 기본 설정)
             
         Returns:
             dict: API 요청 데이터
@@ -51,7 +298,7 @@ class GeminiClient:
         
         return {
             "contents": contents,
-            "generationConfig": {
+            "generationConfig": generation_config or {
                 "temperature": 0.2,  # 낮은 온도로 일관된 결과 생성
                 "topP": 0.8,
                 "topK": 40,
@@ -77,35 +324,189 @@ class GeminiClient:
             ]
         }
     
-    def generate_content(self, prompt, system_instruction=None):
+    def generate_content(self, prompt, system_instruction=None, task="generate_content", model=None, validate=None, sizing=None):
         """
         Gemini API를 사용하여 콘텐츠 생성
         
         Args:
             prompt (str): 사용자 프롬프트
             system_instruction (str, optional): 시스템 지시사항
+            task (str): 작업 이름 (모델 선택 및 계측용, analyze_text, generate_gapfill 등)
+            model (str, optional): 사용할 모델 (없으면 라우터가 작업별로 선택)
+            validate (callable, optional): cascade 검증 함수 (응답을 받아 사용할 수 있는지 반환)
+            sizing (dict, optional): 출력 크기 추정 입력 (input_tokens, tiers, passages; 없으면 프롬프트 길이 기준)
+            
+        Returns:
+            dict: API 응답 데이터 (MAX_TOKENS로 잘린 응답은 이어서 생성한 부분까지 합친 응답)
+        """
+        sizing = sizing or {"input_tokens": estimate_tokens(prompt)}
+        data = self._prepare_request(prompt, system_instruction, self.sizer.config_for(task, **sizing))
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        
+        if model is not None:
+            result = self._send_complete(data, body, task, model)
+        else:
+            result = self.router.run(task, lambda routed_model: self._send_complete(data, body, task, routed_model), validate)
+        
+        if result is not None:
+            usage = result.get("usageMetadata", {})
+            self.sizer.observe(
+                task, self.sizer.estimate(task, **sizing), output_token_count(usage),
+                truncated=result.get("continuations", 0) > 0 or finish_reason(result) == "MAX_TOKENS",
+                continuations=result.get("continuations", 0),
+                thinking_tokens=usage.get("thoughtsTokenCount", 0)
+            )
+        return result
+    
+    def _send_complete(self, data, body, task, model):
+        """
+        요청 전송 후 MAX_TOKENS로 잘린 응답은 잘린 지점부터 이어서 생성
+        (이전 출력을 model 차례로 넣고 이어서 작성하도록 요청하여, 처음부터 다시 생성하지 않음)
+        
+        Args:
+            data (dict): 요청 데이터
+            body (bytes): 요청 본문 (JSON)
+            task (str): 작업 이름
+            model (str): 모델 이름
             
         Returns:
-            dict: API 응답 데이터
+            dict: API 응답 데이터 (이어서 생성한 경우 텍스트와 usageMetadata를 합치고 continuations에 횟수 기록)
         """
-        headers = {
-            "Content-Type": "application/json",
-            "x-goog-api-key": self.api_key
+        result = self._send(body, task, model)
+        continuations = 0
+        while finish_reason(result) == "MAX_TOKENS" and continuations < MAX_CONTINUATIONS:
+            text_content = response_text(result) or ""
+            follow_up = dict(data)
+            follow_up["contents"] = data["contents"] + [
+                {"role": "model", "parts": [{"text": text_content}]},
+                {"role": "user", "parts": [{"text": CONTINUE_INSTRUCTION}]}
+            ]
+            continuations += 1
+            metrics.inc("gapfill_gemini_continuations_total", task=task)
+            continued = self._send(
+                json.dumps(follow_up, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), task, model
+            )
+            # 후보가 없는 응답(promptFeedback 차단 등)이면 더 이어가지 않고 지금까지의 응답 사용
+            if not continued or not continued.get("candidates"):
+                break
+            result = self._merge_continuation(result, continued, text_content + (response_text(continued) or ""))
+            result["continuations"] = continuations
+        return result
+    
+    def _merge_continuation(self, result, continued, text_content):
+        """
+        이어서 생성한 응답을 이전 응답에 합치기
+        
+        Returns:
+            dict: 합친 텍스트, 마지막 응답의 종료 이유, 합산한 usageMetadata를 가진 응답
+        """
+        candidate = dict(continued["candidates"][0])
+        candidate["content"] = {"parts": [{"text": text_content}], "role": "model"}
+        usage = {
+            key: result.get("usageMetadata", {}).get(key, 0) + continued.get("usageMetadata", {}).get(key, 0)
+            for key in ("promptTokenCount", "candidatesTokenCount", "thoughtsTokenCount", "totalTokenCount")
         }
+        merged = dict(continued)
+        merged["candidates"] = [candidate]
+        merged["usageMetadata"] = usage
+        return merged
+    
+    def _send(self, body, task, model):
+        """
+        요청 전송 (헤징 정책이 있으면 느린 요청에 대해 중복 요청을 보내고 먼저 끝난 응답 사용)
         
-        data = self._prepare_request(prompt, system_instruction)
+        Returns:
+            dict: API 응답 데이터 (요청 실패 시 None)
+        """
+        if self.hedging is None:
+            return self._post(body, task, model)
+        return self.hedging.run(task, model, lambda: self._post(body, task, model))
+    
+    def _post(self, body, task, model):
+        """
+        generateContent 요청 전송
         
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                data=json.dumps(data)
-            )
-            response.raise_for_status()  # HTTP 오류 발생 시 예외 발생
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"API 요청 오류: {e}")
+        Args:
+            body (bytes): 요청 본문 (JSON)
+            task (str): 계측용 작업 이름
+            model (str): 모델 이름
+            
+        Returns:
+            dict: API 응답 데이터 (요청 실패 또는 회로 차단 시 None)
+        """
+        breaker = self.circuit_breaker
+        if breaker is not None and not breaker.allow():
+            metrics.inc("gapfill_gemini_requests_total", task=task, status="circuit_open")
             return None
+        
+        start = time.perf_counter()
+        with metrics.span(f"gemini.{task}"):
+            try:
+                response, api_key = self._post_with_key(body, model)
+                response.raise_for_status()  # HTTP 오류 발생 시 예외 발생
+                result = response.json()
+            except requests.exceptions.RequestException as e:
+                print(f"API 요청 오류: {e}")
+                status = getattr(getattr(e, "response", None), "status_code", None) or "error"
+                metrics.inc("gapfill_gemini_requests_total", task=task, status=status)
+                if breaker is not None:
+                    # 잘못된 요청(4xx)은 API 장애가 아니므로 실패로 세지 않음 (429 제외)
+                    client_error = isinstance(status, int) and status < 500 and status != 429
+                    breaker.record(client_error, time.perf_counter() - start)
+                return None
+        
+        if breaker is not None:
+            breaker.record(True, time.perf_counter() - start)
+        
+        # 토큰 사용량은 응답의 usageMetadata 기준 (없으면 0)
+        usage = result.get("usageMetadata", {}) if isinstance(result, dict) else {}
+        self.key_pool.record_tokens(api_key, usage.get("totalTokenCount", 0))
+        metrics.inc("gapfill_gemini_requests_total", task=task, status=response.status_code)
+        metrics.record_usage(
+            task,
+            prompt_tokens=usage.get("promptTokenCount", 0),
+            output_tokens=output_token_count(usage),
+            bytes_sent=len(body),
+            bytes_received=len(response.content)
+        )
+        return result
+    
+    def _post_with_key(self, body, model):
+        """
+        키 풀에서 여유가 가장 많은 키로 요청 전송
+        429를 받으면 해당 키를 격리하고, 격리되지 않은 다른 키가 있으면 그 키로 다시 전송
+        
+        Args:
+            body (bytes): 요청 본문 (JSON)
+            model (str): 모델 이름
+            
+        Returns:
+            tuple: (응답, 사용한 API 키)
+            
+        Raises:
+            requests.exceptions.RequestException: 연결 실패 시
+        """
+        tried = set()
+        while True:
+            api_key = self.key_pool.acquire()
+            tried.add(api_key)
+            try:
+                response = requests.post(
+                    self._model_url(model),
+                    headers={"Content-Type": "application/json", "x-goog-api-key": api_key},
+                    data=body
+                )
+            except requests.exceptions.RequestException:
+                self.key_pool.release(api_key)
+                raise
+            if response.status_code != 429:
+                self.key_pool.release(api_key)
+                return response, api_key
+            
+            self.key_pool.throttled(api_key, retry_after_seconds(response))
+            if not self.key_pool.has_available(exclude=tried):
+                return response, api_key
+            metrics.inc("gapfill_gemini_key_retries_total")
     
     def analyze_text(self, text):
         """
@@ -117,22 +518,7 @@ class GeminiClient:
         Returns:
             dict: 분석 결과
         """
-        system_instruction = """
-        당신은 영어 교육 전문가로서 수능영어 지문을 분석하는 역할을 합니다.
-        주어진 영어 지문을 다음 언어적 측면에서 분석하세요:
-        1. 어휘-의미적 특성 (내용어, 학술 어휘, 전문 용어)
-        2. 문법-구문적 특성 (구조적 요소, 기능어)
-        3. 담화-화용적 특성 (응집 장치, 태도 표지, 화행)
-        4. 개념-인지적 특성 (은유, 이미지 스키마, 프레임)
-        5. 문화-번역적 특성 (문화 특정적 참조, 번역 과제)
-        
-        분석 결과는 JSON 형식으로 반환하세요. 각 단어나 구문에 대해 다음 정보를 포함하세요:
-        - 단어/구문
-        - 언어적 범주 (위 5가지 중 하나)
-        - 세부 유형 (예: 학술 어휘, 접속사, 은유 등)
-        - 교육적 중요성 (언어 학습자에게 왜 중요한지)
-        - 난이도 (기초, 중급, 고급, 전문가)
-        """
+        system_instruction = ANALYSIS_SYSTEM_INSTRUCTION
         
         prompt = f"""
         다음 수능영어 지문을 분석해주세요:
@@ -142,49 +528,107 @@ class GeminiClient:
         JSON 형식으로 응답해주세요.
         """
         
-        return self.generate_content(prompt, system_instruction)
+        return self.generate_content(
+            prompt, system_instruction, task="analyze_text", validate=is_valid_json_response,
+            sizing={"input_tokens": estimate_tokens(text)}
+        )
     
-    def generate_gapfill(self, text, analysis=None):
+    def analyze_texts(self, passages):
+        """
+        여러 수능영어 지문을 한 번의 요청으로 분석
+        시스템 지시사항을 한 번만 전송하여 지문당 고정 비용을 줄임
+        
+        Args:
+            passages (list): (지문 id, 지문 텍스트) 튜플 목록
+            
+        Returns:
+            dict: API 응답 데이터 (응답 텍스트는 지문 id를 키로 하는 JSON 객체)
+        """
+        system_instruction = ANALYSIS_SYSTEM_INSTRUCTION + BATCH_ANALYSIS_INSTRUCTION
+        
+        tagged_passages = "\n\n".join(
+            f'<passage id="{passage_id}">\n{text.strip()}\n</passage>'
+            for passage_id, text in passages
+        )
+        
+        prompt = f"""
+        다음 {len(passages)}개의 수능영어 지문을 각각 분석해주세요:
+        
+        {tagged_passages}
+        
+        지문 id를 키로 하는 JSON 객체로 응답해주세요.
+        예: {{"{passages[0][0]}": {{...}}}}
+        """
+        
+        return self.generate_content(
+            prompt, system_instruction, task="analyze_texts",
+            validate=passage_ids_validator([passage_id for passage_id, _ in passages]),
+            sizing={"input_tokens": sum(estimate_tokens(text) for _, text in passages), "passages": len(passages)}
+        )
+    
+    def generate_gapfill(self, text, analysis=None, tiers=None, extras=True):
         """
         갭필 문제 생성
         
         Args:
             text (str): 원본 수능영어 지문
-            analysis (dict, optional): 사전 분석 결과
+            analysis (dict | str, optional): 사전 분석 결과 (이미 JSON으로 변환한 문자열도 가능)
+            tiers (list, optional): 생성할 난이도 목록 (없으면 네 가지 모두)
+            extras (bool): 지문 단위 부가 정보(한국어 번역, 문화적 참고사항) 생성 여부 (난이도별로 나누어 요청할 때 한 요청에서만 생성)
             
         Returns:
             dict: 생성된 갭필 문제
         """
-        system_instruction = """
+        tiers = [tier for tier in GAPFILL_TIERS if tier in tiers] if tiers else list(GAPFILL_TIERS)
+        
+        tier_lines = "\n        ".join(
+            f"{i}. {GAPFILL_TIERS[tier]}" for i, tier in enumerate(tiers, start=1)
+        )
+        
+        # 일부 난이도만 요청한 경우 결과 키를 명시하여 구조화 단계에서 매핑되도록 함
+        tier_key_instruction = ""
+        if len(tiers) < len(GAPFILL_TIERS):
+            tier_key_instruction = f"""
+        요청한 난이도만 생성하고, 결과 JSON의 난이도 키는 {", ".join(tiers)} 를 그대로 사용하세요.
+        """
+        if not extras:
+            tier_key_instruction += """
+        한국어 번역과 문화적 참고사항은 다른 요청에서 생성하므로 포함하지 마세요.
+        """
+        
+        system_instruction = f"""
         당신은 영어 교육 전문가로서 수능영어 지문을 바탕으로 갭필 문제를 생성하는 역할을 합니다.
-        주어진 영어 지문을 분석하고, 다음 네 가지 난이도 수준의 갭필 문제를 생성하세요:
+        주어진 영어 지문을 분석하고, 다음 {TIER_COUNT_WORDS[len(tiers)]} 가지 난이도 수준의 갭필 문제를 생성하세요:
         
-        1. 기초 단계: 핵심 의미 전달 요소 (기본 어휘)
-        2. 중급 단계: 구조적 및 연어 패턴 (문법 요소)
-        3. 고급 단계: 담화 구성 및 화용적 특성 (응집성, 일관성)
-        4. 전문가 단계: 개념적 이해 및 문화적 뉘앙스 (은유, 함축)
+        {tier_lines}
         
         각 난이도별로 다음을 포함하세요:
         - 빈칸이 있는 지문 (HTML 형식)
         - 정답 목록 (무작위 순서)
         - 각 빈칸에 대한 힌트 (3단계: 문법적 힌트, 의미적 힌트, 직접적 힌트)
         - 정답 해설 (각 빈칸이 왜 중요한지 설명)
-        
+        {tier_key_instruction}
         한국 영어학습자를 위한 시스템이므로, 한국어 학습자가 어려워할 수 있는 부분을 고려하세요.
         결과는 JSON 형식으로 반환하세요.
         """
         
+        # 사전 분석 결과가 있으면 프롬프트에 추가 (공백 없는 JSON으로 한 번만 변환)
+        analysis_section = ""
+        if analysis:
+            if not isinstance(analysis, str):
+                analysis = json.dumps(analysis, ensure_ascii=False, separators=(",", ":"))
+            analysis_section = f"\n\n사전 분석 결과:\n{analysis}"
+        
         prompt = f"""
         다음 수능영어 지문을 바탕으로 갭필 문제를 생성해주세요:
         
         {text}
-        """
-        
-        # 사전 분석 결과가 있으면 프롬프트에 추가
-        if analysis:
-            prompt += f"\n\n사전 분석 결과:\n{json.dumps(analysis, ensure_ascii=False, indent=2)}"
+        {analysis_section}"""
         
-        return self.generate_content(prompt, system_instruction)
+        return self.generate_content(
+            prompt, system_instruction, task="generate_gapfill", validate=gapfill_validator(tiers),
+            sizing={"input_tokens": estimate_tokens(text), "tiers": len(tiers)}
+        )
     
     def generate_html_output(self, text, gapfill_result):
         """
@@ -220,12 +664,12 @@ class GeminiClient:
         {text}
         
         갭필 문제 데이터:
-        {json.dumps(gapfill_result, ensure_ascii=False, indent=2)}
+        {json.dumps(gapfill_result, ensure_ascii=False, separators=(",", ":"), default=to_serializable)}
         
         완전한 HTML 코드를 반환해주세요.
         """
         
-        response = self.generate_content(prompt, system_instruction)
+        response = self.generate_content(prompt, system_instruction, task="generate_html_output", validate=is_valid_html_response)
         
         # HTML 코드 추출
         if response and 'candidates' in response:
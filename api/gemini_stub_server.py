@@ -0,0 +1,524 @@
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# 프로젝트 루트를 import 경로에 추가 (python api/gemini_stub_server.py 로 실행하는 경우)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from api.gemini_client import GAPFILL_TIERS
+
+# :generateContent / :streamGenerateContent 경로
+MODEL_PATH_PATTERN = re.compile(r"/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)$")
+
+# 프롬프트에서 지문을 찾기 위한 패턴 (GeminiClient 프롬프트 형식 기준)
+PASSAGE_PATTERNS = [
+    re.compile(r"지문을 분석해주세요:\s*(?P<text>.*?)\s*JSON 형식으로 응답해주세요", re.DOTALL),
+    re.compile(r"갭필 문제를 생성해주세요:\s*(?P<text>.*?)\s*(?:사전 분석 결과:|$)", re.DOTALL),
+    re.compile(r"원본 텍스트:\s*(?P<text>.*?)\s*갭필 문제 데이터:", re.DOTALL)
+]
+BATCH_PASSAGE_PATTERN = re.compile(r'<passage id="(?P<id>[^"]+)">\s*(?P<text>.*?)\s*</passage>', re.DOTALL)
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'\-]+")
+
+CATEGORIES = ["lexical_semantic", "grammatical_syntactic", "discourse_pragmatic", "conceptual_cognitive", "cultural_translational"]
+
+def parse_latency(spec):
+    """
+    지연 시간 분포 문자열 파싱
+
+    Args:
+        spec (str): "fixed:0.05", "uniform:0.02,0.2", "lognormal:0.1,0.5" (중앙값 초, 시그마) 형식
+
+    Returns:
+        callable: random.Random을 받아 지연 시간(초)을 반환하는 함수
+    """
+    if not spec:
+        return lambda rng: 0.0
+
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        median, sigma = values[0], values[1]
+        return lambda rng: rng.lognormvariate(math.log(median), sigma)
+    raise ValueError(f"알 수 없는 지연 시간 분포입니다: {spec}")
+
+class StubConfig:
+    """
+    스텁 서버 동작 설정 (지연 시간, 오류율, 출력 잘림, 고정 응답)
+    """
+
+    def __init__(self, latency=None, error_429_rate=0.0, error_500_rate=0.0, truncate_rate=0.0,
+                 canned_responses=None, seed=None, tokens_per_second=0.0, key_requests_per_minute=0):
+        """
+        StubConfig 초기화
+
+        Args:
+            latency (str, optional): 지연 시간 분포 (parse_latency 형식)
+            error_429_rate (float): 429 (RESOURCE_EXHAUSTED) 응답 비율
+            error_500_rate (float): 500 (INTERNAL) 응답 비율
+            truncate_rate (float): 출력을 잘라 finishReason=MAX_TOKENS로 응답하는 비율
+            canned_responses (dict, optional): 작업 유형별 고정 응답 텍스트
+                (analysis, batch_analysis, gapfill, html)
+            seed (int, optional): 난수 시드 (재현 가능한 부하 테스트용)
+            tokens_per_second (float): 0보다 크면 출력 토큰 수에 비례한 생성 시간을 추가
+            key_requests_per_minute (int): 0보다 크면 API 키별 분당 요청 한도 (초과 시 429)
+        """
+        self.latency_spec = latency
+        self.sample_latency = parse_latency(latency)
+        self.error_429_rate = error_429_rate
+        self.error_500_rate = error_500_rate
+        self.truncate_rate = truncate_rate
+        self.canned_responses = canned_responses or {}
+        self.tokens_per_second = tokens_per_second
+        self.key_requests_per_minute = key_requests_per_minute
+        self.key_requests = {}
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def take_key_quota(self, api_key):
+        """
+        API 키별 분당 요청 한도 확인 (최근 60초 요청 수 기준)
+
+        Args:
+            api_key (str): 요청의 API 키
+
+        Returns:
+            float: 한도를 넘었으면 다시 요청할 수 있을 때까지 남은 시간(초), 아니면 0
+        """
+        if self.key_requests_per_minute <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self.lock:
+            requests = [t for t in self.key_requests.get(api_key, []) if now - t < 60]
+            if len(requests) >= self.key_requests_per_minute:
+                self.key_requests[api_key] = requests
+                return 60 - (now - requests[0])
+            requests.append(now)
+            self.key_requests[api_key] = requests
+            return 0.0
+
+    def draw(self):
+        """
+        요청 하나에 대한 지연 시간과 장애 여부 결정
+
+        Returns:
+            tuple: (지연 시간(초), 오류 상태 코드 또는 None, 출력 잘림 여부)
+        """
+        with self.lock:
+            latency = max(0.0, self.sample_latency(self.rng))
+            roll = self.rng.random()
+            truncate = self.rng.random() < self.truncate_rate
+
+        if roll < self.error_429_rate:
+            return latency, 429, False
+        if roll < self.error_429_rate + self.error_500_rate:
+            return latency, 500, False
+        return latency, None, truncate
+
+def _estimate_tokens(text):
+    """대략적인 토큰 수 (4자당 1토큰)"""
+    return len(text) // 4 + 1
+
+def _request_texts(body):
+    """
+    요청 본문에서 시스템 지시사항과 사용자 프롬프트 추출
+    """
+    system_parts = []
+    user_parts = []
+    instruction = body.get("systemInstruction") or body.get("system_instruction")
+    if instruction:
+        system_parts.extend(part.get("text", "") for part in instruction.get("parts", []))
+    for content in body.get("contents", []):
+        texts = [part.get("text", "") for part in content.get("parts", [])]
+        if content.get("role") == "system":
+            system_parts.extend(texts)
+        elif content.get("role", "user") == "user":
+            user_parts.extend(texts)
+    return "\n".join(system_parts), "\n".join(user_parts)
+
+def _previous_output(body):
+    """
+    이어서 생성 요청에 포함된 이전 출력 (model 차례의 텍스트)
+    """
+    return "".join(
+        part.get("text", "")
+        for content in body.get("contents", []) if content.get("role") == "model"
+        for part in content.get("parts", [])
+    )
+
+def _extract_passage(prompt):
+    """
+    프롬프트에서 원본 지문 추출 (형식을 모르면 프롬프트 전체 사용)
+    """
+    for pattern in PASSAGE_PATTERNS:
+        match = pattern.search(prompt)
+        if match and match.group("text").strip():
+            return match.group("text").strip()
+    return prompt
+
+def classify_task(system_instruction, prompt):
+    """
+    요청 유형 판별
+
+    Returns:
+        str: analysis, batch_analysis, gapfill, html 중 하나
+    """
+    if "HTML 형식으로 변환" in system_instruction:
+        return "html"
+    if "갭필 문제를 생성" in system_instruction:
+        return "gapfill"
+    if "<passage id=" in prompt:
+        return "batch_analysis"
+    return "analysis"
+
+def _pick_words(passage, limit=12):
+    """
+    지문에서 빈칸/분석 대상 단어 선택 (긴 단어 우선, 등장 순서 유지)
+    """
+    seen = set()
+    words = []
+    for word in WORD_PATTERN.findall(passage):
+        key = word.lower()
+        if len(word) >= 6 and key not in seen and key != "json":
+            seen.add(key)
+            words.append(word)
+    return words[:limit]
+
+def _difficulty_of(word):
+    """단어 길이로 난이도 결정"""
+    if len(word) <= 7:
+        return "foundation"
+    if len(word) == 8:
+        return "intermediate"
+    if len(word) <= 10:
+        return "advanced"
+    return "expert"
+
+def build_analysis(passage):
+    """
+    템플릿 분석 결과 생성
+
+    Args:
+        passage (str): 지문
+
+    Returns:
+        dict: {"words": [...]} 형식의 분석 결과
+    """
+    return {
+        "words": [
+            {
+                "word": word,
+                "category": CATEGORIES[index % len(CATEGORIES)],
+                "subtype": "content word",
+                "educational_importance": f"'{word}'는 지문의 핵심 의미를 전달합니다.",
+                "difficulty": _difficulty_of(word)
+            }
+            for index, word in enumerate(_pick_words(passage))
+        ]
+    }
+
+def build_gapfill(passage, tiers):
+    """
+    템플릿 갭필 결과 생성
+
+    Args:
+        passage (str): 지문
+        tiers (list): 생성할 난이도 목록
+
+    Returns:
+        dict: 난이도별 빈칸 지문/정답/힌트와 부가 정보
+    """
+    words = _pick_words(passage)
+    result = {}
+    for tier_index, tier in enumerate(tiers):
+        chosen = words[tier_index::len(GAPFILL_TIERS)][:3] or words[:1]
+        text = passage
+        blanks = []
+        for number, word in enumerate(chosen, start=1):
+            text = text.replace(word, f"({number}) ______", 1)
+            blanks.append(f"({number})")
+        result[tier] = {
+            "text": text,
+            "blanks": blanks,
+            "answers": chosen,
+            "hints": [f"{len(word)}글자 단어입니다." for word in chosen]
+        }
+    result["korean_translation"] = "(스텁 서버 번역)"
+    result["answer_key"] = [f"{tier}: {', '.join(result[tier]['answers'])}" for tier in tiers]
+    result["cultural_notes"] = []
+    return result
+
+def build_html(passage):
+    """템플릿 HTML 결과 생성"""
+    return f"```html\n<html><head><title>갭필 문제</title></head><body><div class=\"container\"><p>{passage}</p></div></body></html>\n```"
+
+def build_response_text(config, task, system_instruction, prompt):
+    """
+    작업 유형별 응답 텍스트 생성 (고정 응답이 있으면 우선 사용)
+    """
+    if task in config.canned_responses:
+        return config.canned_responses[task]
+
+    if task == "batch_analysis":
+        analyses = {
+            match.group("id"): build_analysis(match.group("text"))
+            for match in BATCH_PASSAGE_PATTERN.finditer(prompt)
+        }
+        return "```json\n" + json.dumps(analyses, ensure_ascii=False) + "\n```"
+
+    passage = _extract_passage(prompt)
+    if task == "analysis":
+        return "```json\n" + json.dumps(build_analysis(passage), ensure_ascii=False) + "\n```"
+    if task == "gapfill":
+        tiers = [tier for tier, description in GAPFILL_TIERS.items() if description in system_instruction]
+        return "```json\n" + json.dumps(build_gapfill(passage, tiers or list(GAPFILL_TIERS)), ensure_ascii=False) + "\n```"
+    return build_html(passage)
+
+def build_response(model, text, prompt_tokens, finish_reason="STOP"):
+    """
+    generateContent 응답 형식으로 감싸기
+    """
+    output_tokens = _estimate_tokens(text)
+    return {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "finishReason": finish_reason,
+            "index": 0
+        }],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens
+        },
+        "modelVersion": model
+    }
+
+class GeminiStubHandler(BaseHTTPRequestHandler):
+    """
+    Gemini API 스텁 요청 처리기
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # 부하 테스트 중 콘솔 출력 억제
+        pass
+
+    def do_GET(self):
+        """요청 통계 조회 (/stats)"""
+        if urlparse(self.path).path == "/stats":
+            with self.server.stats_lock:
+                self._send_json(200, dict(self.server.stats))
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+
+    def do_POST(self):
+        """generateContent / streamGenerateContent 처리"""
+        parsed = urlparse(self.path)
+        match = MODEL_PATH_PATTERN.search(parsed.path)
+        length = int(self.headers.get("Content-Length", 0))
+        raw_body = self.rfile.read(length)
+
+        if not match:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+            return
+
+        try:
+            body = json.loads(raw_body or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"code": 400, "message": "Invalid JSON payload", "status": "INVALID_ARGUMENT"}})
+            return
+
+        config = self.server.config
+        system_instruction, prompt = _request_texts(body)
+        task = classify_task(system_instruction, prompt)
+        latency, error_status, truncate = config.draw()
+        api_key = self.headers.get("x-goog-api-key", "")
+        retry_after = 1
+        if error_status is None:
+            key_wait = config.take_key_quota(api_key)
+            if key_wait:
+                error_status, retry_after = 429, int(key_wait) + 1
+        self._record(task, error_status, truncate, api_key)
+
+        if latency:
+            time.sleep(latency)
+
+        if error_status == 429:
+            self._send_json(429, {"error": {"code": 429, "message": "Resource has been exhausted (e.g. check quota).", "status": "RESOURCE_EXHAUSTED"}},
+                            {"Retry-After": str(retry_after)})
+            return
+        if error_status == 500:
+            self._send_json(500, {"error": {"code": 500, "message": "An internal error has occurred.", "status": "INTERNAL"}})
+            return
+
+        text = build_response_text(config, task, system_instruction, prompt)
+        finish_reason = "STOP"
+
+        # 이어서 생성 요청이면 이전 출력 다음 부분만 응답
+        previous = _previous_output(body)
+        if previous and text.startswith(previous):
+            text = text[len(previous):]
+
+        # maxOutputTokens 초과 또는 잘림 주입 시 출력 절단
+        # (2.5 모델처럼 thinkingBudget을 모두 생각에 쓴다고 보고 그만큼 출력 한도에서 뺌)
+        generation_config = body.get("generationConfig") or {}
+        max_tokens = generation_config.get("maxOutputTokens")
+        if max_tokens:
+            thinking_budget = (generation_config.get("thinkingConfig") or {}).get("thinkingBudget") or 0
+            max_tokens = max(1, max_tokens - max(0, thinking_budget))
+        if max_tokens and _estimate_tokens(text) > max_tokens:
+            text = text[:max_tokens * 4]
+            finish_reason = "MAX_TOKENS"
+        elif truncate:
+            text = text[:max(1, len(text) // 2)]
+            finish_reason = "MAX_TOKENS"
+
+        if config.tokens_per_second > 0:
+            time.sleep(_estimate_tokens(text) / config.tokens_per_second)
+
+        prompt_tokens = _estimate_tokens(system_instruction + prompt)
+        if match.group("method") == "generateContent":
+            self._send_json(200, build_response(match.group("model"), text, prompt_tokens, finish_reason))
+        else:
+            self._send_stream(match.group("model"), text, prompt_tokens, finish_reason,
+                              parse_qs(parsed.query).get("alt") == ["sse"])
+
+    def _record(self, task, error_status, truncate, api_key=""):
+        """요청 통계 기록"""
+        with self.server.stats_lock:
+            stats = self.server.stats
+            stats["requests"] += 1
+            stats[f"task_{task}"] = stats.get(f"task_{task}", 0) + 1
+            stats[f"key_{api_key}"] = stats.get(f"key_{api_key}", 0) + 1
+            if error_status:
+                stats[f"status_{error_status}"] = stats.get(f"status_{error_status}", 0) + 1
+            if truncate:
+                stats["truncated"] += 1
+
+    def _send_json(self, status, payload, headers=None):
+        """JSON 응답 전송"""
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, model, text, prompt_tokens, finish_reason, sse):
+        """
+        streamGenerateContent 응답 전송 (alt=sse면 SSE, 아니면 JSON 배열)
+        """
+        chunk_size = 200
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)] or [""]
+        payloads = []
+        for index, chunk in enumerate(chunks):
+            last = index == len(chunks) - 1
+            payload = build_response(model, chunk, prompt_tokens, finish_reason if last else None)
+            if not last:
+                del payload["candidates"][0]["finishReason"]
+            payloads.append(json.dumps(payload, ensure_ascii=False))
+
+        if sse:
+            data = "".join(f"data: {payload}\r\n\r\n" for payload in payloads).encode("utf-8")
+            content_type = "text/event-stream"
+        else:
+            data = ("[" + ",\r\n".join(payloads) + "]").encode("utf-8")
+            content_type = "application/json; charset=UTF-8"
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+class GeminiStubServer(ThreadingHTTPServer):
+    """
+    Gemini API 스텁 서버 (요청마다 스레드 하나)
+    """
+    daemon_threads = True
+
+    def __init__(self, address, config):
+        super().__init__(address, GeminiStubHandler)
+        self.config = config
+        self.stats = {"requests": 0, "truncated": 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        """GeminiClient(base_url=...)에 전달할 URL"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1beta"
+
+def start_stub_server(host="127.0.0.1", port=0, config=None):
+    """
+    백그라운드 스레드에서 스텁 서버 시작 (테스트/벤치마크용)
+
+    Args:
+        host (str): 바인드 주소
+        port (int): 포트 (0이면 임의의 빈 포트)
+        config (StubConfig, optional): 동작 설정
+
+    Returns:
+        GeminiStubServer: 실행 중인 서버 (종료 시 shutdown() 호출)
+    """
+    server = GeminiStubServer((host, port), config or StubConfig())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 테스트용 Gemini API 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", help='지연 시간 분포 (예: "fixed:0.05", "uniform:0.02,0.2", "lognormal:0.8,0.6")')
+    parser.add_argument("--error-429-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--error-500-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="출력 잘림(MAX_TOKENS) 비율")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="출력 토큰 생성 속도 (0이면 무시)")
+    parser.add_argument("--key-rpm", type=int, default=0, help="API 키별 분당 요청 한도 (0이면 무제한)")
+    parser.add_argument("--canned", help="작업 유형별 고정 응답 JSON 파일 (analysis, batch_analysis, gapfill, html)")
+    parser.add_argument("--seed", type=int, help="난수 시드")
+    args = parser.parse_args()
+
+    canned_responses = None
+    if args.canned:
+        with open(args.canned, 'r', encoding='utf-8') as f:
+            canned_responses = json.load(f)
+
+    config = StubConfig(
+        latency=args.latency,
+        error_429_rate=args.error_429_rate,
+        error_500_rate=args.error_500_rate,
+        truncate_rate=args.truncate_rate,
+        canned_responses=canned_responses,
+        seed=args.seed,
+        tokens_per_second=args.tokens_per_second,
+        key_requests_per_minute=args.key_rpm
+    )
+    server = GeminiStubServer((args.host, args.port), config)
+    print(f"Gemini 스텁 서버 실행 중: {server.base_url}")
+    print(f"GEMINI_API_BASE_URL={server.base_url} 로 설정하여 사용하세요.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import math
+import os
+import threading
+
+from monitoring.metrics import metrics
+
+# 작업별 출력 토큰 추정 계수와 샘플링 설정
+# 출력 토큰 ≈ base + per_input_token × 입력 토큰 + 난이도 수 × (per_tier + per_tier_input_token × 입력 토큰)
+TASK_PROFILES = {
+    # 지문 분석: 단어/구문별 JSON 항목과 한국어 설명 (지문 길이에 비례)
+    "analyze_text": {"base": 600, "per_input_token": 4.0, "temperature": 0.1, "topP": 0.8, "topK": 20},
+    # 배치 분석: 지문마다 base가 추가됨
+    "analyze_texts": {"base": 600, "per_input_token": 4.0, "temperature": 0.1, "topP": 0.8, "topK": 20},
+    # 갭필: 난이도마다 빈칸 지문, 정답, 힌트, 해설 + 지문 단위 한국어 번역/정답표
+    "generate_gapfill": {
+        "base": 200, "per_input_token": 2.0, "per_tier": 300, "per_tier_input_token": 1.5,
+        "temperature": 0.3, "topP": 0.9, "topK": 40
+    },
+    # HTML: CSS/JavaScript 고정 분량 + 입력(지문과 갭필 데이터)에 비례
+    "generate_html_output": {"base": 2500, "per_input_token": 1.3, "temperature": 0.2, "topP": 0.8, "topK": 40}
+}
+
+# 프로필이 없는 작업의 기본 설정
+DEFAULT_PROFILE = {"base": 1024, "per_input_token": 2.0, "temperature": 0.2, "topP": 0.8, "topK": 40}
+
+class GenerationSizer:
+    """
+    요청별 generationConfig 결정
+    작업 유형, 입력 길이, 요청한 난이도 수로 필요한 출력 토큰 수를 추정하여 maxOutputTokens를 작게 잡고,
+    실제 출력 토큰 수(usageMetadata)와 잘림 여부로 작업별 보정 계수를 학습
+    """
+
+    def __init__(self, headroom=1.3, min_tokens=256, max_tokens=8192, alpha=0.2, thinking_budget=1024):
+        """
+        GenerationSizer 초기화
+
+        Args:
+            headroom (float): 추정치에 곱하는 여유 비율
+            min_tokens (int): maxOutputTokens 최솟값 (생각 토큰 제외)
+            max_tokens (int): maxOutputTokens 최댓값 (모델 한도)
+            alpha (float): 보정 계수(지수 이동 평균)의 가중치
+            thinking_budget (int): 요청마다 보내는 thinkingConfig.thinkingBudget (maxOutputTokens에 더함).
+                음수이면 thinkingConfig를 보내지 않음 (생각 기능이 없는 모델용)
+        """
+        self.headroom = headroom
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.alpha = alpha
+        self.thinking_budget = thinking_budget
+        self._lock = threading.Lock()
+        self._correction = {}
+        self._stats = {}
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """
+        환경 변수로 생성
+        GEMINI_MAX_OUTPUT_TOKENS: maxOutputTokens 최댓값 (기본값 8192), GEMINI_OUTPUT_HEADROOM: 여유 비율 (기본값 1.3),
+        GEMINI_THINKING_BUDGET: 생각 토큰 한도 (기본값 1024, -1이면 thinkingConfig를 보내지 않음)
+
+        Args:
+            environ (dict, optional): 환경 변수 (없으면 os.environ)
+
+        Returns:
+            GenerationSizer: 생성 설정 결정기
+        """
+        environ = os.environ if environ is None else environ
+        return cls(
+            headroom=float(environ.get("GEMINI_OUTPUT_HEADROOM", 1.3)),
+            max_tokens=int(environ.get("GEMINI_MAX_OUTPUT_TOKENS", 8192)),
+            thinking_budget=int(environ.get("GEMINI_THINKING_BUDGET", 1024))
+        )
+
+    def estimate(self, task, input_tokens, tiers=0, passages=1):
+        """
+        필요한 출력 토큰 수 추정 (보정 계수와 여유 비율 적용 전)
+
+        Args:
+            task (str): 작업 이름
+            input_tokens (int): 입력 토큰 수 (지문, HTML 생성은 프롬프트 전체)
+            tiers (int): 요청한 난이도 수
+            passages (int): 지문 수 (배치 분석)
+
+        Returns:
+            int: 추정 출력 토큰 수
+        """
+        profile = TASK_PROFILES.get(task, DEFAULT_PROFILE)
+        estimate = profile["base"] * passages + profile["per_input_token"] * input_tokens
+        estimate += tiers * (profile.get("per_tier", 0) + profile.get("per_tier_input_token", 0) * input_tokens)
+        return int(estimate)
+
+    def config_for(self, task, input_tokens, tiers=0, passages=1):
+        """
+        요청에 사용할 generationConfig
+
+        Args:
+            task (str): 작업 이름
+            input_tokens (int): 입력 토큰 수
+            tiers (int): 요청한 난이도 수
+            passages (int): 지문 수
+
+        Returns:
+            dict: generationConfig (temperature, topP, topK, maxOutputTokens, thinkingConfig)
+        """
+        profile = TASK_PROFILES.get(task, DEFAULT_PROFILE)
+        with self._lock:
+            correction = self._correction.get(task, 1.0)
+        limit = max(self.min_tokens, math.ceil(self.estimate(task, input_tokens, tiers, passages) * correction * self.headroom))
+        config = {
+            "temperature": profile["temperature"],
+            "topP": profile["topP"],
+            "topK": profile["topK"]
+        }
+        if self.thinking_budget >= 0:
+            # 2.5 모델은 생각 토큰도 maxOutputTokens에 포함되므로, 생각 토큰 한도를 정하고 그만큼 출력 한도에 더함
+            # (한도가 없으면 추정치가 작은 첫 요청들이 생각에 한도를 모두 써서 잘리고 이어서 생성하게 됨)
+            config["thinkingConfig"] = {"thinkingBudget": self.thinking_budget}
+            limit += self.thinking_budget
+        config["maxOutputTokens"] = min(self.max_tokens, limit)
+        return config
+
+    def observe(self, task, estimated, output_tokens, truncated=False, continuations=0, thinking_tokens=0):
+        """
+        실제 출력 토큰 수로 작업별 보정 계수 갱신
+
+        Args:
+            task (str): 작업 이름
+            estimated (int): estimate() 결과
+            output_tokens (int): 실제 출력 토큰 수 (이어서 생성한 부분과 생각 토큰 포함)
+            truncated (bool): 첫 응답이 MAX_TOKENS로 잘렸는지 여부
+            continuations (int): 이어서 생성한 횟수
+            thinking_tokens (int): output_tokens 중 생각 토큰 수
+                (thinkingBudget을 보내면 생각 토큰은 따로 더하므로 보정 계수는 나머지 출력으로 학습)
+        """
+        learned = output_tokens - thinking_tokens if self.thinking_budget >= 0 else output_tokens
+        if not estimated or learned <= 0:
+            return
+        ratio = learned / estimated
+        with self._lock:
+            correction = self._correction.get(task, 1.0)
+            if truncated:
+                # 잘린 응답은 필요한 양의 하한이므로 보정 계수를 줄이지 않음
+                ratio = max(ratio, correction * 1.25)
+            self._correction[task] = min(4.0, max(0.25, correction + self.alpha * (ratio - correction)))
+            stats = self._stats.setdefault(task, {"requests": 0, "truncated": 0, "continuations": 0, "output_tokens": 0, "thinking_tokens": 0})
+            stats["requests"] += 1
+            stats["truncated"] += int(truncated)
+            stats["continuations"] += continuations
+            stats["output_tokens"] += output_tokens
+            stats["thinking_tokens"] += thinking_tokens
+        metrics.observe("gapfill_gemini_output_ratio", ratio, task=task)
+
+    def get_stats(self):
+        """
+        작업별 출력 크기 통계
+
+        Returns:
+            dict: 작업 이름 → 요청 수, 잘린 비율, 이어서 생성한 횟수, 평균 출력 토큰 수, 보정 계수
+        """
+        with self._lock:
+            result = {}
+            for task, stats in self._stats.items():
+                result[task] = dict(stats)
+                result[task]["truncation_rate"] = round(stats["truncated"] / stats["requests"], 4)
+                result[task]["mean_output_tokens"] = round(stats["output_tokens"] / stats["requests"], 1)
+                result[task]["correction"] = round(self._correction.get(task, 1.0), 4)
+            return result
@@ -0,0 +1,203 @@
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from monitoring.metrics import metrics
+
+class HedgingPolicy:
+    """
+    Gemini API 요청 헤징 (tail latency 감소)
+    요청이 최근 지연 시간의 백분위수(예: p95)까지 끝나지 않으면 같은 요청을 한 번 더 보내고, 먼저 끝난 응답을 사용
+    추가 요청은 일반 요청 수의 일정 비율(budget) 이내로 제한
+    """
+
+    def __init__(self, percentile=95, budget=0.05, min_samples=20, window=200, max_tokens=10, max_workers=32):
+        """
+        HedgingPolicy 초기화
+
+        Args:
+            percentile (float): 헤지 요청을 보낼 지연 시간 백분위 (0~100)
+            budget (float): 일반 요청 하나당 허용하는 헤지 요청 수 (예: 0.05면 최대 5%)
+            min_samples (int): 헤지를 시작하기 전에 필요한 지연 시간 측정 수
+            window (int): 작업/모델별로 유지하는 최근 지연 시간 측정 수
+            max_tokens (float): 쌓아 둘 수 있는 헤지 예산 상한 (한가할 때 예산이 무한히 쌓이지 않도록 함)
+            max_workers (int): 요청을 실행하는 스레드 수
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.window = window
+        self.max_tokens = max_tokens
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._tokens = 0.0
+        self._stats = {}
+        self._executor = None
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """
+        환경 변수로 생성 (GEMINI_HEDGE_PERCENTILE이 없으면 헤징을 사용하지 않음)
+        GEMINI_HEDGE_PERCENTILE: 헤지 백분위 (예: 95), GEMINI_HEDGE_BUDGET: 추가 요청 비율 (기본값 0.05),
+        GEMINI_HEDGE_MIN_SAMPLES: 최소 측정 수 (기본값 20)
+
+        Args:
+            environ (dict, optional): 환경 변수 (없으면 os.environ)
+
+        Returns:
+            HedgingPolicy: 헤징 정책 (사용하지 않으면 None)
+        """
+        environ = os.environ if environ is None else environ
+        percentile = environ.get("GEMINI_HEDGE_PERCENTILE")
+        if not percentile:
+            return None
+        return cls(
+            percentile=float(percentile),
+            budget=float(environ.get("GEMINI_HEDGE_BUDGET", 0.05)),
+            min_samples=int(environ.get("GEMINI_HEDGE_MIN_SAMPLES", 20))
+        )
+
+    def _get_executor(self):
+        """요청 실행용 스레드 풀 (처음 사용할 때 생성)"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gemini-hedge")
+            return self._executor
+
+    def observe(self, key, elapsed):
+        """
+        완료된 요청의 지연 시간 기록
+
+        Args:
+            key (tuple): (작업, 모델)
+            elapsed (float): 지연 시간(초)
+        """
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(elapsed)
+
+    def hedge_delay(self, key):
+        """
+        헤지 요청을 보내기까지 기다릴 시간 (최근 지연 시간의 백분위수)
+
+        Args:
+            key (tuple): (작업, 모델)
+
+        Returns:
+            float: 대기 시간(초) (측정이 부족하면 None)
+        """
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        rank = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[rank]
+
+    def _take_token(self):
+        """헤지 예산 사용 (예산이 없으면 False)"""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _timed(self, key, call):
+        """요청 실행 및 지연 시간 기록 (실패한 요청은 기록하지 않음)"""
+        start = time.perf_counter()
+        result = call()
+        if result is not None:
+            self.observe(key, time.perf_counter() - start)
+        return result
+
+    def run(self, task, model, call):
+        """
+        헤징 정책에 따라 요청 실행
+
+        Args:
+            task (str): 작업 이름
+            model (str): 모델 이름
+            call (callable): 인자 없이 API 응답을 반환하는 함수 (실패 시 None)
+
+        Returns:
+            dict: 먼저 성공한 API 응답 (모두 실패하면 None)
+        """
+        key = (task, model)
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.budget)
+
+        delay = self.hedge_delay(key)
+        if delay is None:
+            return self._timed(key, call)
+
+        executor = self._get_executor()
+        # 요청 타이밍/사용량(Server-Timing, X-Gapfill-Usage)이 작업 스레드에서도 기록되도록 요청마다 컨텍스트 복사
+        primary = executor.submit(contextvars.copy_context().run, self._timed, key, call)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        if not self._take_token():
+            self._record(task, hedged=False, skipped=True)
+            return primary.result()
+
+        metrics.inc("gapfill_gemini_hedges_total", task=task)
+        hedge = executor.submit(contextvars.copy_context().run, self._timed, key, call)
+        pending = {primary, hedge}
+        result = None
+        winner = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result is not None:
+                    winner = future
+                    break
+            if winner is not None:
+                break
+
+        # 진행 중인 HTTP 요청은 중단할 수 없으므로, 늦게 끝난 요청의 결과는 버림 (아직 시작 전이면 취소)
+        for future in pending:
+            future.cancel()
+
+        self._record(task, hedged=True, won=winner is hedge)
+        return result
+
+    def _record(self, task, hedged, won=False, skipped=False):
+        """작업별 헤지 통계 기록"""
+        with self._lock:
+            stats = self._stats.setdefault(task, {"hedges": 0, "hedge_wins": 0, "skipped_by_budget": 0})
+            if skipped:
+                stats["skipped_by_budget"] += 1
+            if hedged:
+                stats["hedges"] += 1
+            if won:
+                stats["hedge_wins"] += 1
+        if skipped:
+            metrics.inc("gapfill_gemini_hedges_skipped_total", task=task)
+        if won:
+            metrics.inc("gapfill_gemini_hedge_wins_total", task=task)
+
+    def get_stats(self):
+        """
+        작업별 헤지 통계
+
+        Returns:
+            dict: 작업 이름 → 헤지 요청 수, 헤지가 먼저 끝난 비율(hedge_win_rate), 예산 부족으로 건너뛴 수, 모델별 헤지 대기 시간
+        """
+        with self._lock:
+            result = {task: dict(stats) for task, stats in self._stats.items()}
+            keys = list(self._samples)
+        for task, stats in result.items():
+            stats["hedge_win_rate"] = round(stats["hedge_wins"] / stats["hedges"], 4) if stats["hedges"] else 0.0
+        for task, model in keys:
+            delay = self.hedge_delay((task, model))
+            if delay is not None:
+                result.setdefault(task, {}).setdefault("hedge_delay_seconds", {})[model] = round(delay, 4)
+        return result
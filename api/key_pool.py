@@ -0,0 +1,227 @@
+import os
+import threading
+import time
+from collections import deque
+
+from monitoring.metrics import metrics
+
+# 요청/토큰 사용량을 집계하는 구간(초) (Gemini 할당량은 분 단위)
+RATE_WINDOW_SECONDS = 60
+
+def key_label(api_key):
+    """지표/통계에 사용할 API 키 표시 (마지막 4자리)"""
+    return f"...{api_key[-4:]}"
+
+class KeyState:
+    """
+    API 키 하나의 최근 사용량과 격리 상태
+    """
+    __slots__ = ("api_key", "request_times", "token_events", "in_flight", "quarantined_until", "throttles", "requests", "tokens")
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.request_times = deque()
+        self.token_events = deque()
+        self.in_flight = 0
+        self.quarantined_until = 0.0
+        self.throttles = 0
+        self.requests = 0
+        self.tokens = 0
+
+class KeyPool:
+    """
+    여러 Gemini API 키(또는 프로젝트)를 함께 사용하는 키 풀
+    키별 최근 1분 요청/토큰 수를 추적하여 여유가 가장 많은 키로 요청을 보내고,
+    429를 받은 키는 Retry-After 동안 격리
+    """
+
+    def __init__(self, api_keys, requests_per_minute=None, tokens_per_minute=None, quarantine_seconds=30, clock=time.monotonic):
+        """
+        KeyPool 초기화
+
+        Args:
+            api_keys (list): API 키 목록
+            requests_per_minute (int, optional): 키별 분당 요청 한도 (없으면 요청 수로 여유를 판단하지 않음)
+            tokens_per_minute (int, optional): 키별 분당 토큰 한도 (없으면 토큰 수로 여유를 판단하지 않음)
+            quarantine_seconds (float): Retry-After가 없는 429를 받았을 때 키를 격리하는 시간(초)
+            clock (callable): 현재 시각 함수 (테스트용)
+        """
+        api_keys = [api_key for api_key in dict.fromkeys(api_keys) if api_key]
+        if not api_keys:
+            raise ValueError("API 키가 하나 이상 필요합니다.")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.quarantine_seconds = quarantine_seconds
+        self.clock = clock
+        self._keys = [KeyState(api_key) for api_key in api_keys]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, api_key=None, environ=None):
+        """
+        환경 변수로 생성
+        GEMINI_API_KEYS: 쉼표로 구분한 키 목록 (없으면 api_key 또는 GEMINI_API_KEY 하나),
+        GEMINI_KEY_RPM / GEMINI_KEY_TPM: 키별 분당 요청/토큰 한도
+
+        Args:
+            api_key (str, optional): 직접 지정한 API 키 (지정하면 GEMINI_API_KEYS보다 우선)
+            environ (dict, optional): 환경 변수 (없으면 os.environ)
+
+        Returns:
+            KeyPool: 키 풀
+
+        Raises:
+            ValueError: API 키가 없는 경우
+        """
+        environ = os.environ if environ is None else environ
+        if api_key:
+            api_keys = [api_key]
+        else:
+            api_keys = [key.strip() for key in environ.get("GEMINI_API_KEYS", "").split(",") if key.strip()]
+            api_keys = api_keys or [environ.get("GEMINI_API_KEY")]
+        if not any(api_keys):
+            raise ValueError("Gemini API 키가 필요합니다. 환경 변수 GEMINI_API_KEY를 설정하거나 초기화 시 제공하세요.")
+        rpm = environ.get("GEMINI_KEY_RPM")
+        tpm = environ.get("GEMINI_KEY_TPM")
+        return cls(api_keys, int(rpm) if rpm else None, int(tpm) if tpm else None)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _prune(self, state, now):
+        """집계 구간이 지난 사용량 기록 제거 (잠금을 잡은 상태에서 호출)"""
+        while state.request_times and now - state.request_times[0] >= RATE_WINDOW_SECONDS:
+            state.request_times.popleft()
+        while state.token_events and now - state.token_events[0][0] >= RATE_WINDOW_SECONDS:
+            state.token_events.popleft()
+
+    def _usage(self, state):
+        """
+        키 사용률 (0~1, 요청/토큰 한도 중 더 많이 쓴 쪽)
+        한도가 없으면 최근 1분 요청 수를 사용하여 키 간 요청을 고르게 분산
+        """
+        requests = len(state.request_times) + state.in_flight
+        tokens = sum(tokens for _, tokens in state.token_events)
+        usage = []
+        if self.requests_per_minute:
+            usage.append(requests / self.requests_per_minute)
+        if self.tokens_per_minute:
+            usage.append(tokens / self.tokens_per_minute)
+        return max(usage) if usage else requests
+
+    def acquire(self):
+        """
+        요청에 사용할 키 선택 (격리되지 않은 키 중 여유가 가장 많은 키)
+        모든 키가 격리되어 있으면 가장 먼저 격리가 풀리는 키
+
+        Returns:
+            str: API 키 (요청이 끝나면 release() 호출)
+        """
+        with self._lock:
+            now = self.clock()
+            available = [state for state in self._keys if state.quarantined_until <= now]
+            if available:
+                for state in available:
+                    self._prune(state, now)
+                state = min(available, key=self._usage)
+            else:
+                state = min(self._keys, key=lambda state: state.quarantined_until)
+                metrics.inc("gapfill_gemini_key_exhausted_total")
+            state.in_flight += 1
+            return state.api_key
+
+    def has_available(self, exclude=()):
+        """
+        격리되지 않은 다른 키가 있는지 확인
+
+        Args:
+            exclude (iterable): 제외할 API 키
+
+        Returns:
+            bool: 사용할 수 있는 키 존재 여부
+        """
+        with self._lock:
+            now = self.clock()
+            return any(state.quarantined_until <= now and state.api_key not in exclude for state in self._keys)
+
+    def _state(self, api_key):
+        """키 상태 조회 (잠금을 잡은 상태에서 호출)"""
+        for state in self._keys:
+            if state.api_key == api_key:
+                return state
+        raise KeyError(key_label(api_key))
+
+    def release(self, api_key):
+        """
+        요청 완료 기록 (429 외의 응답 또는 연결 실패)
+
+        Args:
+            api_key (str): acquire()로 받은 API 키
+        """
+        with self._lock:
+            state = self._state(api_key)
+            state.in_flight = max(0, state.in_flight - 1)
+            state.request_times.append(self.clock())
+            state.requests += 1
+
+    def record_tokens(self, api_key, tokens):
+        """
+        응답의 토큰 사용량 기록
+
+        Args:
+            api_key (str): 요청에 사용한 API 키
+            tokens (int): 사용한 토큰 수 (응답의 usageMetadata.totalTokenCount)
+        """
+        if not tokens:
+            return
+        with self._lock:
+            state = self._state(api_key)
+            state.token_events.append((self.clock(), tokens))
+            state.tokens += tokens
+
+    def get_keys(self):
+        """
+        API 키 목록
+
+        Returns:
+            list: API 키 목록 (등록 순서)
+        """
+        return [state.api_key for state in self._keys]
+
+    def throttled(self, api_key, retry_after=None):
+        """
+        429(RESOURCE_EXHAUSTED) 응답 기록 및 키 격리
+
+        Args:
+            api_key (str): 429를 받은 API 키
+            retry_after (float, optional): 응답의 Retry-After(초) (없으면 quarantine_seconds)
+        """
+        with self._lock:
+            state = self._state(api_key)
+            state.in_flight = max(0, state.in_flight - 1)
+            state.throttles += 1
+            state.quarantined_until = self.clock() + (retry_after if retry_after is not None else self.quarantine_seconds)
+        metrics.inc("gapfill_gemini_key_throttled_total", key=key_label(api_key))
+
+    def get_stats(self):
+        """
+        키별 사용량 통계
+
+        Returns:
+            dict: 키 표시(마지막 4자리) → 최근 1분 요청/토큰 수, 전체 요청/토큰 수, 429 수, 남은 격리 시간
+        """
+        with self._lock:
+            now = self.clock()
+            result = {}
+            for state in self._keys:
+                self._prune(state, now)
+                result[key_label(state.api_key)] = {
+                    "requests_last_minute": len(state.request_times),
+                    "tokens_last_minute": sum(tokens for _, tokens in state.token_events),
+                    "in_flight": state.in_flight,
+                    "requests": state.requests,
+                    "tokens": state.tokens,
+                    "throttled": state.throttles,
+                    "quarantined_seconds": round(max(0.0, state.quarantined_until - now), 3)
+                }
+            return result
@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+
+from monitoring.metrics import metrics
+
+# 작업별 설정이 없을 때 사용하는 모델
+DEFAULT_MODEL = "gemini-2.5-pro-preview-03-25"
+
+# 모델을 따로 지정할 수 있는 작업 (GeminiClient.generate_content의 task)
+ROUTED_TASKS = ("analyze_text", "analyze_texts", "generate_gapfill", "generate_html_output")
+
+class ModelRouter:
+    """
+    작업별 Gemini 모델 선택 및 단계적 모델 호출(cascade)
+    cascade가 설정된 작업은 빠르고 저렴한 모델부터 호출하고, 결과 검증에 실패한 경우에만 다음 모델로 넘어감
+    """
+
+    def __init__(self, default_model=DEFAULT_MODEL, models=None, cascades=None, latency_alpha=0.2, baseline_latency=None):
+        """
+        ModelRouter 초기화
+
+        Args:
+            default_model (str): 작업별 설정이 없을 때 사용할 모델
+            models (dict, optional): 작업 이름 → 모델
+            cascades (dict, optional): 작업 이름 → 모델 목록 (빠른 모델부터, 마지막 모델의 결과는 검증 없이 사용)
+            latency_alpha (float): 모델별 평균 지연 시간(지수 이동 평균)의 가중치
+            baseline_latency (dict, optional): 모델 → 예상 지연 시간(초)
+                (cascade의 마지막 모델을 아직 호출한 적이 없을 때 절약한 시간 계산에 사용)
+        """
+        self.default_model = default_model
+        self.models = dict(models or {})
+        self.cascades = {task: list(chain) for task, chain in (cascades or {}).items() if chain}
+        self.latency_alpha = latency_alpha
+        self.baseline_latency = dict(baseline_latency or {})
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._stats = {}
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """
+        환경 변수로 생성
+        GEMINI_MODEL: 기본 모델, GEMINI_MODEL_<작업>: 작업별 모델 (예: GEMINI_MODEL_ANALYZE_TEXT),
+        GEMINI_CASCADE_<작업>: 쉼표로 구분한 모델 목록 (예: GEMINI_CASCADE_GENERATE_GAPFILL="gemini-2.5-flash,gemini-2.5-pro"),
+        GEMINI_MODEL_LATENCY: 쉼표로 구분한 모델별 예상 지연 시간(초) (예: "gemini-2.5-pro=30,gemini-2.5-flash=8")
+
+        Args:
+            environ (dict, optional): 환경 변수 (없으면 os.environ)
+
+        Returns:
+            ModelRouter: 라우터
+        """
+        environ = os.environ if environ is None else environ
+        models = {}
+        cascades = {}
+        for task in ROUTED_TASKS:
+            model = environ.get(f"GEMINI_MODEL_{task.upper()}")
+            if model:
+                models[task] = model.strip()
+            chain = [name.strip() for name in environ.get(f"GEMINI_CASCADE_{task.upper()}", "").split(",") if name.strip()]
+            if chain:
+                cascades[task] = chain
+        baseline_latency = {}
+        for entry in environ.get("GEMINI_MODEL_LATENCY", "").split(","):
+            if not entry.strip():
+                continue
+            model, _, seconds = entry.rpartition("=")
+            try:
+                baseline_latency[model.strip()] = float(seconds)
+            except ValueError:
+                print(f"GEMINI_MODEL_LATENCY 항목을 무시합니다 (모델=초 형식이 아님): {entry.strip()}")
+        return cls(environ.get("GEMINI_MODEL") or DEFAULT_MODEL, models, cascades, baseline_latency=baseline_latency)
+
+    def model_for(self, task):
+        """
+        작업에 사용할 모델 (cascade가 설정된 경우 첫 번째 모델)
+
+        Args:
+            task (str): 작업 이름
+
+        Returns:
+            str: 모델 이름
+        """
+        return self.cascade_for(task)[0]
+
+    def cascade_for(self, task):
+        """
+        작업의 모델 호출 순서
+
+        Returns:
+            list: 모델 이름 목록
+        """
+        return self.cascades.get(task) or [self.models.get(task, self.default_model)]
+
+    def run(self, task, call, validate=None):
+        """
+        작업에 맞는 모델로 호출 (cascade가 설정되어 있으면 검증에 통과할 때까지 다음 모델로 넘어감)
+
+        Args:
+            task (str): 작업 이름
+            call (callable): 모델 이름을 받아 API 응답을 반환하는 함수
+            validate (callable, optional): API 응답을 받아 사용할 수 있는 결과인지 반환하는 함수
+                (없으면 첫 번째 모델의 응답을 그대로 사용)
+
+        Returns:
+            dict: API 응답 데이터
+        """
+        chain = self.cascade_for(task)
+        if validate is None or len(chain) == 1:
+            return call(chain[0])
+
+        spent = 0.0
+        for position, model in enumerate(chain):
+            start = time.perf_counter()
+            response = call(model)
+            elapsed = time.perf_counter() - start
+            self._observe_latency(task, model, elapsed)
+
+            final = position == len(chain) - 1
+            if final or self._is_valid(validate, response):
+                self._record(task, model, position, elapsed, spent, chain[-1])
+                return response
+
+            # 검증 실패: 다음(더 큰) 모델로 넘어감
+            spent += elapsed
+            metrics.inc("gapfill_model_escalations_total", task=task, model=model)
+
+    def _is_valid(self, validate, response):
+        """검증 함수 실행 (예외는 검증 실패로 처리)"""
+        try:
+            return bool(validate(response))
+        except Exception as e:
+            print(f"모델 응답 검증 오류: {e}")
+            return False
+
+    def _observe_latency(self, task, model, elapsed):
+        """작업/모델별 평균 지연 시간(지수 이동 평균) 갱신"""
+        with self._lock:
+            previous = self._latency.get((task, model))
+            self._latency[(task, model)] = elapsed if previous is None else previous + self.latency_alpha * (elapsed - previous)
+
+    def _record(self, task, model, position, elapsed, spent, final_model):
+        """
+        cascade 결과 기록
+        첫 모델에서 끝나면 마지막 모델의 평균 지연 시간(관찰값이 없으면 설정값)과의 차이를 절약한 시간으로,
+        다음 모델로 넘어가면 앞선 호출에 쓴 시간을 추가 지연 시간으로 기록
+        (마지막 모델의 지연 시간을 알 수 없으면 절약한 시간을 0이 아닌 측정 불가로 셈)
+        """
+        with self._lock:
+            stats = self._stats.setdefault(task, {
+                "requests": 0,
+                "escalations": 0,
+                "accepted_by_model": {},
+                "latency_saved_seconds": 0.0,
+                "savings_measured": 0,
+                "savings_unmeasured": 0,
+                "escalation_latency_seconds": 0.0
+            })
+            stats["requests"] += 1
+            stats["accepted_by_model"][model] = stats["accepted_by_model"].get(model, 0) + 1
+            saved = 0.0
+            if position == 0:
+                baseline = self._latency.get((task, final_model), self.baseline_latency.get(final_model))
+                if baseline is not None:
+                    saved = max(0.0, baseline - elapsed)
+                    stats["latency_saved_seconds"] += saved
+                    stats["savings_measured"] += 1
+                else:
+                    stats["savings_unmeasured"] += 1
+            else:
+                stats["escalations"] += 1
+                stats["escalation_latency_seconds"] += spent
+
+        metrics.inc("gapfill_model_requests_total", task=task, model=model)
+        if saved:
+            metrics.inc("gapfill_model_latency_saved_seconds_total", saved, task=task)
+        if spent:
+            metrics.inc("gapfill_model_escalation_latency_seconds_total", spent, task=task)
+
+    def get_stats(self):
+        """
+        작업별 모델 설정과 cascade 통계
+
+        Returns:
+            dict: 작업 이름 → 모델 목록, 요청 수, 상위 모델로 넘어간 비율, 절약한 시간, 모델별 평균 지연 시간
+                (마지막 모델의 지연 시간을 알 수 없어 절약한 시간을 한 번도 계산하지 못했으면 절약한 시간은 None)
+        """
+        with self._lock:
+            result = {}
+            for task in sorted(set(ROUTED_TASKS) | set(self._stats)):
+                stats = dict(self._stats.get(task, {}))
+                stats["models"] = self.cascade_for(task)
+                if stats.get("requests"):
+                    stats["accepted_by_model"] = dict(stats["accepted_by_model"])
+                    stats["escalation_rate"] = round(stats["escalations"] / stats["requests"], 4)
+                    if stats["savings_unmeasured"] and not stats["savings_measured"]:
+                        stats["latency_saved_seconds"] = None
+                        stats["net_latency_saved_seconds"] = None
+                    else:
+                        stats["net_latency_saved_seconds"] = round(
+                            stats["latency_saved_seconds"] - stats["escalation_latency_seconds"], 4
+                        )
+                stats["model_latency_seconds"] = {
+                    model: round(value, 4) for (latency_task, model), value in self._latency.items() if latency_task == task
+                }
+                result[task] = stats
+            return result
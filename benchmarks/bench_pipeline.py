@@ -0,0 +1,145 @@
+import argparse
+import os
+import threading
+
+from common import environment_info, measure, measure_concurrent, write_report
+from corpus import CSAT_PASSAGES, gapfill_json_response, gapfill_raw_response, sample_html
+
+from api.gemini_client import GeminiClient
+from api.gemini_stub_server import StubConfig, start_stub_server
+from analysis.text_analyzer import TextAnalyzer
+from cache.result_cache import ResultCache
+from generator.gapfill_generator import GapfillGenerator
+from generator.models import dumps_json
+from optimization.korean_learner_optimization import KoreanLearnerOptimization
+
+def bench_components(stub_url, iterations):
+    """
+    파이프라인 구성 요소별 지연 시간 측정 (스텁 Gemini 백엔드 사용)
+
+    Args:
+        stub_url (str): 스텁 서버 기본 URL
+        iterations (int): 항목별 측정 횟수
+
+    Returns:
+        dict: 항목별 summarize() 결과
+    """
+    client = GeminiClient(api_key="benchmark-key", base_url=stub_url)
+    analyzer = TextAnalyzer(client)
+    # 캐시를 끄고 매번 전체 파이프라인을 실행
+    generator = GapfillGenerator(client, analyzer, ResultCache(max_entries=0))
+    optimizer = KoreanLearnerOptimization(client)
+
+    json_results = [gapfill_json_response(passage) for passage in CSAT_PASSAGES]
+    raw_results = [{"raw_result": gapfill_raw_response(passage)} for passage in CSAT_PASSAGES]
+    long_raw_results = [{"raw_result": gapfill_raw_response(passage, repeat=20)} for passage in CSAT_PASSAGES[:2]]
+    html_outputs = [sample_html(passage) for passage in CSAT_PASSAGES]
+    structured_results = [generator._structure_gapfill_result(result) for result in json_results]
+
+    return {
+        "text_analyzer.analyze": measure(analyzer.analyze, CSAT_PASSAGES, iterations),
+        "gapfill_generator.generate": measure(generator.generate, CSAT_PASSAGES, iterations),
+        "structure_gapfill_result.json": measure(generator._structure_gapfill_result, json_results, iterations * 10),
+        "structure_gapfill_result.raw": measure(generator._structure_gapfill_result, raw_results, iterations * 10),
+        "structure_gapfill_result.raw_long": measure(generator._structure_gapfill_result, long_raw_results, iterations),
+        "result_model.dumps_json": measure(dumps_json, structured_results, iterations * 10),
+        "korean_optimizer.analyze_grammar_elements": measure(optimizer._analyze_grammar_elements, CSAT_PASSAGES, iterations * 10),
+        "korean_optimizer.optimize_html_output": measure(optimizer.optimize_html_output, html_outputs, iterations * 10)
+    }
+
+def bench_endpoints(stub_url, requests_per_endpoint, concurrency, use_cache=False):
+    """
+    Flask 엔드포인트 동시 부하 측정 (스레드 WSGI 서버 + 스텁 Gemini 백엔드)
+
+    Args:
+        stub_url (str): 스텁 서버 기본 URL
+        requests_per_endpoint (int): 엔드포인트별 전체 요청 수
+        concurrency (int): 동시 요청 수
+        use_cache (bool): 결과 캐시 사용 여부 (기본값: 캐시 없이 매번 생성)
+
+    Returns:
+        dict: 엔드포인트별 summarize() 결과
+    """
+    import requests
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietRequestHandler(WSGIRequestHandler):
+        """요청 로그 출력 억제"""
+        def log_request(self, *args, **kwargs):
+            pass
+
+    os.environ["GEMINI_API_KEY"] = "benchmark-key"
+    os.environ["GEMINI_API_BASE_URL"] = stub_url
+    # 거절(503)이 아닌 생성 성능을 측정하도록 동시 요청을 모두 받아들임 (요청 스레드 수 제한이 없는 개발 서버 사용)
+    os.environ["GUNICORN_THREADS"] = str(concurrency + 1)
+    os.environ["GAPFILL_ADMISSION_CONCURRENCY"] = str(concurrency)
+    import web.app as web_app
+
+    if not use_cache:
+        web_app.app.config['RESULT_CACHE_MAX_ENTRIES'] = 0
+    web_app._components = None
+
+    server = make_server("127.0.0.1", 0, web_app.app, threaded=True, request_handler=QuietRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    def post(path):
+        def call(text):
+            response = requests.post(base_url + path, json={"text": text}, timeout=120)
+            return response.status_code == 200
+        return call
+
+    try:
+        return {
+            "endpoint./api/analyze": measure_concurrent(post("/api/analyze"), CSAT_PASSAGES, requests_per_endpoint, concurrency),
+            "endpoint./api/gapfill": measure_concurrent(post("/api/gapfill"), CSAT_PASSAGES, requests_per_endpoint, concurrency)
+        }
+    finally:
+        server.shutdown()
+
+def run(iterations=20, requests_per_endpoint=40, concurrency=8, stub_latency=None, endpoint_cache=False, skip_endpoints=False):
+    """
+    전체 파이프라인 벤치마크 실행
+
+    Returns:
+        dict: 벤치마크 결과 (환경 정보와 설정 포함)
+    """
+    stub = start_stub_server(config=StubConfig(latency=stub_latency, seed=0))
+    try:
+        results = bench_components(stub.base_url, iterations)
+        if not skip_endpoints:
+            results.update(bench_endpoints(stub.base_url, requests_per_endpoint, concurrency, endpoint_cache))
+    finally:
+        stub.shutdown()
+
+    return {
+        "benchmark": "pipeline",
+        "environment": environment_info(),
+        "config": {
+            "iterations": iterations,
+            "requests_per_endpoint": requests_per_endpoint,
+            "concurrency": concurrency,
+            "stub_latency": stub_latency,
+            "endpoint_cache": endpoint_cache,
+            "passages": len(CSAT_PASSAGES)
+        },
+        "results": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="갭필 생성 파이프라인 벤치마크 (스텁 Gemini 백엔드)")
+    parser.add_argument("--iterations", type=int, default=20, help="구성 요소별 측정 횟수")
+    parser.add_argument("--requests", type=int, default=40, help="엔드포인트별 전체 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="엔드포인트 동시 요청 수")
+    parser.add_argument("--stub-latency", help='스텁 지연 시간 분포 (예: "lognormal:0.05,0.5")')
+    parser.add_argument("--endpoint-cache", action="store_true", help="엔드포인트 측정 시 결과 캐시 사용")
+    parser.add_argument("--skip-endpoints", action="store_true", help="엔드포인트 부하 측정 생략")
+    parser.add_argument("--output", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    report = run(args.iterations, args.requests, args.concurrency, args.stub_latency, args.endpoint_cache, args.skip_endpoints)
+    write_report(report, args.output)
+
+if __name__ == "__main__":
+    main()
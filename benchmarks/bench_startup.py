@@ -0,0 +1,137 @@
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import time
+
+from common import PROJECT_ROOT, environment_info, summarize, write_report
+
+# 서브프로세스에서 실행할 측정 코드
+COLD_IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import web.app
+print(time.perf_counter() - start)
+"""
+
+FIRST_COMPONENTS_SNIPPET = """
+import time
+import web.app
+start = time.perf_counter()
+web.app.get_components()
+print(time.perf_counter() - start)
+"""
+
+def _run_snippet(snippet, env):
+    """
+    새 인터프리터에서 측정 코드를 실행하고 출력된 소요 시간(초) 반환
+    """
+    output = subprocess.check_output(
+        [sys.executable, "-c", snippet],
+        cwd=PROJECT_ROOT,
+        env=env
+    )
+    return float(output.decode().strip().splitlines()[-1])
+
+def _run_main(env):
+    """
+    main.py 전체 실행 시간(초) 측정
+    """
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, os.path.join(PROJECT_ROOT, "main.py")],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        check=True
+    )
+    return time.perf_counter() - start
+
+def _measure_worker_boot(app_module):
+    """
+    fork된 워커가 첫 요청을 처리할 때까지의 시간(초) 측정
+    (마스터에서 컴포넌트를 미리 생성했다면 워커는 이를 그대로 공유)
+
+    Args:
+        app_module (module): web.app 모듈
+
+    Returns:
+        float: 워커 부팅 시간(초)
+    """
+    read_fd, write_fd = os.pipe()
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        # 워커 프로세스: 컴포넌트 확보 후 첫 요청 처리
+        os.close(read_fd)
+        app_module.get_components()
+        with app_module.app.test_client() as client:
+            client.get('/')
+        os.write(write_fd, b"done")
+        os._exit(0)
+
+    os.close(write_fd)
+    os.read(read_fd, 4)
+    elapsed = time.perf_counter() - start
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    return elapsed
+
+def run(repeat=5):
+    """
+    시작 시간 벤치마크 실행
+
+    Args:
+        repeat (int): 항목별 반복 횟수
+
+    Returns:
+        dict: 벤치마크 결과
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = PROJECT_ROOT
+    env.setdefault("GEMINI_API_KEY", "benchmark-key")
+    os.environ.setdefault("GEMINI_API_KEY", env["GEMINI_API_KEY"])
+
+    results = {
+        "cold_import_web_app": summarize([_run_snippet(COLD_IMPORT_SNIPPET, env) for _ in range(repeat)]),
+        "first_get_components": summarize([_run_snippet(FIRST_COMPONENTS_SNIPPET, env) for _ in range(repeat)]),
+        "main_py_total": summarize([_run_main(env) for _ in range(repeat)])
+    }
+
+    if hasattr(os, "fork"):
+        import web.app as app_module
+
+        # 사전 로드 없이 fork: 각 워커가 컴포넌트를 직접 생성
+        cold_samples = []
+        for _ in range(repeat):
+            app_module._components = None
+            cold_samples.append(_measure_worker_boot(app_module))
+        results["worker_boot_cold"] = summarize(cold_samples)
+
+        # 마스터에서 사전 로드 후 fork (gunicorn.conf.py의 when_ready와 동일)
+        app_module.preload_components()
+        gc.freeze()
+        results["worker_boot_preloaded"] = summarize(
+            [_measure_worker_boot(app_module) for _ in range(repeat)]
+        )
+        gc.unfreeze()
+
+    return {
+        "benchmark": "startup",
+        "environment": environment_info(),
+        "config": {"repeat": repeat},
+        "results": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="웹 앱 시작 시간 및 워커 부팅 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 반복 횟수")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (없으면 표준 출력)")
+    args = parser.parse_args()
+
+    write_report(run(args.repeat), args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+
+from common import environment_info, measure_concurrent, write_report
+from corpus import CSAT_PASSAGES, gapfill_json_response, gapfill_raw_response, sample_html
+
+from generator.gapfill_generator import structure_gapfill_text
+from generator.worker_pool import PostProcessPool
+from optimization.korean_learner_optimization import KoreanLearnerOptimization
+
+def build_tasks(repeat):
+    """
+    후처리 작업 목록 (Gemini 응답 텍스트 구조화, 문법 요소 분석, HTML 최적화)
+
+    Args:
+        repeat (int): 텍스트 응답 섹션 반복 횟수 (긴 응답 시뮬레이션)
+
+    Returns:
+        list: (작업 종류, 입력 문자열) 튜플 목록
+    """
+    tasks = []
+    for passage in CSAT_PASSAGES:
+        tasks.append(("structure", "```json\n" + json.dumps(gapfill_json_response(passage), ensure_ascii=False) + "\n```"))
+        tasks.append(("structure", gapfill_raw_response(passage, repeat=repeat)))
+        tasks.append(("grammar", passage * repeat))
+        tasks.append(("html", sample_html(passage)))
+    return tasks
+
+def process_counts(max_processes):
+    """측정할 프로세스 수 목록 (1, 2, 4, ..., max_processes)"""
+    counts = []
+    count = 1
+    while count < max_processes:
+        counts.append(count)
+        count *= 2
+    counts.append(max_processes)
+    return counts
+
+def bench_inline(tasks, total, concurrency):
+    """
+    현재 프로세스의 스레드에서 후처리 (GIL 공유)
+    """
+    optimizer = KoreanLearnerOptimization()
+    handlers = {
+        "structure": structure_gapfill_text,
+        "grammar": optimizer._analyze_grammar_elements,
+        "html": optimizer.optimize_html_output
+    }
+    return measure_concurrent(lambda task: handlers[task[0]](task[1]) is not None, tasks, total, concurrency)
+
+def bench_pool(tasks, total, processes):
+    """
+    PostProcessPool 작업 프로세스에서 후처리
+    """
+    pool = PostProcessPool(processes)
+    handlers = {
+        "structure": pool.structure,
+        "grammar": pool.analyze_grammar,
+        "html": pool.optimize_html
+    }
+    try:
+        pool.warm_up()
+        return measure_concurrent(lambda task: handlers[task[0]](task[1]) is not None, tasks, total, processes * 2)
+    finally:
+        pool.shutdown()
+
+def run(total, max_processes, repeat):
+    """
+    프로세스 수별 후처리 처리량 측정
+
+    Returns:
+        dict: 벤치마크 결과 (환경 정보와 설정 포함)
+    """
+    tasks = build_tasks(repeat)
+    results = {}
+    for processes in process_counts(max_processes):
+        inline = bench_inline(tasks, total, processes * 2)
+        pooled = bench_pool(tasks, total, processes)
+        # 처리량 비율은 프로세스 풀 항목에 기록 (results의 모든 항목은 지표 dict)
+        pooled["speedup"] = round(
+            pooled["throughput_per_s"] / inline["throughput_per_s"], 3
+        ) if inline["throughput_per_s"] else None
+        results[f"inline.threads={processes * 2}"] = inline
+        results[f"pool.processes={processes}"] = pooled
+
+    return {
+        "benchmark": "worker_pool",
+        "environment": environment_info(),
+        "config": {
+            "tasks_per_run": total,
+            "max_processes": max_processes,
+            "repeat": repeat
+        },
+        "results": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="후처리 프로세스 풀 확장성 벤치마크")
+    parser.add_argument("--tasks", type=int, default=400, help="측정마다 실행할 후처리 작업 수")
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1, help="최대 작업 프로세스 수")
+    parser.add_argument("--repeat", type=int, default=10, help="텍스트 응답/지문 반복 횟수 (작업 크기)")
+    parser.add_argument("--output", help="결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    report = run(args.tasks, args.max_processes, args.repeat)
+    write_report(report, args.output)
+
+if __name__ == "__main__":
+    main()
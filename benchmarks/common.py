@@ -0,0 +1,167 @@
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 프로젝트 루트를 import 경로에 추가
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+def percentile(samples, pct):
+    """
+    백분위수 계산 (선형 보간)
+
+    Args:
+        samples (list): 측정값 목록
+        pct (float): 백분위 (0~100)
+
+    Returns:
+        float: 백분위수
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def process_peak_rss_mb():
+    """
+    현재 프로세스가 지금까지 사용한 최대 RSS(MB)
+    (프로세스 전체 값이므로 먼저 측정한 구성 요소의 메모리도 포함되며, 구성 요소별 메모리 사용량이 아님)
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 2)
+    return round(peak / 1024, 2)
+
+def summarize(latencies, wall_time=None, errors=0):
+    """
+    지연 시간 측정값 요약
+
+    Args:
+        latencies (list): 호출별 지연 시간(초)
+        wall_time (float, optional): 전체 경과 시간(초). 없으면 지연 시간 합계 사용
+        errors (int): 실패한 호출 수
+
+    Returns:
+        dict: 처리량, p50/p95/p99 지연 시간(ms), 측정 시점까지의 프로세스 최대 RSS(MB)
+    """
+    wall_time = wall_time if wall_time is not None else sum(latencies)
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "iterations": len(latencies),
+        "errors": errors,
+        "throughput_per_s": round(len(latencies) / wall_time, 3) if wall_time else 0.0,
+        "mean_ms": round(statistics.mean(latencies_ms), 4) if latencies_ms else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 4),
+        "p95_ms": round(percentile(latencies_ms, 95), 4),
+        "p99_ms": round(percentile(latencies_ms, 99), 4),
+        "process_peak_rss_mb": process_peak_rss_mb()
+    }
+
+def measure(func, inputs, iterations, warmup=1):
+    """
+    순차 호출 지연 시간 측정
+
+    Args:
+        func (callable): 측정할 함수 (입력 하나를 받음)
+        inputs (list): 입력 목록 (순환하며 사용)
+        iterations (int): 측정 횟수
+        warmup (int): 측정 전 예열 호출 횟수
+
+    Returns:
+        dict: summarize() 결과
+    """
+    for i in range(warmup):
+        func(inputs[i % len(inputs)])
+
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    for i in range(iterations):
+        call_start = time.perf_counter()
+        try:
+            func(inputs[i % len(inputs)])
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+def measure_concurrent(func, inputs, total, concurrency):
+    """
+    동시 호출 부하 측정
+
+    Args:
+        func (callable): 측정할 함수 (입력 하나를 받아 성공 여부를 반환)
+        inputs (list): 입력 목록 (순환하며 사용)
+        total (int): 전체 호출 수
+        concurrency (int): 동시 실행 수
+
+    Returns:
+        dict: summarize() 결과 (concurrency 포함)
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def call(i):
+        call_start = time.perf_counter()
+        try:
+            ok = func(inputs[i % len(inputs)])
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - call_start
+        with lock:
+            latencies.append(elapsed)
+            if ok is False:
+                errors[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, range(total)))
+    result = summarize(latencies, time.perf_counter() - start, errors[0])
+    result["concurrency"] = concurrency
+    return result
+
+def environment_info():
+    """
+    결과 비교를 위한 실행 환경 정보 (커밋, 파이썬 버전, CPU 수)
+    """
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    }
+
+def write_report(report, output=None):
+    """
+    벤치마크 결과를 JSON으로 출력/저장
+
+    Args:
+        report (dict): 벤치마크 결과
+        output (str, optional): 저장할 파일 경로
+    """
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    print(data)
@@ -0,0 +1,74 @@
+import argparse
+import json
+import sys
+
+# 값이 커지면 나빠지는 지표와 작아지면 나빠지는 지표
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "median_ms", "process_peak_rss_mb")
+HIGHER_IS_BETTER = ("throughput_per_s", "speedup")
+
+def compare(baseline, current, threshold):
+    """
+    두 벤치마크 결과 비교 (실패한 호출 수가 늘어난 항목은 변화율과 관계없이 회귀)
+
+    Args:
+        baseline (dict): 기준 결과 (이전 커밋)
+        current (dict): 현재 결과
+        threshold (float): 회귀로 판단할 변화율 (예: 0.1 = 10%)
+
+    Returns:
+        tuple: (비교 행 목록, 회귀 행 목록)
+    """
+    rows = []
+    regressions = []
+    baseline_results = baseline.get("results", {})
+    for name, metrics in current.get("results", {}).items():
+        old_metrics = baseline_results.get(name)
+        # 지표 dict가 아닌 항목은 비교하지 않음
+        if not isinstance(metrics, dict) or not isinstance(old_metrics, dict):
+            continue
+        # 실패한 호출은 빨리 끝나 처리량/지연 시간이 좋아진 것처럼 보이므로, 실패 수가 늘면 다른 지표와 관계없이 회귀로 판단
+        old_errors = old_metrics.get("errors") or 0
+        new_errors = metrics.get("errors") or 0
+        if old_errors or new_errors:
+            change = (new_errors - old_errors) / old_errors if old_errors else float("inf")
+            row = (name, "errors", old_errors, new_errors, change, new_errors > old_errors)
+            rows.append(row)
+            if new_errors > old_errors:
+                regressions.append(row)
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            old = old_metrics.get(metric)
+            new = metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+            row = (name, metric, old, new, change, worse)
+            rows.append(row)
+            if worse:
+                regressions.append(row)
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교 (회귀 발견 시 종료 코드 1)")
+    parser.add_argument("baseline", help="기준 결과 JSON 파일")
+    parser.add_argument("current", help="현재 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=0.1, help="회귀 판단 변화율 (기본값 0.1 = 10%%)")
+    args = parser.parse_args()
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+
+    rows, regressions = compare(baseline, current, args.threshold)
+    for name, metric, old, new, change, worse in rows:
+        marker = "  <-- 회귀" if worse else ""
+        print(f"{name:45s} {metric:16s} {old:12.3f} -> {new:12.3f} ({change:+.1%}){marker}")
+
+    if regressions:
+        print(f"\n{len(regressions)}개 지표에서 {args.threshold:.0%} 이상 성능 저하가 발견되었습니다.")
+        sys.exit(1)
+    print("\n성능 저하가 발견되지 않았습니다.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import json
+
+# 수능/모의고사 유형의 영어 지문 (벤치마크용, 길이 약 120~180단어)
+CSAT_PASSAGES = [
+    """Improving your gestural communication involves more than just knowing when to nod or shake hands.
+It's about using gestures to complement your spoken messages, adding layers of meaning to your words.
+Open-handed gestures, for example, can indicate honesty, creating an atmosphere of trust.
+You invite openness and collaboration when you speak with your palms facing up.
+This simple yet powerful gesture can make others feel more comfortable and willing to engage in conversation.
+But be careful of the trap of over-gesturing. Too many hand movements can distract from your message,
+drawing attention away from your words. Imagine a speaker whose hands move quickly like birds,
+their message lost in the chaos of their gestures. Balance is key.
+Your gestures should highlight your words, not overshadow them.""",
+
+    """Many people assume that creativity is a rare gift reserved for a talented few, but research suggests otherwise.
+Creative thinking is less a matter of sudden inspiration than of persistent exploration.
+When psychologists examined the notebooks of celebrated inventors, they found page after page of
+abandoned ideas, revised sketches, and small experiments that led nowhere. What distinguished these
+inventors was not the absence of failure but their willingness to treat failure as information.
+Each unsuccessful attempt narrowed the range of possibilities and pointed toward a more promising path.
+This implies that schools which punish mistakes may unintentionally discourage the very habits that
+creativity requires. Students who fear being wrong tend to choose safe, familiar answers rather than
+testing unusual combinations. If we want creative learners, we must design environments in which
+experimentation is expected and errors are valued as steps in the process.""",
+
+    """In the early days of photography, critics worried that the camera would destroy painting.
+If a machine could reproduce the visible world with perfect accuracy, what would remain for the artist?
+Yet the opposite happened. Freed from the obligation to record appearances, painters began to explore
+what the camera could not capture: emotion, memory, movement, and the subjective experience of light.
+Impressionists broke scenes into fragments of color, while later artists abandoned representation
+altogether. The arrival of a new technology, in other words, did not eliminate an older art form;
+it forced that art form to discover its own distinctive strengths. A similar pattern may be unfolding
+today as digital tools take over tasks once thought to require human skill. Rather than asking what
+machines will replace, we might ask what they will release us to do.""",
+
+    """Economists have long observed that people value things more highly once they own them.
+In a well-known experiment, participants who were given a coffee mug demanded roughly twice as much
+to sell it as other participants were willing to pay to buy the same mug. This endowment effect
+cannot be explained by the mug's usefulness, since both groups were considering an identical object.
+Instead, ownership seems to change the reference point from which gains and losses are judged.
+Giving up something we possess feels like a loss, and losses loom larger than equivalent gains.
+The effect has practical consequences. Companies offer free trials precisely because customers who
+have started using a product become reluctant to return it. Understanding this bias can help consumers
+pause before accepting offers designed to make them feel that something already belongs to them.""",
+
+    """Forests are often described as collections of individual trees competing for sunlight, water,
+and nutrients. Recent studies, however, reveal a far more cooperative picture. Beneath the soil,
+fungal networks connect the roots of neighboring trees, allowing them to exchange carbon, nitrogen,
+and even chemical warning signals. Older trees, sometimes called mother trees, appear to send
+resources to young seedlings growing in their shade, improving the seedlings' chances of survival.
+When a tree is attacked by insects, its neighbors may increase their production of defensive compounds
+before the insects reach them. These findings challenge the assumption that nature is governed purely
+by competition. They also carry implications for forest management, since removing the largest trees
+may weaken the entire network on which younger trees depend.""",
+
+    """Why do we remember some events vividly while others disappear almost immediately?
+Part of the answer lies in emotion. When an experience triggers strong feelings, the brain releases
+chemicals that strengthen the formation of memories, marking the event as important for future survival.
+This is why people can often recall exactly where they were when they heard surprising news.
+However, vividness does not guarantee accuracy. Studies that tracked people's memories of dramatic
+public events found that their accounts changed considerably over time, even though their confidence
+remained high. Each time a memory is recalled, it is reconstructed and may absorb details from later
+conversations or media reports. Our most confident memories, therefore, deserve the same careful
+questioning that we would apply to any other source of information.""",
+
+    """Cities around the world are rediscovering the value of walking. For much of the twentieth century,
+urban planners designed streets primarily for cars, widening roads and shrinking sidewalks in the name
+of efficiency. The result was faster traffic but less public life. Shops lost customers who could no
+longer stroll past their windows, and neighbors rarely encountered one another by chance. Today many
+cities are reversing this trend by narrowing roads, planting trees, and creating pedestrian zones.
+Surprisingly, such changes often reduce congestion rather than increase it, because drivers adjust
+their routes and some choose other forms of transportation. More importantly, walkable streets encourage
+the casual encounters that build trust within communities, reminding us that a city is not merely a
+system for moving people but a place for them to meet.""",
+
+    """Scientists who study animal behavior must constantly guard against the temptation to interpret
+animals as if they were small humans. When a dog appears guilty after chewing a shoe, owners naturally
+assume that it understands it has done something wrong. Experiments suggest, however, that the
+so-called guilty look is a response to the owner's scolding tone rather than to the dog's awareness
+of its own misbehavior. Dogs displayed the same expression whether or not they had actually chewed
+anything, as long as their owners believed they had. This does not mean that animals lack rich inner
+lives; it means that our intuitions are unreliable guides to what those lives contain. Careful
+observation, not projection, is the only path to understanding minds that differ from our own."""
+]
+
+def gapfill_json_response(passage):
+    """
+    지문에 대한 구조화된(JSON) 갭필 결과 예시 생성 (_structure_gapfill_result 벤치마크용)
+
+    Args:
+        passage (str): 지문
+
+    Returns:
+        dict: Gemini가 반환하는 형식의 갭필 결과
+    """
+    words = [word.strip(".,;:") for word in passage.split() if len(word) > 7][:16]
+    result = {}
+    for index, tier in enumerate(["foundation", "intermediate", "advanced", "expert"]):
+        answers = words[index::4]
+        result[f"{tier}_tier"] = {
+            "text": passage,
+            "blanks": [f"({i + 1})" for i in range(len(answers))],
+            "answers": answers,
+            "hints": [{"grammatical": "품사 힌트", "semantic": "의미 힌트", "direct": answer[0] + "..."} for answer in answers]
+        }
+    result["korean_translation"] = "번역문 " * 40
+    result["answer_key"] = words
+    result["cultural_notes"] = ["문화적 참고사항"] * 3
+    return result
+
+def gapfill_raw_response(passage, repeat=1):
+    """
+    JSON이 아닌 텍스트 형식의 갭필 결과 예시 생성 (정규식 대체 파서 벤치마크용)
+
+    Args:
+        passage (str): 지문
+        repeat (int): 각 섹션 본문을 반복할 횟수 (긴 응답 시뮬레이션)
+
+    Returns:
+        str: 난이도별 Text/Blanks/Answers/Hints 섹션을 포함한 텍스트
+    """
+    data = gapfill_json_response(passage)
+    sections = []
+    for tier in ["Foundation", "Intermediate", "Advanced", "Expert"]:
+        tier_data = data[f"{tier.lower()}_tier"]
+        sections.append(f"{tier} Tier")
+        sections.append("Text: " + "\n".join([tier_data["text"]] * repeat))
+        sections.append("Blanks:\n" + "\n".join(tier_data["blanks"] * repeat))
+        sections.append("Answers:\n" + "\n".join(tier_data["answers"] * repeat))
+        sections.append("Hints:\n" + "\n".join(json.dumps(hint, ensure_ascii=False) for hint in tier_data["hints"] * repeat))
+    sections.append("Korean Translation: " + data["korean_translation"] * repeat)
+    sections.append("Answer Key:\n" + "\n".join(data["answer_key"] * repeat))
+    sections.append("Cultural Notes:\n" + "\n".join(data["cultural_notes"] * repeat))
+    return "\n\n".join(sections)
+
+def sample_html(passage):
+    """
+    optimize_html_output 벤치마크용 HTML 예시
+    """
+    return (
+        "<html><head><title>갭필 문제</title></head><body>"
+        f"<div class=\"container\"><div class=\"gapfill-container\"><p>{passage}</p></div>"
+        "<div class=\"answer-key\"><p>정답</p></div></div></body></html>"
+    )
@@ -0,0 +1,139 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from cache.result_cache import ResultCache
+from monitoring.metrics import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    fingerprint TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    key TEXT NOT NULL DEFAULT '',
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (fingerprint, stage, key)
+);
+CREATE INDEX IF NOT EXISTS checkpoints_expires_at ON checkpoints (expires_at);
+"""
+
+class StageCheckpoints:
+    """
+    갭필 생성 단계별 중간 결과(체크포인트) 저장소
+    분석 → 갭필 → HTML 중 뒤 단계가 실패해도 다시 요청하면 마지막으로 성공한 단계 다음부터 이어서 생성
+    경로가 없으면 프로세스 메모리에, 있으면 sqlite 파일에 저장 (gunicorn 워커 간 공유, 워커 재시작 후에도 유지)
+    """
+
+    def __init__(self, path=None, ttl=15 * 60, max_entries=512):
+        """
+        StageCheckpoints 초기화
+
+        Args:
+            path (str, optional): sqlite 데이터베이스 파일 경로 (없으면 메모리)
+            ttl (float): 체크포인트 유효 시간(초) (재시도까지의 짧은 시간만 보관)
+            max_entries (int): 최대 체크포인트 수 (초과 시 가장 먼저 만료되는 항목 제거)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory = ResultCache(max_entries, ttl) if path is None else None
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        """
+        현재 프로세스의 연결 반환
+        gunicorn이 fork한 워커는 마스터의 연결을 공유하지 않도록 새로 연결
+        """
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def load(self, fingerprint, stage, key=""):
+        """
+        체크포인트 조회
+
+        Args:
+            fingerprint (str): 지문 식별값
+            stage (str): 단계 이름 (analysis, gapfill)
+            key (str): 세부 키 (요청한 난이도 조합 등)
+
+        Returns:
+            object: 저장된 단계 결과 (없거나 만료되었으면 None)
+        """
+        if self._memory is not None:
+            value = self._memory.get((fingerprint, stage, key))
+        else:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT value FROM checkpoints WHERE fingerprint = ? AND stage = ? AND key = ? AND expires_at > ?",
+                    (fingerprint, stage, key, time.time())
+                ).fetchone()
+            value = json.loads(row[0]) if row else None
+        if value is not None:
+            metrics.inc("gapfill_checkpoint_resumed_total", stage=stage)
+        return value
+
+    def save(self, fingerprint, stage, value, key=""):
+        """
+        체크포인트 저장
+
+        Args:
+            fingerprint (str): 지문 식별값
+            stage (str): 단계 이름
+            value (object): 단계 결과 (JSON으로 직렬화 가능한 값)
+            key (str): 세부 키
+        """
+        if self._memory is not None:
+            self._memory.set((fingerprint, stage, key), value)
+            return
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM checkpoints WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "INSERT OR REPLACE INTO checkpoints (fingerprint, stage, key, value, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, stage, key, json.dumps(value, ensure_ascii=False, separators=(",", ":")), now + self.ttl)
+            )
+            connection.execute(
+                "DELETE FROM checkpoints WHERE rowid IN ("
+                "SELECT rowid FROM checkpoints ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            connection.commit()
+
+    def delete(self, fingerprint, stage, key=""):
+        """체크포인트 삭제 (모든 단계가 끝났거나, 잘못된 단계 결과를 다시 사용하지 않도록)"""
+        if self._memory is not None:
+            self._memory.delete((fingerprint, stage, key))
+            return
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "DELETE FROM checkpoints WHERE fingerprint = ? AND stage = ? AND key = ?", (fingerprint, stage, key)
+            )
+            connection.commit()
+
+    def __len__(self):
+        if self._memory is not None:
+            return len(self._memory)
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM checkpoints WHERE expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+
+    def close(self):
+        """연결 종료"""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
@@ -0,0 +1,77 @@
+import queue
+import threading
+import time
+
+from monitoring.metrics import metrics
+
+class RefreshQueue:
+    """
+    만료된 캐시 결과를 백그라운드에서 다시 생성하는 작업 큐
+    같은 키는 한 번만 대기하며, ready()가 참이 될 때(예: 회로 차단기가 닫힐 때)까지 기다린 뒤 실행
+    """
+
+    def __init__(self, refresh, ready=None, max_pending=256, poll_interval=1.0):
+        """
+        RefreshQueue 초기화 (작업 스레드는 처음 작업을 넣을 때 시작)
+
+        Args:
+            refresh (callable): 다시 생성하는 함수 (submit()에 넘긴 인자를 받음)
+            ready (callable, optional): 작업을 실행해도 되는지 반환하는 함수
+            max_pending (int): 최대 대기 작업 수 (초과하면 새 작업을 버림)
+            poll_interval (float): ready()가 거짓일 때 다시 확인하기까지의 간격(초)
+        """
+        self.refresh = refresh
+        self.ready = ready
+        self.max_pending = max_pending
+        self.poll_interval = poll_interval
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, key, *args):
+        """
+        다시 생성할 작업 추가
+
+        Args:
+            key (hashable): 작업 키 (같은 키가 이미 대기 중이면 무시)
+            *args: refresh 함수에 넘길 인자
+
+        Returns:
+            bool: 추가 여부
+        """
+        with self._lock:
+            if key in self._pending or len(self._pending) >= self.max_pending:
+                return False
+            self._pending.add(key)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cache-refresh", daemon=True)
+                self._thread.start()
+        self._queue.put((key, args))
+        metrics.inc("gapfill_cache_refresh_queued_total")
+        return True
+
+    def _run(self):
+        """작업 스레드: 대기 작업을 차례로 실행"""
+        while True:
+            key, args = self._queue.get()
+            while self.ready is not None and not self.ready():
+                time.sleep(self.poll_interval)
+            try:
+                self.refresh(*args)
+                metrics.inc("gapfill_cache_refresh_total", status="success")
+            except Exception as e:
+                print(f"캐시 갱신 오류: {e}")
+                metrics.inc("gapfill_cache_refresh_total", status="error")
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+                self._queue.task_done()
+
+    def join(self):
+        """대기 중인 작업이 모두 끝날 때까지 대기"""
+        self._queue.join()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
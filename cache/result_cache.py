@@ -0,0 +1,130 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# PDF에서 복사한 지문에 섞여 들어오는 소프트 하이픈
+SOFT_HYPHEN = "\u00ad"
+
+def normalize_passage(text):
+    """
+    지문 정규화 (공백 차이와 소프트 하이픈 제거)
+
+    Args:
+        text (str): 수능영어 지문
+
+    Returns:
+        str: 공백을 한 칸으로 합치고 소프트 하이픈을 제거한 지문
+    """
+    return " ".join(text.replace(SOFT_HYPHEN, "").split())
+
+def passage_fingerprint(text):
+    """
+    지문 식별값(fingerprint) 계산
+    공백 차이(줄바꿈, 들여쓰기 등)와 소프트 하이픈은 같은 지문으로 취급
+
+    Args:
+        text (str): 수능영어 지문
+
+    Returns:
+        str: 정규화된 지문의 SHA-256 해시
+    """
+    return hashlib.sha256(normalize_passage(text).encode('utf-8')).hexdigest()
+
+class CacheEntry:
+    """
+    캐시 항목 (값과 만료 시각)
+    """
+    __slots__ = ("value", "created_at", "expires_at")
+
+    def __init__(self, value, created_at, expires_at):
+        self.value = value
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+    def is_expired(self, now=None):
+        """만료 여부"""
+        return (now or time.time()) >= self.expires_at
+
+class ResultCache:
+    """
+    생성 결과 캐시
+    TTL 만료와 최대 항목 수(LRU 제거)를 지원하는 스레드 안전 메모리 캐시
+    """
+
+    def __init__(self, max_entries=1024, ttl=24 * 60 * 60):
+        """
+        ResultCache 초기화
+
+        Args:
+            max_entries (int): 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+            ttl (float): 기본 유효 시간(초)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key):
+        """
+        유효한 캐시 값 조회
+
+        Args:
+            key (hashable): 캐시 키
+
+        Returns:
+            object: 캐시 값 (없거나 만료되었으면 None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.is_expired():
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry.value
+
+    def get_entry(self, key):
+        """
+        만료 여부와 관계없이 캐시 항목 조회
+
+        Args:
+            key (hashable): 캐시 키
+
+        Returns:
+            CacheEntry: 캐시 항목 (없으면 None)
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key, value, ttl=None):
+        """
+        캐시 값 저장
+
+        Args:
+            key (hashable): 캐시 키
+            value (object): 저장할 값
+            ttl (float, optional): 유효 시간(초). 없으면 기본값 사용
+        """
+        now = time.time()
+        entry = CacheEntry(value, now, now + (self.ttl if ttl is None else ttl))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """캐시 항목 삭제"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """전체 캐시 삭제"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,214 @@
+import random
+import re
+
+from api.gemini_client import GAPFILL_TIERS
+from generator.models import Blank, Passage, Tier
+
+# 영어 단어 토큰 (축약형/하이픈 포함)
+WORD_PATTERN = re.compile(r"[A-Za-z]+(?:['’\-\u00ad][A-Za-z]+)*")
+
+# 수능 지문 PDF에서 복사할 때 섞여 들어오는 소프트 하이픈
+SOFT_HYPHEN = "\u00ad"
+
+# 난이도별 단어가 부족할 때 보충할 언어적 범주
+TIER_CATEGORIES = {
+    "foundation": ["lexical_semantic"],
+    "intermediate": ["grammatical_syntactic"],
+    "advanced": ["discourse_pragmatic"],
+    "expert": ["conceptual_cognitive", "cultural_translational"]
+}
+
+# 난이도별 기본 빈칸 수
+DEFAULT_BLANKS_PER_TIER = {
+    "foundation": 5,
+    "intermediate": 6,
+    "advanced": 7,
+    "expert": 8
+}
+
+# 분석 결과의 단어 정보에서 단어/구문을 찾을 키
+WORD_KEYS = ("word", "phrase", "term", "expression", "text", "단어", "구문", "단어/구문")
+
+# 분석 결과의 단어 정보에서 힌트로 사용할 키
+HINT_KEYS = ("educational_importance", "importance", "hint", "subtype", "type", "교육적 중요성", "세부 유형")
+
+def tokenize(text):
+    """
+    지문을 단어 토큰과 문자 위치로 분리
+
+    Args:
+        text (str): 지문
+
+    Returns:
+        list: (시작 위치, 끝 위치, 토큰) 튜플 목록
+    """
+    return [(match.start(), match.end(), match.group(0)) for match in WORD_PATTERN.finditer(text)]
+
+def _word_of(word_info):
+    """
+    분석 결과의 단어 정보에서 단어/구문 추출
+    """
+    if isinstance(word_info, str):
+        return word_info.strip()
+    if isinstance(word_info, dict):
+        for key in WORD_KEYS:
+            value = word_info.get(key)
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+    return ""
+
+def _hint_of(word_info):
+    """
+    분석 결과의 단어 정보에서 힌트 추출
+    """
+    if isinstance(word_info, dict):
+        for key in HINT_KEYS:
+            value = word_info.get(key)
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+    return ""
+
+class GapPlan:
+    """
+    지문 하나에 대한 빈칸 후보 목록
+    분석 결과에서 한 번 계산해 두면 변형 문제를 반복 생성할 때 재사용
+    """
+    __slots__ = ("text", "candidates")
+
+    def __init__(self, text, candidates):
+        """
+        Args:
+            text (str): 원본 지문
+            candidates (dict): 난이도별 후보 목록 [(단어, 힌트, [(시작, 끝), ...]), ...]
+        """
+        self.text = text
+        self.candidates = candidates
+
+class GapPlacementEngine:
+    """
+    로컬 빈칸 배치 엔진
+    분석 결과(단어 분류, 난이도별 단어)와 지문의 토큰 위치를 바탕으로
+    API 호출 없이 시드별로 결정적인 갭필 변형 문제를 생성
+    """
+
+    def __init__(self, blanks_per_tier=None, blank_marker="______"):
+        """
+        GapPlacementEngine 초기화
+
+        Args:
+            blanks_per_tier (dict, optional): 난이도별 빈칸 수
+            blank_marker (str): 빈칸 표시 문자열
+        """
+        self.blanks_per_tier = dict(DEFAULT_BLANKS_PER_TIER)
+        if blanks_per_tier:
+            self.blanks_per_tier.update(blanks_per_tier)
+        self.blank_marker = blank_marker
+
+    def prepare(self, text, difficulty_levels, categorized_words=None):
+        """
+        지문과 분석 결과로 빈칸 후보 목록 계산
+
+        Args:
+            text (str): 원본 지문
+            difficulty_levels (dict): TextAnalyzer.get_difficulty_levels() 결과
+            categorized_words (dict, optional): TextAnalyzer.categorize_words() 결과
+
+        Returns:
+            GapPlan: 난이도별 빈칸 후보 목록
+        """
+        # 소문자 토큰 → 위치 색인
+        tokens = tokenize(text)
+        positions = {}
+        for index, (_, _, token) in enumerate(tokens):
+            positions.setdefault(token.lower().replace(SOFT_HYPHEN, ""), []).append(index)
+
+        candidates = {}
+        for tier in GAPFILL_TIERS:
+            word_infos = list(difficulty_levels.get(tier, []))
+            if categorized_words and len(word_infos) < self.blanks_per_tier[tier]:
+                for category in TIER_CATEGORIES[tier]:
+                    word_infos.extend(categorized_words.get(category, []))
+
+            seen = set()
+            tier_candidates = []
+            for word_info in word_infos:
+                word = _word_of(word_info)
+                words = tuple(token.lower().replace(SOFT_HYPHEN, "") for _, _, token in tokenize(word))
+                if not words or words in seen:
+                    continue
+                seen.add(words)
+
+                spans = self._find_spans(tokens, positions, words)
+                if spans:
+                    tier_candidates.append((word, _hint_of(word_info), spans))
+            candidates[tier] = tier_candidates
+
+        return GapPlan(text, candidates)
+
+    def _find_spans(self, tokens, positions, words):
+        """
+        단어(또는 여러 단어로 된 구문)가 지문에 나타나는 문자 위치 목록
+        """
+        spans = []
+        for index in positions.get(words[0], []):
+            end_index = index + len(words) - 1
+            if end_index >= len(tokens):
+                continue
+            if all(tokens[index + offset][2].lower().replace(SOFT_HYPHEN, "") == word for offset, word in enumerate(words)):
+                spans.append((tokens[index][0], tokens[end_index][1]))
+        return spans
+
+    def generate_variant(self, plan, seed=0, tiers=None):
+        """
+        시드로 결정되는 갭필 변형 문제 생성
+
+        Args:
+            plan (GapPlan): prepare()가 반환한 빈칸 후보 목록
+            seed (int | str): 변형 시드 (같은 시드는 항상 같은 결과)
+            tiers (list, optional): 생성할 난이도 목록 (없으면 네 가지 모두)
+
+        Returns:
+            Passage: _structure_gapfill_result()와 같은 형식의 갭필 결과
+        """
+        result = Passage(seed=seed)
+
+        for tier in tiers or GAPFILL_TIERS:
+            rng = random.Random(f"{seed}:{tier}")
+            result.tiers[tier] = self._build_tier(plan, plan.candidates.get(tier, []), rng, self.blanks_per_tier[tier])
+
+        return result
+
+    def _build_tier(self, plan, candidates, rng, blank_count):
+        """
+        난이도 하나의 빈칸 지문, 정답, 힌트, 섞인 선택지 생성
+        """
+        # 후보 단어 선택 후 단어별 위치 하나 선택 (겹치는 위치 제외)
+        chosen = []
+        occupied = []
+        for word, hint, spans in rng.sample(candidates, len(candidates)):
+            if len(chosen) >= blank_count:
+                break
+            start, end = spans[rng.randrange(len(spans))]
+            if any(start < o_end and o_start < end for o_start, o_end in occupied):
+                continue
+            occupied.append((start, end))
+            chosen.append((start, end, hint))
+        chosen.sort()
+
+        # 빈칸 지문 조립
+        pieces = []
+        blanks = []
+        cursor = 0
+        for number, (start, end, hint) in enumerate(chosen, start=1):
+            label = f"({number})"
+            pieces.append(plan.text[cursor:start])
+            pieces.append(f"{label} {self.blank_marker}")
+            blanks.append(Blank(label, plan.text[start:end].replace(SOFT_HYPHEN, ""), hint))
+            cursor = end
+        pieces.append(plan.text[cursor:])
+
+        # 선택지는 정답 인덱스 순열로 섞음
+        order = list(range(len(blanks)))
+        rng.shuffle(order)
+
+        return Tier.from_blanks("".join(pieces).strip(), blanks, order)
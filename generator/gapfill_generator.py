@@ -1,14 +1,241 @@
-import sys
-import os
+import contextvars
+import html
 import json
 import random
-import re
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from api.gemini_client import GeminiClient
+from api.circuit_breaker import CircuitOpenError
+from api.gemini_client import GeminiClient, GAPFILL_TIERS, parse_json_text, response_text
 from analysis.text_analyzer import TextAnalyzer
+from cache.checkpoint import StageCheckpoints
+from cache.refresh_queue import RefreshQueue
+from cache.result_cache import ResultCache, passage_fingerprint
+from generator.gap_engine import GapPlacementEngine
+from generator.models import Hint, Passage, Tier, as_list
+from generator.section_parser import parse_sections
+from monitoring.metrics import metrics
+
+# 지문 단위로 공유되는 부가 정보 (난이도와 무관)
+EXTRA_FIELDS = ("korean_translation", "answer_key", "cultural_notes")
+
+# 시드를 지정하지 않은 요청의 변형 시드 (같은 지문은 항상 같은 선택지 순서)
+DEFAULT_SEED = 0
+
+def seeded_rng(*parts):
+    """
+    시드 구성 요소로 난수 생성기 생성
+    문자열 시드는 해시 무작위화와 무관하므로 같은 구성 요소는 프로세스와 관계없이 항상 같은 순서를 만듦
+    
+    Args:
+        *parts: 시드 구성 요소 (지문 식별값, 시드, 난이도 등)
+        
+    Returns:
+        random.Random: 난수 생성기
+    """
+    return random.Random(":".join(str(part) for part in parts))
+
+def normalize_tiers(tiers=None):
+    """
+    요청한 난이도 목록 검증 및 정렬
+    
+    Args:
+        tiers (list, optional): 난이도 이름 목록 (없으면 네 가지 모두)
+        
+    Returns:
+        tuple: 기본 순서(foundation → expert)로 정렬된 난이도 목록
+        
+    Raises:
+        ValueError: 알 수 없는 난이도가 포함된 경우
+    """
+    if not tiers:
+        return tuple(GAPFILL_TIERS)
+    
+    requested = {tier.strip().lower() for tier in tiers if tier and tier.strip()}
+    unknown = requested - set(GAPFILL_TIERS)
+    if unknown:
+        raise ValueError(f"알 수 없는 난이도입니다: {', '.join(sorted(unknown))} (사용 가능: {', '.join(GAPFILL_TIERS)})")
+    
+    return tuple(tier for tier in GAPFILL_TIERS if tier in requested) or tuple(GAPFILL_TIERS)
+
+def parse_gapfill_text(text_content):
+    """
+    Gemini 응답 텍스트에서 갭필 결과 추출
+    
+    Args:
+        text_content (str): 응답 텍스트 (없으면 None)
+        
+    Returns:
+        dict: JSON으로 파싱한 결과, 파싱 실패 시 {"raw_result": 응답 텍스트}, 응답이 없으면 빈 dict
+    """
+    if text_content is None:
+        return {}
+    try:
+        return parse_json_text(text_content)
+    except json.JSONDecodeError:
+        # JSON 파싱 실패 시 텍스트 그대로 반환
+        return {"raw_result": text_content}
+
+def structure_gapfill_text(text_content, tiers=None):
+    """
+    Gemini 응답 텍스트를 파싱하여 구조화 (작업 프로세스에는 응답 텍스트만 전달)
+    
+    Args:
+        text_content (str): 응답 텍스트 (없으면 None)
+        tiers (list, optional): 결과에 포함할 난이도 목록
+        
+    Returns:
+        Passage: 구조화된 갭필 결과
+    """
+    return structure_gapfill_result(parse_gapfill_text(text_content), tiers)
+
+def structure_gapfill_result(gapfill_result, tiers=None):
+    """
+    갭필 결과 구조화 (인스턴스 상태를 쓰지 않으므로 작업 프로세스에서도 실행 가능)
+    
+    Args:
+        gapfill_result (dict): Gemini API로부터 받은 갭필 결과
+        tiers (list, optional): 결과에 포함할 난이도 목록 (없으면 네 가지 모두)
+        
+    Returns:
+        Passage: 구조화된 갭필 결과 (기존 dict 형식으로도 접근 가능)
+    """
+    tiers = tiers or list(GAPFILL_TIERS)
+    
+    # 기본 구조 정의
+    structured_result = Passage({tier: Tier() for tier in tiers})
+    
+    # 갭필 결과가 있는 경우
+    if gapfill_result:
+        # 원시 결과만 있는 경우
+        if "raw_result" in gapfill_result:
+            # 제목을 한 번만 토큰화하여 섹션별로 잘라냄
+            sections = parse_sections(gapfill_result["raw_result"], structured_result.tiers)
+    
+            for tier, fields in sections["tiers"].items():
+                tier_result = structured_result.tiers[tier]
+                if "text" in fields:
+                    tier_result.text = fields["text"]
+                if "blanks" in fields:
+                    tier_result.blanks = fields["blanks"]
+                if "answers" in fields:
+                    tier_result.answers = fields["answers"]
+                if "hints" in fields:
+                    tier_result.hints = [Hint(text=hint) for hint in fields["hints"]]
+    
+            # 한국어 번역, 정답 키, 문화적 참고사항
+            for field in EXTRA_FIELDS:
+                if field in sections:
+                    setattr(structured_result, field, sections[field])
+    
+        # 구조화된 결과가 있는 경우
+        else:
+            # 난이도별 데이터 매핑
+            tier_mapping = {
+                "foundation": ["foundation", "basic", "beginner"],
+                "intermediate": ["intermediate", "medium"],
+                "advanced": ["advanced", "high"],
+                "expert": ["expert", "very high", "master"]
+            }
+    
+            # 각 난이도별 데이터 추출
+            for result_tier, result_data in gapfill_result.items():
+                # 난이도 매핑
+                mapped_tier = None
+                for tier, aliases in tier_mapping.items():
+                    if any(alias in result_tier.lower() for alias in aliases):
+                        mapped_tier = tier
+                        break
+    
+                if mapped_tier in structured_result.tiers and isinstance(result_data, dict):
+                    tier = structured_result.tiers[mapped_tier]
+    
+                    # 텍스트 추출
+                    if "text" in result_data:
+                        tier.text = result_data["text"] or ""
+    
+                    # 빈칸 추출
+                    if "blanks" in result_data:
+                        tier.blanks = as_list(result_data["blanks"])
+    
+                    # 정답 추출
+                    if "answers" in result_data:
+                        tier.answers = as_list(result_data["answers"])
+    
+                    # 힌트 추출
+                    if "hints" in result_data:
+                        tier.hints = [Hint.from_value(hint) for hint in as_list(result_data["hints"])]
+    
+            # 한국어 번역 추출
+            if "korean_translation" in gapfill_result:
+                structured_result.korean_translation = gapfill_result["korean_translation"] or ""
+    
+            # 정답 키 추출
+            if "answer_key" in gapfill_result:
+                structured_result.answer_key = as_list(gapfill_result["answer_key"])
+    
+            # 문화적 참고사항 추출
+            if "cultural_notes" in gapfill_result:
+                structured_result.cultural_notes = as_list(gapfill_result["cultural_notes"])
+    
+    # 정답 섞기 (정답 목록은 복사하지 않고 인덱스 순열만 저장, 같은 응답은 항상 같은 순서)
+    for name, tier in structured_result.tiers.items():
+        tier.shuffle(seeded_rng(DEFAULT_SEED, name))
+    
+    return structured_result
+
+def merge_tier_texts(tier_texts):
+    """
+    난이도별로 따로 받은 응답 텍스트를 한 번에 생성한 응답과 같은 형식의 JSON 텍스트로 병합
+    
+    Args:
+        tier_texts (dict): 난이도 → 응답 텍스트 (응답이 없으면 None)
+        
+    Returns:
+        str: 난이도 키와 지문 단위 부가 정보를 담은 JSON 텍스트 (모든 응답이 없으면 None)
+    """
+    if all(text_content is None for text_content in tier_texts.values()):
+        return None
+    
+    merged = {"answer_key": []}
+    for tier, text_content in tier_texts.items():
+        # 난이도별 응답은 JSON이 아니어도 기존 구조화 규칙으로 해당 난이도만 추출
+        passage = structure_gapfill_text(text_content, [tier])
+        merged[tier] = passage.tiers[tier].to_dict()
+        # 정답 키는 난이도별 응답을 이어 붙이고, 번역/문화적 참고사항은 처음 받은 값 사용
+        merged["answer_key"].extend(passage.answer_key)
+        if passage.korean_translation and not merged.get("korean_translation"):
+            merged["korean_translation"] = passage.korean_translation
+        if passage.cultural_notes and not merged.get("cultural_notes"):
+            merged["cultural_notes"] = list(passage.cultural_notes)
+    return json.dumps(merged, ensure_ascii=False, separators=(",", ":"))
+
+def render_basic_html(text, passage):
+    """
+    Gemini API 없이 갭필 결과로 간단한 HTML 생성 (회로가 열려 있어 HTML을 생성할 수 없을 때 사용)
+    
+    Args:
+        text (str): 원본 수능영어 지문
+        passage (Passage): 갭필 결과
+        
+    Returns:
+        str: HTML 문서
+    """
+    sections = []
+    for name, tier in passage.tiers.items():
+        label = GAPFILL_TIERS.get(name, name).split(":")[0]
+        choices = " / ".join(html.escape(str(answer)) for answer in tier.shuffled_answers)
+        sections.append(
+            f"<section><h2>{html.escape(label)}</h2><p>{html.escape(tier.text)}</p>"
+            f"<p><strong>보기:</strong> {choices}</p></section>"
+        )
+    translation = f"<section><h2>한국어 번역</h2><p>{html.escape(passage.korean_translation)}</p></section>" if passage.korean_translation else ""
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>갭필 문제</title></head><body>'
+        f"<h1>갭필 문제</h1><section><h2>원본 지문</h2><p>{html.escape(text.strip())}</p></section>"
+        f"{''.join(sections)}{translation}</body></html>"
+    )
 
 class GapfillGenerator:
     """
@@ -16,38 +243,170 @@ class GapfillGenerator:
     분석된 텍스트를 바탕으로 다양한 난이도의 갭필 문제 생성
     """
     
-    def __init__(self, gemini_client=None, text_analyzer=None):
+    def __init__(self, gemini_client=None, text_analyzer=None, result_cache=None, gap_engine=None, corpus_store=None, similarity_index=None, worker_pool=None, circuit_breaker=None, checkpoints=None, parallel_tiers=False, tier_workers=None):
         """
         GapfillGenerator 초기화
         
         Args:
             gemini_client (GeminiClient, optional): Gemini API 클라이언트 인스턴스
             text_analyzer (TextAnalyzer, optional): 텍스트 분석기 인스턴스
+            result_cache (ResultCache, optional): 분석/난이도별 결과 캐시. 없으면 메모리 캐시 생성
+            gap_engine (GapPlacementEngine, optional): 로컬 빈칸 배치 엔진
+            corpus_store (CorpusStore, optional): 미리 계산된 지문 코퍼스 (메모리 캐시에 없을 때 API 호출 전에 조회)
+            similarity_index (SimilarityIndex, optional): 이전에 분석한 지문의 유사 지문 색인 (분석 결과 재사용)
+            worker_pool (PostProcessPool, optional): 응답 파싱/구조화를 실행할 프로세스 풀 (없으면 현재 스레드에서 실행)
+            circuit_breaker (CircuitBreaker, optional): Gemini API 회로 차단기 (열려 있는 동안 이전 결과 제공)
+            checkpoints (StageCheckpoints, optional): 단계별 중간 결과 저장소 (실패한 요청을 다시 보내면 이어서 생성). 없으면 메모리 저장소 생성
+            parallel_tiers (bool): 여러 난이도를 난이도별 요청으로 나누어 동시에 생성할지 여부 (응답 시간이 가장 느린 난이도 하나에 가까워짐)
+            tier_workers (int, optional): 난이도별 요청에 사용할 스레드 수 (프로세스 전체 공유, 동시에 생성하는 지문 수 × 난이도 수 권장).
+                없으면 지문 4개 분량 (4 × 난이도 수)
         """
         self.gemini_client = gemini_client or GeminiClient()
         self.text_analyzer = text_analyzer or TextAnalyzer(self.gemini_client)
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+        self.gap_engine = gap_engine or GapPlacementEngine()
+        self.corpus_store = corpus_store
+        self.similarity_index = similarity_index
+        self.worker_pool = worker_pool
+        self.checkpoints = checkpoints if checkpoints is not None else StageCheckpoints()
+        self.parallel_tiers = parallel_tiers
+        self.tier_workers = max(1, tier_workers) if tier_workers else 4 * len(GAPFILL_TIERS)
+        self._tier_executor = None
+        self._tier_executor_lock = threading.Lock()
+        
+        # 회로가 열려 있는 동안 이전 결과를 제공한 지문은 회로가 닫힌 뒤 백그라운드에서 다시 생성
+        self.circuit_breaker = circuit_breaker
+        self.refresh_queue = None
+        if self.circuit_breaker is not None:
+            self.refresh_queue = RefreshQueue(self._generate, ready=lambda: not self.circuit_breaker.is_open())
     
-    def generate(self, text):
+    def generate(self, text, tiers=None, seed=None, as_model=False):
         """
         갭필 문제 생성
+        요청한 난이도만 생성하며, 이미 캐시된 난이도는 다시 생성하지 않음
+        선택지 순서는 지문과 시드로 결정되므로 같은 요청은 항상 같은 결과(바이트 단위)를 반환
         
         Args:
             text (str): 원본 수능영어 지문
+            tiers (list, optional): 생성할 난이도 목록 (없으면 네 가지 모두)
+            seed (int | str, optional): 변형 시드 (없으면 DEFAULT_SEED, 다른 시드는 선택지 순서가 다른 변형)
+            as_model (bool): True면 gapfill을 읽기 전용 Passage 객체로 반환 (기본값: 기존 형식의 dict)
             
         Returns:
-            dict: 생성된 갭필 문제
+            dict: 생성된 갭필 문제 (회로가 열려 있어 만료된 이전 결과를 제공한 경우 stale이 True)
+            
+        Raises:
+            CircuitOpenError: 회로가 열려 있고 이 지문의 이전 결과도 없는 경우
         """
-        # 텍스트 분석
-        analysis_result = self.text_analyzer.analyze(text)
+        return self._as_result(self._generate(text, tiers, seed), as_model)
+    
+    def _as_result(self, result, as_model):
+        """
+        반환할 결과 형식으로 변환 (결과 캐시는 Tier 객체로 보관하고, 호출자에게는 기본적으로 dict 반환)
         
-        # Gemini API를 통한 갭필 문제 생성
-        gapfill_result = self._generate_gapfill_with_gemini(text, analysis_result)
+        Args:
+            result (dict): gapfill이 Passage인 생성 결과
+            as_model (bool): Passage 그대로 반환할지 여부
+            
+        Returns:
+            dict: 생성 결과
+        """
+        if not as_model:
+            result["gapfill"] = result["gapfill"].to_dict()
+        return result
+    
+    def _generate(self, text, tiers=None, seed=None):
+        """
+        갭필 문제 생성 (generate() 참고, gapfill은 Passage)
+        """
+        tiers = normalize_tiers(tiers)
+        seed = DEFAULT_SEED if seed is None else seed
+        fingerprint = passage_fingerprint(text)
+        
+        # Gemini API 장애 중에는 API를 기다리지 않고 마지막으로 성공한 결과 제공
+        if self._circuit_refusing():
+            return self._generate_while_open(text, fingerprint, tiers, seed)
+        
+        # 텍스트 분석 (지문 단위 캐시)
+        analysis_result = self._get_analysis(text, fingerprint)
+        # 생성 도중 회로가 요청을 거절하기 시작했으면(half-open 시험 요청 소진 등) 빈 결과 대신 이전 결과 제공
+        if not analysis_result.get("linguistic_analysis") and self._circuit_refusing():
+            return self._generate_while_open(text, fingerprint, tiers, seed)
         
-        # 결과 처리 및 구조화
-        structured_result = self._structure_gapfill_result(gapfill_result)
+        # 캐시(또는 코퍼스)에 있는 난이도 확인
+        tier_results = {}
+        for tier in tiers:
+            cached_tier = self._cached((fingerprint, "tier", tier), lambda tier=tier: self.corpus_store.get_tier(fingerprint, tier))
+            if cached_tier is not None:
+                tier_results[tier] = cached_tier
+        extras = self._cached((fingerprint, "extras"), lambda: self.corpus_store.get_extras(fingerprint))
+        
+        # 없는 난이도만 Gemini API를 통해 생성
+        missing_tiers = [tier for tier in tiers if tier not in tier_results]
+        gapfill_key = ",".join(missing_tiers)
+        if missing_tiers:
+            # 이전 요청에서 갭필 응답까지 받았으면 다시 요청하지 않음
+            text_content = self.checkpoints.load(fingerprint, "gapfill", gapfill_key)
+            if text_content is None:
+                with metrics.span("generator.gapfill"):
+                    text_content = self._request_gapfill(text, analysis_result, missing_tiers)
+                if text_content is not None:
+                    self.checkpoints.save(fingerprint, "gapfill", text_content, gapfill_key)
+            with metrics.span("generator.structure"):
+                if self.worker_pool is not None:
+                    generated = self.worker_pool.structure(text_content, missing_tiers)
+                else:
+                    generated = structure_gapfill_text(text_content, missing_tiers)
+            
+            # 문제를 하나도 얻지 못한 응답은 다시 사용하지 않음
+            if not any(generated["tiers"][tier]["text"] or generated["tiers"][tier]["answers"] for tier in missing_tiers):
+                self.checkpoints.delete(fingerprint, "gapfill", gapfill_key)
+            
+            for tier in missing_tiers:
+                tier_data = generated["tiers"][tier]
+                tier_results[tier] = tier_data
+                # 비어 있는 결과(생성 실패)는 캐시하지 않음
+                if tier_data["text"] or tier_data["answers"]:
+                    self.result_cache.set((fingerprint, "tier", tier), tier_data)
+            
+            if extras is None:
+                extras = {field: generated[field] for field in EXTRA_FIELDS}
+                if any(extras.values()):
+                    self.result_cache.set((fingerprint, "extras"), extras)
+            
+            # 회로가 거절하여 얻지 못한 난이도가 있으면 이전 결과 제공 (이번에 생성한 난이도는 캐시에 저장됨)
+            if self._circuit_refusing() and any(
+                not (tier_results[tier]["text"] or tier_results[tier]["answers"]) for tier in missing_tiers
+            ):
+                return self._generate_while_open(text, fingerprint, tiers, seed)
+        
+        # 결과 구조화 (요청한 난이도 순서 유지, 선택지 순서는 시드로 결정)
+        structured_result = self._arrange(fingerprint, tier_results, tiers, extras, seed)
+        
+        # HTML 출력 생성 (난이도 조합과 시드별 캐시, 코퍼스에는 기본 시드 결과만 있음)
+        html_key = self._html_key(fingerprint, tiers, seed)
+        html_output = None
+        if not missing_tiers:
+            html_output = self._cached(html_key, lambda: self.corpus_store.get_html(fingerprint, tiers) if seed == DEFAULT_SEED else None)
+        if html_output is None:
+            with metrics.span("generator.html"):
+                html_output = self._generate_html_output(text, structured_result)
+            if html_output:
+                self.result_cache.set(html_key, html_output)
+            elif self._circuit_refusing():
+                # 회로가 거절하여 HTML을 생성하지 못했으면 로컬에서 만든 HTML 사용 (캐시하지 않음)
+                return {
+                    "original_text": text,
+                    "analysis": analysis_result,
+                    "gapfill": structured_result,
+                    "html": render_basic_html(text, structured_result)
+                }
         
-        # HTML 출력 생성
-        html_output = self._generate_html_output(text, structured_result)
+        # 모든 단계가 끝났으면 체크포인트 정리 (이후에는 결과 캐시 사용)
+        if html_output:
+            self.checkpoints.delete(fingerprint, "analysis")
+            if missing_tiers:
+                self.checkpoints.delete(fingerprint, "gapfill", gapfill_key)
         
         return {
             "original_text": text,
@@ -56,211 +415,299 @@ class GapfillGenerator:
             "html": html_output
         }
     
-    def _generate_gapfill_with_gemini(self, text, analysis_result):
+    def generate_variant(self, text, seed=0, tiers=None, as_model=False):
         """
-        Gemini API를 통한 갭필 문제 생성
+        로컬 빈칸 배치 엔진으로 갭필 변형 문제 생성
+        지문 분석은 한 번만 수행(캐시)하고, 이후 변형은 API 호출 없이 시드로 결정
         
         Args:
             text (str): 원본 수능영어 지문
-            analysis_result (dict): 텍스트 분석 결과
+            seed (int | str): 변형 시드 (같은 시드는 항상 같은 문제)
+            tiers (list, optional): 생성할 난이도 목록 (없으면 네 가지 모두)
+            as_model (bool): True면 gapfill을 읽기 전용 Passage 객체로 반환 (기본값: 기존 형식의 dict)
             
         Returns:
-            dict: 생성된 갭필 문제
-        """
-        # 분석 결과를 JSON 문자열로 변환
-        analysis_json = json.dumps(analysis_result, ensure_ascii=False, indent=2)
-        
-        # Gemini API를 통한 갭필 문제 생성
-        response = self.gemini_client.generate_gapfill(text, analysis_json)
-        
-        # 응답 처리
-        if response and 'candidates' in response:
-            for part in response['candidates'][0]['content']['parts']:
-                if 'text' in part:
-                    # JSON 형식 데이터 추출
-                    text_content = part['text']
-                    try:
-                        # JSON 형식 문자열 찾기
-                        json_match = re.search(r'```json\s*([\s\S]*?)\s*```', text_content)
-                        if json_match:
-                            json_str = json_match.group(1)
-                            return json.loads(json_str)
-                        
-                        # 중괄호로 둘러싸인 JSON 찾기
-                        json_match = re.search(r'({[\s\S]*})', text_content)
-                        if json_match:
-                            json_str = json_match.group(1)
-                            return json.loads(json_str)
-                        
-                        # 전체 텍스트가 JSON인지 확인
-                        return json.loads(text_content)
-                    except json.JSONDecodeError:
-                        # JSON 파싱 실패 시 텍스트 그대로 반환
-                        return {"raw_result": text_content}
-        
-        # 응답이 없거나 처리 실패 시 빈 결과 반환
-        return {}
+            dict: 생성된 갭필 문제 (html은 생성하지 않음)
+        """
+        tiers = normalize_tiers(tiers)
+        fingerprint = passage_fingerprint(text)
+        analysis_result = self._get_analysis(text, fingerprint)
+        
+        # 빈칸 후보 목록은 지문별로 한 번만 계산
+        plan = self.result_cache.get((fingerprint, "gap_plan"))
+        if plan is None:
+            with metrics.span("generator.gap_plan"):
+                plan = self.gap_engine.prepare(
+                    text,
+                    self.text_analyzer.get_difficulty_levels(analysis_result),
+                    self.text_analyzer.categorize_words(analysis_result)
+                )
+            if analysis_result.get("linguistic_analysis"):
+                self.result_cache.set((fingerprint, "gap_plan"), plan)
+        
+        with metrics.span("generator.variant"):
+            gapfill = self.gap_engine.generate_variant(plan, seed, tiers)
+        
+        return self._as_result({
+            "original_text": text,
+            "analysis": analysis_result,
+            "gapfill": gapfill,
+            "html": None
+        }, as_model)
     
-    def _structure_gapfill_result(self, gapfill_result):
+    def _arrange(self, fingerprint, tier_results, tiers, extras, seed):
         """
-        갭필 결과 구조화
+        응답할 갭필 결과 조립 (캐시된 난이도 결과는 그대로 두고 선택지 순서만 시드로 다시 섞음)
         
         Args:
-            gapfill_result (dict): Gemini API로부터 받은 갭필 결과
+            fingerprint (str): 지문 식별값
+            tier_results (dict): 난이도 → 결과 (Tier 또는 dict)
+            tiers (tuple): 요청한 난이도 목록 (결과 순서)
+            extras (dict): 지문 단위 부가 정보 (없으면 None)
+            seed (int | str): 변형 시드
             
         Returns:
-            dict: 구조화된 갭필 결과
-        """
-        # 기본 구조 정의
-        structured_result = {
-            "tiers": {
-                "foundation": {
-                    "text": "",
-                    "blanks": [],
-                    "answers": [],
-                    "hints": []
-                },
-                "intermediate": {
-                    "text": "",
-                    "blanks": [],
-                    "answers": [],
-                    "hints": []
-                },
-                "advanced": {
-                    "text": "",
-                    "blanks": [],
-                    "answers": [],
-                    "hints": []
-                },
-                "expert": {
-                    "text": "",
-                    "blanks": [],
-                    "answers": [],
-                    "hints": []
-                }
-            },
-            "korean_translation": "",
-            "answer_key": [],
-            "cultural_notes": []
+            Passage: 갭필 결과 (seed 포함)
+        """
+        arranged = {
+            tier: Tier.from_dict(tier_results[tier]).reshuffled(seeded_rng(fingerprint, seed, tier))
+            for tier in tiers
         }
+        return Passage(arranged, **(extras or {}), seed=seed)
+    
+    def _html_key(self, fingerprint, tiers, seed):
+        """HTML 캐시 키 (기본 시드는 기존 키를 그대로 사용)"""
+        if seed == DEFAULT_SEED:
+            return (fingerprint, "html", tiers)
+        return (fingerprint, "html", tiers, seed)
+    
+    def _generate_while_open(self, text, fingerprint, tiers, seed=DEFAULT_SEED):
+        """
+        회로가 열려 있을 때 캐시(만료된 항목 포함)와 코퍼스의 이전 결과로 응답
+        만료된 결과를 사용한 경우 백그라운드 갱신 예약
         
-        # 갭필 결과가 있는 경우
-        if gapfill_result:
-            # 원시 결과만 있는 경우
-            if "raw_result" in gapfill_result:
-                # 텍스트 파싱 시도
-                raw_result = gapfill_result["raw_result"]
-                
-                # 난이도별 섹션 찾기
-                tier_patterns = {
-                    "foundation": r"Foundation Tier.*?(?=Intermediate Tier|$)",
-                    "intermediate": r"Intermediate Tier.*?(?=Advanced Tier|$)",
-                    "advanced": r"Advanced Tier.*?(?=Expert Tier|$)",
-                    "expert": r"Expert Tier.*?(?=$)"
-                }
-                
-                for tier, pattern in tier_patterns.items():
-                    tier_match = re.search(pattern, raw_result, re.DOTALL)
-                    if tier_match:
-                        tier_content = tier_match.group(0)
-                        
-                        # 텍스트 추출
-                        text_match = re.search(r"Text:.*?(?=Blanks:|$)", tier_content, re.DOTALL)
-                        if text_match:
-                            structured_result["tiers"][tier]["text"] = text_match.group(0).replace("Text:", "").strip()
-                        
-                        # 빈칸 추출
-                        blanks_match = re.search(r"Blanks:.*?(?=Answers:|$)", tier_content, re.DOTALL)
-                        if blanks_match:
-                            blanks_text = blanks_match.group(0).replace("Blanks:", "").strip()
-                            structured_result["tiers"][tier]["blanks"] = [b.strip() for b in blanks_text.split("\n") if b.strip()]
-                        
-                        # 정답 추출
-                        answers_match = re.search(r"Answers:.*?(?=Hints:|$)", tier_content, re.DOTALL)
-                        if answers_match:
-                            answers_text = answers_match.group(0).replace("Answers:", "").strip()
-                            structured_result["tiers"][tier]["answers"] = [a.strip() for a in answers_text.split("\n") if a.strip()]
-                        
-                        # 힌트 추출
-                        hints_match = re.search(r"Hints:.*?(?=$)", tier_content, re.DOTALL)
-                        if hints_match:
-                            hints_text = hints_match.group(0).replace("Hints:", "").strip()
-                            structured_result["tiers"][tier]["hints"] = [h.strip() for h in hints_text.split("\n") if h.strip()]
-                
-                # 한국어 번역 추출
-                korean_match = re.search(r"Korean Translation:.*?(?=Answer Key:|$)", raw_result, re.DOTALL)
-                if korean_match:
-                    structured_result["korean_translation"] = korean_match.group(0).replace("Korean Translation:", "").strip()
-                
-                # 정답 키 추출
-                answer_key_match = re.search(r"Answer Key:.*?(?=Cultural Notes:|$)", raw_result, re.DOTALL)
-                if answer_key_match:
-                    answer_key_text = answer_key_match.group(0).replace("Answer Key:", "").strip()
-                    structured_result["answer_key"] = [line.strip() for line in answer_key_text.split("\n") if line.strip()]
-                
-                # 문화적 참고사항 추출
-                cultural_notes_match = re.search(r"Cultural Notes:.*?(?=$)", raw_result, re.DOTALL)
-                if cultural_notes_match:
-                    cultural_notes_text = cultural_notes_match.group(0).replace("Cultural Notes:", "").strip()
-                    structured_result["cultural_notes"] = [line.strip() for line in cultural_notes_text.split("\n") if line.strip()]
+        Args:
+            text (str): 원본 수능영어 지문
+            fingerprint (str): 지문 식별값
+            tiers (tuple): 요청한 난이도 목록
+            seed (int | str): 변형 시드
             
-            # 구조화된 결과가 있는 경우
-            else:
-                # 난이도별 데이터 매핑
-                tier_mapping = {
-                    "foundation": ["foundation", "basic", "beginner"],
-                    "intermediate": ["intermediate", "medium"],
-                    "advanced": ["advanced", "high"],
-                    "expert": ["expert", "very high", "master"]
-                }
-                
-                # 각 난이도별 데이터 추출
-                for result_tier, result_data in gapfill_result.items():
-                    # 난이도 매핑
-                    mapped_tier = None
-                    for tier, aliases in tier_mapping.items():
-                        if any(alias in result_tier.lower() for alias in aliases):
-                            mapped_tier = tier
-                            break
-                    
-                    if mapped_tier:
-                        # 텍스트 추출
-                        if "text" in result_data:
-                            structured_result["tiers"][mapped_tier]["text"] = result_data["text"]
-                        
-                        # 빈칸 추출
-                        if "blanks" in result_data:
-                            structured_result["tiers"][mapped_tier]["blanks"] = result_data["blanks"]
-                        
-                        # 정답 추출
-                        if "answers" in result_data:
-                            structured_result["tiers"][mapped_tier]["answers"] = result_data["answers"]
-                        
-                        # 힌트 추출
-                        if "hints" in result_data:
-                            structured_result["tiers"][mapped_tier]["hints"] = result_data["hints"]
-                
-                # 한국어 번역 추출
-                if "korean_translation" in gapfill_result:
-                    structured_result["korean_translation"] = gapfill_result["korean_translation"]
-                
-                # 정답 키 추출
-                if "answer_key" in gapfill_result:
-                    structured_result["answer_key"] = gapfill_result["answer_key"]
-                
-                # 문화적 참고사항 추출
-                if "cultural_notes" in gapfill_result:
-                    structured_result["cultural_notes"] = gapfill_result["cultural_notes"]
-        
-        # 정답 무작위 섞기 (Fisher-Yates 알고리즘)
-        for tier in structured_result["tiers"].values():
-            answers = tier["answers"].copy()
-            for i in range(len(answers) - 1, 0, -1):
-                j = random.randint(0, i)
-                answers[i], answers[j] = answers[j], answers[i]
-            tier["shuffled_answers"] = answers
-        
-        return structured_result
+        Returns:
+            dict: 이전 갭필 결과
+            
+        Raises:
+            CircuitOpenError: 분석 결과나 요청한 난이도 결과가 없는 경우
+        """
+        store = self.corpus_store
+        analysis_result, expired = self._last_known((fingerprint, "analysis"), lambda: store.get_analysis(fingerprint))
+        tier_results = {}
+        for tier in tiers:
+            tier_data, tier_expired = self._last_known((fingerprint, "tier", tier), lambda tier=tier: store.get_tier(fingerprint, tier))
+            tier_results[tier] = tier_data
+            expired = expired or tier_expired
+        if analysis_result is None or any(tier_data is None for tier_data in tier_results.values()):
+            metrics.inc("gapfill_circuit_rejected_total")
+            raise CircuitOpenError(self.circuit_breaker.retry_after())
+        
+        extras, extras_expired = self._last_known((fingerprint, "extras"), lambda: store.get_extras(fingerprint))
+        html_output, html_expired = self._last_known(
+            self._html_key(fingerprint, tiers, seed), lambda: store.get_html(fingerprint, tiers) if seed == DEFAULT_SEED else None
+        )
+        expired = expired or extras_expired or html_expired
+        
+        metrics.inc("gapfill_stale_served_total", expired=expired)
+        if expired:
+            self.refresh_queue.submit((fingerprint, tiers, seed), text, tiers, seed)
+        
+        gapfill = self._arrange(fingerprint, tier_results, tiers, extras, seed)
+        return {
+            "original_text": text,
+            "analysis": analysis_result,
+            "gapfill": gapfill,
+            # 저장된 HTML이 없으면(다른 시드, HTML 단계 전에 회로가 열림) 이전 결과로 로컬에서 생성
+            "html": html_output if html_output is not None else render_basic_html(text, gapfill),
+            "stale": expired
+        }
+    
+    def _circuit_refusing(self):
+        """
+        회로 차단기가 새 Gemini 요청을 거절하는 중인지 확인
+        (열려 있거나 half-open 시험 요청이 모두 진행 중이면 GeminiClient가 요청을 보내지 않고 None을 반환)
+        
+        Returns:
+            bool: 거절 여부 (회로 차단기가 없으면 False)
+        """
+        return self.circuit_breaker is not None and self.circuit_breaker.is_open()
+    
+    def _last_known(self, cache_key, load_stored):
+        """
+        만료 여부와 관계없이 마지막으로 저장된 값 조회 (캐시에 없으면 코퍼스 저장소)
+        
+        Args:
+            cache_key (tuple): 캐시 키 (지문 식별값, 종류, ...)
+            load_stored (callable): 코퍼스 저장소 조회 함수
+            
+        Returns:
+            tuple: (값 (없으면 None), 만료 여부)
+        """
+        entry = self.result_cache.get_entry(cache_key)
+        if entry is not None:
+            return entry.value, entry.is_expired()
+        if self.corpus_store is not None:
+            return load_stored(), False
+        return None, False
+    
+    def _cached(self, cache_key, load_stored):
+        """
+        캐시 값 조회 (메모리 캐시에 없으면 코퍼스 저장소에서 읽어 캐시에 저장)
+        
+        Args:
+            cache_key (tuple): 캐시 키 (지문 식별값, 종류, ...)
+            load_stored (callable): 코퍼스 저장소 조회 함수
+            
+        Returns:
+            object: 캐시 값 (없으면 None)
+        """
+        value = self.result_cache.get(cache_key)
+        if value is None and self.corpus_store is not None:
+            value = load_stored()
+            if value is not None:
+                metrics.inc("gapfill_corpus_hits_total", kind=cache_key[1])
+                self.result_cache.set(cache_key, value)
+        return value
+    
+    def _get_analysis(self, text, fingerprint):
+        """
+        지문 분석 결과 조회 (캐시와 코퍼스에 없으면 분석 후 저장)
+        
+        Args:
+            text (str): 원본 수능영어 지문
+            fingerprint (str): 지문 식별값
+            
+        Returns:
+            dict: 텍스트 분석 결과
+        """
+        analysis_result = self._cached((fingerprint, "analysis"), lambda: self.corpus_store.get_analysis(fingerprint))
+        if analysis_result is None:
+            analysis_result = self.checkpoints.load(fingerprint, "analysis")
+            if analysis_result is not None:
+                return analysis_result
+            with metrics.span("generator.analysis"):
+                analysis_result = self._analyze_near_duplicate(text, fingerprint) or self.text_analyzer.analyze(text)
+            # 실패한 분석 결과는 저장하지 않음 (재시도에서 다시 분석)
+            if analysis_result.get("linguistic_analysis"):
+                # 체크포인트는 다른 워커의 재시도에서도 사용 (결과 캐시는 워커별)
+                self.checkpoints.save(fingerprint, "analysis", analysis_result)
+                self.result_cache.set((fingerprint, "analysis"), analysis_result)
+                if self.similarity_index is not None:
+                    self.similarity_index.add(fingerprint, text)
+        return analysis_result
+    
+    def _analyze_near_duplicate(self, text, fingerprint):
+        """
+        거의 같은 이전 지문(오타 수정, 줄바꿈 변경, 문장 삭제 등)의 분석 결과를 재사용하여 분석
+        
+        Args:
+            text (str): 원본 수능영어 지문
+            fingerprint (str): 지문 식별값
+            
+        Returns:
+            dict: 텍스트 분석 결과 (유사 지문이 없으면 None)
+        """
+        if self.similarity_index is None:
+            return None
+        match = self.similarity_index.query(text, exclude=fingerprint)
+        if match is None:
+            return None
+        
+        base_fingerprint, base_text, _ = match
+        base_analysis = self._cached(
+            (base_fingerprint, "analysis"),
+            lambda: self.corpus_store.get_analysis(base_fingerprint)
+        )
+        if not base_analysis or not base_analysis.get("linguistic_analysis"):
+            return None
+        
+        metrics.inc("gapfill_near_duplicate_hits_total")
+        return self.text_analyzer.analyze_incremental(text, base_text, base_analysis)
+    
+    def _request_gapfill(self, text, analysis_result, tiers=None):
+        """
+        Gemini API에 갭필 문제 생성 요청
+        
+        Args:
+            text (str): 원본 수능영어 지문
+            analysis_result (dict): 텍스트 분석 결과
+            tiers (list, optional): 생성할 난이도 목록 (없으면 네 가지 모두)
+            
+        Returns:
+            str: 응답 텍스트 (응답이 없으면 None)
+        """
+        tiers = list(tiers or GAPFILL_TIERS)
+        if self.parallel_tiers and len(tiers) > 1:
+            return self._request_gapfill_parallel(text, analysis_result, tiers)
+        
+        # 분석 결과는 클라이언트가 프롬프트에 넣을 때 한 번만 JSON으로 변환
+        response = self.gemini_client.generate_gapfill(text, analysis_result, tiers)
+        return response_text(response)
+    
+    def _get_tier_executor(self):
+        """난이도별 요청용 스레드 풀 (처음 사용할 때 생성)"""
+        with self._tier_executor_lock:
+            if self._tier_executor is None:
+                self._tier_executor = ThreadPoolExecutor(max_workers=self.tier_workers, thread_name_prefix="gapfill-tier")
+            return self._tier_executor
+    
+    def _request_gapfill_parallel(self, text, analysis_result, tiers):
+        """
+        난이도별 갭필 요청을 동시에 보내고 응답을 병합
+        난이도마다 해당 난이도 지시사항과 작은 출력 한도로 요청하고, 지문 단위 부가 정보(번역 등)는 첫 난이도 요청에서만 생성
+        
+        Args:
+            text (str): 원본 수능영어 지문
+            analysis_result (dict): 텍스트 분석 결과
+            tiers (list): 생성할 난이도 목록
+            
+        Returns:
+            str: 병합한 응답 텍스트 (merge_tier_texts() 참고, 모든 응답이 없으면 None)
+        """
+        # 모든 요청이 같은 분석 결과 문자열을 공유 (JSON 변환은 한 번만)
+        if analysis_result and not isinstance(analysis_result, str):
+            analysis_result = json.dumps(analysis_result, ensure_ascii=False, separators=(",", ":"))
+        
+        executor = self._get_tier_executor()
+        futures = {}
+        for index, tier in enumerate(tiers):
+            # 요청 타이밍(Server-Timing)이 작업 스레드에서도 기록되도록 컨텍스트 복사
+            context = contextvars.copy_context()
+            futures[tier] = executor.submit(
+                context.run, self.gemini_client.generate_gapfill, text, analysis_result, [tier], extras=index == 0
+            )
+        metrics.inc("gapfill_parallel_tier_requests_total", len(tiers))
+        return merge_tier_texts({tier: response_text(future.result()) for tier, future in futures.items()})
+    
+    def _generate_gapfill_with_gemini(self, text, analysis_result, tiers=None):
+        """
+        Gemini API를 통한 갭필 문제 생성
+        
+        Args:
+            text (str): 원본 수능영어 지문
+            analysis_result (dict): 텍스트 분석 결과
+            tiers (list, optional): 생성할 난이도 목록 (없으면 네 가지 모두)
+            
+        Returns:
+            dict: 생성된 갭필 문제 (응답이 없거나 처리 실패 시 빈 dict)
+        """
+        return parse_gapfill_text(self._request_gapfill(text, analysis_result, tiers))
+    
+    def _structure_gapfill_result(self, gapfill_result, tiers=None):
+        """
+        갭필 결과 구조화 (structure_gapfill_result() 참고)
+        
+        Returns:
+            Passage: 구조화된 갭필 결과
+        """
+        return structure_gapfill_result(gapfill_result, tiers)
     
     def _generate_html_output(self, text, structured_result):
         """
@@ -0,0 +1,355 @@
+import json
+import random
+from collections.abc import Mapping
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성 (바이너리 직렬화)
+    msgpack = None
+
+# 갭필 난이도 이름 (생성 순서, 설명은 api/gemini_client.py의 GAPFILL_TIERS)
+TIER_NAMES = ("foundation", "intermediate", "advanced", "expert")
+
+# 힌트의 단계별 키 (문법적 → 의미적 → 직접적)
+HINT_LEVELS = ("grammatical", "semantic", "direct")
+
+def as_list(value):
+    """Gemini 응답 값을 목록으로 변환 (문자열 하나만 온 경우 포함)"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+class Hint:
+    """
+    빈칸 힌트
+    3단계 힌트(dict) 또는 단순 문자열 힌트를 모두 표현하며, to_value()로 원래 형태를 복원
+    """
+    __slots__ = ("grammatical", "semantic", "direct", "text", "extra")
+
+    def __init__(self, grammatical=None, semantic=None, direct=None, text=None, extra=None):
+        self.grammatical = grammatical
+        self.semantic = semantic
+        self.direct = direct
+        self.text = text
+        self.extra = extra
+
+    @classmethod
+    def from_value(cls, value):
+        """
+        Gemini 응답의 힌트 값으로 생성
+
+        Args:
+            value (str | dict): 힌트 문자열 또는 단계별 힌트
+
+        Returns:
+            Hint: 힌트
+        """
+        if isinstance(value, Hint):
+            return value
+        if isinstance(value, dict):
+            extra = {key: item for key, item in value.items() if key not in HINT_LEVELS}
+            return cls(value.get("grammatical"), value.get("semantic"), value.get("direct"), extra=extra or None)
+        return cls(text=value)
+
+    def to_value(self):
+        """
+        직렬화용 값 (문자열 힌트는 문자열, 단계별 힌트는 dict)
+        """
+        if self.text is not None:
+            return self.text
+        value = {level: getattr(self, level) for level in HINT_LEVELS if getattr(self, level) is not None}
+        if self.extra:
+            value.update(self.extra)
+        return value
+
+    def __eq__(self, other):
+        if isinstance(other, Hint):
+            return self.to_value() == other.to_value()
+        return self.to_value() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Hint({self.to_value()!r})"
+
+class Blank:
+    """
+    빈칸 하나 (번호 표시, 정답, 힌트)
+    """
+    __slots__ = ("label", "answer", "hint")
+
+    def __init__(self, label, answer, hint=None):
+        self.label = label
+        self.answer = answer
+        self.hint = hint
+
+    def __repr__(self):
+        return f"Blank({self.label!r}, {self.answer!r})"
+
+class _Record(Mapping):
+    """
+    __slots__ 기반 결과 객체의 공통 동작
+    기존 dict 형식 소비 코드를 위해 읽기 전용 매핑(result["tiers"] 등)으로도 접근 가능
+    """
+    __slots__ = ()
+    KEYS = ()
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_json(self):
+        """공백 없는 JSON 문자열"""
+        return dumps_json(self)
+
+    def to_msgpack(self):
+        """msgpack 바이너리 (msgpack 패키지 필요)"""
+        return dumps_msgpack(self)
+
+class Tier(_Record):
+    """
+    난이도 하나의 갭필 문제
+    섞인 선택지는 정답 목록을 복사하지 않고 정답 인덱스 순열(order)로 보관
+    """
+    __slots__ = ("text", "blanks", "answers", "hints", "order")
+    KEYS = ("text", "blanks", "answers", "hints", "shuffled_answers")
+
+    def __init__(self, text="", blanks=None, answers=None, hints=None, order=None):
+        """
+        Tier 초기화
+
+        Args:
+            text (str): 빈칸이 있는 지문
+            blanks (list, optional): 빈칸 번호 표시 목록
+            answers (list, optional): 정답 목록 (빈칸 순서)
+            hints (list, optional): 힌트 목록 (문자열, dict 또는 Hint)
+            order (list, optional): 섞인 선택지의 정답 인덱스 순열 (없으면 원래 순서)
+        """
+        self.text = text or ""
+        self.blanks = as_list(blanks)
+        self.answers = as_list(answers)
+        self.hints = [Hint.from_value(hint) for hint in as_list(hints)]
+        self.order = tuple(order) if order is not None else tuple(range(len(self.answers)))
+
+    @classmethod
+    def from_blanks(cls, text, blanks, order=None):
+        """
+        Blank 목록으로 생성
+
+        Args:
+            text (str): 빈칸이 있는 지문
+            blanks (list): Blank 목록
+            order (list, optional): 정답 인덱스 순열
+
+        Returns:
+            Tier: 난이도 결과
+        """
+        return cls(
+            text,
+            [blank.label for blank in blanks],
+            [blank.answer for blank in blanks],
+            [blank.hint for blank in blanks],
+            order
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        dict 형식(기존 결과 형식)으로 생성
+
+        Args:
+            data (dict): text/blanks/answers/hints(/order) 키를 가진 dict
+
+        Returns:
+            Tier: 난이도 결과
+        """
+        if isinstance(data, Tier):
+            return data
+        return cls(data.get("text", ""), data.get("blanks"), data.get("answers"), data.get("hints"), data.get("order"))
+
+    @property
+    def shuffled_answers(self):
+        """섞인 선택지 목록"""
+        return [self.answers[index] for index in self.order]
+
+    def __getitem__(self, key):
+        if key == "hints":
+            return [hint.to_value() for hint in self.hints]
+        return super().__getitem__(key)
+
+    def iter_blanks(self):
+        """
+        빈칸별 (번호 표시, 정답, 힌트) 조회
+
+        Returns:
+            generator: Blank 목록 (목록 길이가 다르면 없는 값은 None)
+        """
+        for index in range(max(len(self.blanks), len(self.answers))):
+            yield Blank(
+                self.blanks[index] if index < len(self.blanks) else None,
+                self.answers[index] if index < len(self.answers) else None,
+                self.hints[index] if index < len(self.hints) else None
+            )
+
+    def shuffle(self, rng=random):
+        """
+        선택지 순서 섞기 (Fisher-Yates 알고리즘, 정답 목록은 그대로 유지)
+
+        Args:
+            rng (random.Random): 난수 생성기 (기본값: 전역 random)
+        """
+        order = list(range(len(self.answers)))
+        for i in range(len(order) - 1, 0, -1):
+            j = rng.randint(0, i)
+            order[i], order[j] = order[j], order[i]
+        self.order = tuple(order)
+
+    def reshuffled(self, rng):
+        """
+        선택지 순서만 다시 섞은 복사본 (지문/정답/힌트 목록은 공유하므로 캐시된 결과는 바뀌지 않음)
+
+        Args:
+            rng (random.Random): 난수 생성기
+
+        Returns:
+            Tier: 순열만 다른 난이도 결과
+        """
+        tier = Tier.__new__(Tier)
+        tier.text, tier.blanks, tier.answers, tier.hints = self.text, self.blanks, self.answers, self.hints
+        tier.shuffle(rng)
+        return tier
+
+    def to_dict(self):
+        """
+        기존 dict 형식으로 변환
+
+        Returns:
+            dict: text/blanks/answers/hints/shuffled_answers
+        """
+        return {
+            "text": self.text,
+            "blanks": list(self.blanks),
+            "answers": list(self.answers),
+            "hints": [hint.to_value() for hint in self.hints],
+            "shuffled_answers": self.shuffled_answers
+        }
+
+class Passage(_Record):
+    """
+    지문 하나의 갭필 결과 (난이도별 Tier와 지문 단위 부가 정보)
+    """
+    __slots__ = ("tiers", "korean_translation", "answer_key", "cultural_notes", "seed")
+    FIELDS = ("tiers", "korean_translation", "answer_key", "cultural_notes")
+
+    def __init__(self, tiers=None, korean_translation="", answer_key=None, cultural_notes=None, seed=None):
+        """
+        Passage 초기화
+
+        Args:
+            tiers (dict, optional): 난이도 이름 → Tier (또는 dict)
+            korean_translation (str): 한국어 번역
+            answer_key (list, optional): 정답 키
+            cultural_notes (list, optional): 문화적 참고사항
+            seed (int | str, optional): 변형 문제 시드 (선택지 순서와 로컬 생성 결과를 결정)
+        """
+        self.tiers = {name: Tier.from_dict(tier) for name, tier in (tiers or {}).items()}
+        self.korean_translation = korean_translation or ""
+        self.answer_key = as_list(answer_key)
+        self.cultural_notes = as_list(cultural_notes)
+        self.seed = seed
+
+    @property
+    def KEYS(self):
+        return self.FIELDS + ("seed",) if self.seed is not None else self.FIELDS
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        dict 형식(기존 결과 형식)으로 생성
+
+        Args:
+            data (dict): tiers/korean_translation/answer_key/cultural_notes(/seed) 키를 가진 dict
+
+        Returns:
+            Passage: 갭필 결과
+        """
+        if isinstance(data, Passage):
+            return data
+        return cls(
+            data.get("tiers"),
+            data.get("korean_translation", ""),
+            data.get("answer_key"),
+            data.get("cultural_notes"),
+            data.get("seed")
+        )
+
+    def to_dict(self):
+        """
+        기존 dict 형식으로 변환
+
+        Returns:
+            dict: tiers/korean_translation/answer_key/cultural_notes(/seed)
+        """
+        result = {
+            "tiers": {name: tier.to_dict() for name, tier in self.tiers.items()},
+            "korean_translation": self.korean_translation,
+            "answer_key": list(self.answer_key),
+            "cultural_notes": list(self.cultural_notes)
+        }
+        if self.seed is not None:
+            result["seed"] = self.seed
+        return result
+
+def to_serializable(value):
+    """
+    json.dumps / msgpack.packb의 default 함수 (결과 객체를 dict로 변환)
+
+    Raises:
+        TypeError: 직렬화할 수 없는 객체인 경우
+    """
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, Hint):
+        return value.to_value()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps_json(value):
+    """
+    결과 객체를 포함한 값을 공백 없는 JSON 문자열로 직렬화
+
+    Args:
+        value: 직렬화할 값 (Passage/Tier 포함 가능)
+
+    Returns:
+        str: JSON 문자열
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=to_serializable)
+
+def dumps_msgpack(value):
+    """
+    결과 객체를 포함한 값을 msgpack 바이너리로 직렬화
+
+    Args:
+        value: 직렬화할 값 (Passage/Tier 포함 가능)
+
+    Returns:
+        bytes: msgpack 데이터
+
+    Raises:
+        ImportError: msgpack 패키지가 설치되어 있지 않은 경우
+    """
+    if msgpack is None:
+        raise ImportError("msgpack 패키지가 설치되어 있지 않습니다. (pip install msgpack)")
+    return msgpack.packb(value, default=to_serializable, use_bin_type=True)
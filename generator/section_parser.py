@@ -0,0 +1,140 @@
+import re
+from bisect import bisect_left
+
+# 난이도별 섹션 제목과 섹션이 끝나는 다음 제목 (없으면 응답 끝까지)
+TIER_HEADINGS = {
+    "foundation": ("Foundation Tier", "Intermediate Tier"),
+    "intermediate": ("Intermediate Tier", "Advanced Tier"),
+    "advanced": ("Advanced Tier", "Expert Tier"),
+    "expert": ("Expert Tier", None)
+}
+
+# 난이도 섹션 안의 항목 제목 (필드, 제목, 다음 제목)
+TIER_FIELDS = (
+    ("text", "Text:", "Blanks:"),
+    ("blanks", "Blanks:", "Answers:"),
+    ("answers", "Answers:", "Hints:"),
+    ("hints", "Hints:", None)
+)
+
+# 응답 전체에서 찾는 지문 단위 항목 제목 (필드, 제목, 다음 제목)
+EXTRA_HEADINGS = (
+    ("korean_translation", "Korean Translation:", "Answer Key:"),
+    ("answer_key", "Answer Key:", "Cultural Notes:"),
+    ("cultural_notes", "Cultural Notes:", None)
+)
+
+# 문자열 그대로 사용하는 항목 (나머지는 줄 단위 목록)
+TEXT_FIELDS = ("text", "korean_translation")
+
+# 모든 제목을 한 번에 찾는 패턴 (제목끼리는 겹치지 않음)
+HEADING_PATTERN = re.compile("|".join(
+    re.escape(heading) for heading in sorted(
+        {heading for start, stop in TIER_HEADINGS.values() for heading in (start, stop) if heading}
+        | {heading for _, heading, _ in TIER_FIELDS + EXTRA_HEADINGS},
+        key=len,
+        reverse=True
+    )
+))
+
+class SectionIndex:
+    """
+    응답 텍스트의 제목 위치 색인
+    제목을 한 번만 토큰화하고, 이후 섹션은 위치(offset)로 잘라냄
+    """
+
+    def __init__(self, text):
+        """
+        SectionIndex 초기화
+
+        Args:
+            text (str): Gemini 응답 텍스트
+        """
+        self.text = text
+        self.positions = {}
+        for match in HEADING_PATTERN.finditer(text):
+            self.positions.setdefault(match.group(0), []).append(match.start())
+
+    def find(self, heading, start, end):
+        """
+        [start, end) 범위에서 처음 나오는 제목 위치
+
+        Returns:
+            int: 제목 시작 위치 (없으면 -1)
+        """
+        positions = self.positions.get(heading)
+        if not positions:
+            return -1
+        index = bisect_left(positions, start)
+        if index < len(positions) and positions[index] + len(heading) <= end:
+            return positions[index]
+        return -1
+
+    def section(self, heading, stop, start, end):
+        """
+        제목부터 다음 제목(stop) 직전까지의 범위
+
+        Args:
+            heading (str): 섹션 제목
+            stop (str): 섹션이 끝나는 제목 (없으면 범위 끝까지)
+            start (int): 검색 시작 위치
+            end (int): 검색 끝 위치
+
+        Returns:
+            tuple: (시작 위치, 끝 위치), 제목이 없으면 None
+        """
+        position = self.find(heading, start, end)
+        if position < 0:
+            return None
+        stop_position = self.find(stop, position + len(heading), end) if stop else -1
+        return position, stop_position if stop_position >= 0 else end
+
+    def field(self, name, heading, stop, start, end):
+        """
+        항목 값 추출 (제목 제거 후 문자열 또는 줄 목록)
+
+        Returns:
+            str | list: 항목 값, 제목이 없으면 None
+        """
+        span = self.section(heading, stop, start, end)
+        if span is None:
+            return None
+        content = self.text[span[0]:span[1]].replace(heading, "").strip()
+        if name in TEXT_FIELDS:
+            return content
+        return [line.strip() for line in content.split("\n") if line.strip()]
+
+def parse_sections(raw_result, tiers=None):
+    """
+    JSON이 아닌 텍스트 형식의 갭필 결과를 한 번의 제목 토큰화로 파싱
+
+    Args:
+        raw_result (str): Gemini 응답 텍스트
+        tiers (list, optional): 파싱할 난이도 목록 (없으면 네 가지 모두)
+
+    Returns:
+        dict: {"tiers": {난이도: {항목: 값}}, 지문 단위 항목: 값} (찾은 항목만 포함)
+    """
+    index = SectionIndex(raw_result)
+    end = len(raw_result)
+    result = {"tiers": {}}
+
+    for tier, (heading, stop) in TIER_HEADINGS.items():
+        if tiers is not None and tier not in tiers:
+            continue
+        span = index.section(heading, stop, 0, end)
+        if span is None:
+            continue
+        fields = {}
+        for name, field_heading, field_stop in TIER_FIELDS:
+            value = index.field(name, field_heading, field_stop, span[0], span[1])
+            if value is not None:
+                fields[name] = value
+        result["tiers"][tier] = fields
+
+    for name, heading, stop in EXTRA_HEADINGS:
+        value = index.field(name, heading, stop, 0, end)
+        if value is not None:
+            result[name] = value
+
+    return result
@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from generator.gapfill_generator import structure_gapfill_text
+from monitoring.metrics import metrics
+
+# 작업 프로세스마다 한 번 생성하는 최적화 모듈 (문법 패턴 컴파일 포함)
+_optimizer = None
+
+def _init_worker():
+    """작업 프로세스 초기화 (KoreanLearnerOptimization 미리 생성)"""
+    global _optimizer
+    from optimization.korean_learner_optimization import KoreanLearnerOptimization
+    _optimizer = KoreanLearnerOptimization()
+
+def _structure(text_content, tiers):
+    """작업 프로세스: Gemini 응답 텍스트 파싱 및 구조화"""
+    return structure_gapfill_text(text_content, tiers)
+
+def _analyze_grammar(text):
+    """작업 프로세스: 문법 요소 분석 (defaultdict 대신 dict로 반환)"""
+    return dict(_optimizer._analyze_grammar_elements(text))
+
+def _optimize_html(html_output):
+    """작업 프로세스: HTML 출력 최적화"""
+    return _optimizer.optimize_html_output(html_output)
+
+class PostProcessPool:
+    """
+    CPU 위주 후처리(JSON/텍스트 응답 파싱, 문법 요소 분석, HTML 조립)를 실행하는 프로세스 풀
+    GIL을 피해 여러 코어를 사용하며, 작업 프로세스에는 문자열만 전달
+    """
+
+    def __init__(self, processes=None, start_method="spawn"):
+        """
+        PostProcessPool 초기화 (프로세스는 처음 사용할 때 생성)
+
+        Args:
+            processes (int, optional): 작업 프로세스 수 (없으면 CPU 수)
+            start_method (str): multiprocessing 시작 방식 (스레드가 있는 gunicorn 워커에서 fork하지 않도록 기본값 spawn)
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.start_method = start_method
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """
+        현재 프로세스의 ProcessPoolExecutor 반환
+        gunicorn이 fork한 워커는 마스터의 풀을 쓸 수 없으므로 새로 생성
+        """
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def submit(self, func, *args):
+        """
+        작업 제출
+
+        Returns:
+            Future: 작업 결과
+        """
+        return self._get_executor().submit(func, *args)
+
+    def structure(self, text_content, tiers=None):
+        """
+        Gemini 갭필 응답 텍스트를 작업 프로세스에서 파싱 및 구조화
+
+        Args:
+            text_content (str): 응답 텍스트 (없으면 None)
+            tiers (list, optional): 결과에 포함할 난이도 목록
+
+        Returns:
+            Passage: 구조화된 갭필 결과
+        """
+        with metrics.span("worker_pool.structure"):
+            return self.submit(_structure, text_content, list(tiers) if tiers else None).result()
+
+    def analyze_grammar(self, text):
+        """
+        문법 요소 분석 (KoreanLearnerOptimization._analyze_grammar_elements)
+
+        Returns:
+            dict: 문법 요소별 일치 목록
+        """
+        with metrics.span("worker_pool.grammar"):
+            return self.submit(_analyze_grammar, text).result()
+
+    def optimize_html(self, html_output):
+        """
+        HTML 출력 최적화 (KoreanLearnerOptimization.optimize_html_output)
+
+        Returns:
+            str: 최적화된 HTML 출력
+        """
+        with metrics.span("worker_pool.html"):
+            return self.submit(_optimize_html, html_output).result()
+
+    def warm_up(self):
+        """모든 작업 프로세스를 미리 시작 (첫 요청의 프로세스 시작 지연 제거)"""
+        futures = [self.submit(_analyze_grammar, "") for _ in range(self.processes)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        """작업 프로세스 종료"""
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,24 @@
+import gc
+import os
+import sys
+
+# gunicorn 설정: gunicorn -c gunicorn.conf.py web.app:app
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+
+# 마스터 프로세스에서 앱을 import한 뒤 fork (워커가 메모리 페이지를 copy-on-write로 공유)
+preload_app = True
+
+def when_ready(server):
+    """
+    워커 fork 직전 마스터 프로세스에서 컴포넌트 사전 생성
+    """
+    app_module = sys.modules.get("web.app")
+    if app_module is not None:
+        app_module.preload_components()
+
+    # 사전 로드된 객체를 GC 추적 대상에서 제외하여 워커에서 페이지 복사를 줄임
+    gc.freeze()
@@ -0,0 +1,249 @@
+import bisect
+import contextvars
+import os
+import threading
+import time
+
+# 단계별 소요 시간 히스토그램 버킷(초)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 요청 단위 측정값 (요청별 타이밍 헤더용, 요청하지 않으면 None)
+_request_timings = contextvars.ContextVar("gapfill_request_timings", default=None)
+
+def _format_labels(labels):
+    """Prometheus 레이블 문자열"""
+    if not labels:
+        return ""
+    escaped = (
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+class RequestTimings:
+    """
+    요청 하나에서 기록된 단계별 소요 시간과 Gemini 사용량
+    """
+    __slots__ = ("stages", "usage")
+
+    def __init__(self):
+        self.stages = []
+        self.usage = {"prompt_tokens": 0, "output_tokens": 0, "bytes_sent": 0, "bytes_received": 0}
+
+    def server_timing_header(self):
+        """
+        Server-Timing 헤더 값 (같은 단계가 여러 번 실행되면 합산)
+        """
+        totals = {}
+        for stage, duration in self.stages:
+            totals[stage] = totals.get(stage, 0.0) + duration
+        return ", ".join(f"{stage};dur={duration * 1000:.2f}" for stage, duration in totals.items())
+
+    def usage_header(self):
+        """
+        Gemini 토큰/바이트 사용량 헤더 값
+        """
+        return ", ".join(f"{name}={value}" for name, value in self.usage.items())
+
+class _Span:
+    """
+    단계 하나의 소요 시간 측정 (with 문으로 사용)
+    """
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        self.metrics.observe("gapfill_stage_seconds", duration, stage=self.stage)
+        if exc_type is not None:
+            self.metrics.inc("gapfill_stage_errors_total", stage=self.stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.stages.append((self.stage, duration))
+        return False
+
+class _NoopSpan:
+    """비활성화 시 사용하는 빈 측정 객체"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+class Metrics:
+    """
+    경량 계측 레지스트리
+    카운터와 히스토그램을 모아 Prometheus 텍스트 형식으로 출력
+    """
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        """
+        Metrics 초기화
+
+        Args:
+            enabled (bool): 계측 활성화 여부 (비활성화 시 span()은 빈 객체 반환)
+            buckets (tuple): 히스토그램 버킷 경계(초)
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def span(self, stage):
+        """
+        단계 소요 시간 측정
+
+        Args:
+            stage (str): 단계 이름 (예: "generator.structure")
+
+        Returns:
+            context manager: with 문에서 사용하는 측정 객체
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, stage)
+
+    def inc(self, name, value=1, **labels):
+        """
+        카운터 증가
+
+        Args:
+            name (str): 지표 이름
+            value (float): 증가량
+            **labels: 레이블
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """
+        히스토그램에 측정값 기록
+
+        Args:
+            name (str): 지표 이름
+            value (float): 측정값
+            **labels: 레이블
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def record_usage(self, task, prompt_tokens=0, output_tokens=0, bytes_sent=0, bytes_received=0):
+        """
+        Gemini API 호출 사용량 기록 (토큰 수, 송수신 바이트)
+
+        Args:
+            task (str): 호출 작업 (analyze_text, generate_gapfill 등)
+            prompt_tokens (int): 입력 토큰 수 (usageMetadata.promptTokenCount)
+            output_tokens (int): 출력 토큰 수 (usageMetadata.candidatesTokenCount + thoughtsTokenCount)
+            bytes_sent (int): 요청 본문 크기
+            bytes_received (int): 응답 본문 크기
+        """
+        if not self.enabled:
+            return
+        self.inc("gapfill_gemini_prompt_tokens_total", prompt_tokens, task=task)
+        self.inc("gapfill_gemini_output_tokens_total", output_tokens, task=task)
+        self.inc("gapfill_gemini_bytes_sent_total", bytes_sent, task=task)
+        self.inc("gapfill_gemini_bytes_received_total", bytes_received, task=task)
+
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.usage["prompt_tokens"] += prompt_tokens
+            timings.usage["output_tokens"] += output_tokens
+            timings.usage["bytes_sent"] += bytes_sent
+            timings.usage["bytes_received"] += bytes_received
+
+    def snapshot(self):
+        """
+        현재 카운터 값 (테스트/디버깅용)
+
+        Returns:
+            dict: (지표 이름, 레이블 튜플) → 값
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def render_prometheus(self):
+        """
+        Prometheus 텍스트 노출 형식으로 출력
+
+        Returns:
+            str: /metrics 응답 본문
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (list(buckets), total, count)) for key, (buckets, total, count) in self._histograms.items())
+
+        lines = []
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        for (name, labels), (buckets, total, count) in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), buckets):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """전체 측정값 초기화"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+def start_request_timings():
+    """
+    현재 요청(컨텍스트)의 단계별 측정 시작
+
+    Returns:
+        tuple: (RequestTimings, 컨텍스트 복원 토큰)
+    """
+    timings = RequestTimings()
+    return timings, _request_timings.set(timings)
+
+def stop_request_timings(token):
+    """
+    현재 요청(컨텍스트)의 단계별 측정 종료
+
+    Args:
+        token: start_request_timings()가 반환한 복원 토큰
+    """
+    _request_timings.reset(token)
+
+# 프로세스 전역 계측 레지스트리 (GAPFILL_METRICS=0이면 비활성화)
+metrics = Metrics(enabled=os.environ.get("GAPFILL_METRICS", "1") != "0")
@@ -0,0 +1,185 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+# 프로필 id 형식 (다운로드 경로 검증용)
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]+-[A-Za-z0-9_.]+-[0-9a-f]{8}$")
+
+def _frame_label(frame):
+    """스택 프레임 표시 이름 (함수명 (파일:정의 줄))"""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """
+    통계적 샘플링 프로파일러
+    별도 스레드에서 일정 간격으로 대상 스레드의 호출 스택을 수집하여 collapsed stack 형식으로 집계
+    """
+
+    def __init__(self, thread_id=None, interval=0.005, max_depth=64):
+        """
+        SamplingProfiler 초기화
+
+        Args:
+            thread_id (int, optional): 대상 스레드 id (없으면 현재 스레드)
+            interval (float): 샘플링 간격(초)
+            max_depth (int): 수집할 최대 스택 깊이
+        """
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.duration = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """샘플링 시작"""
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="gapfill-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        샘플링 종료
+
+        Returns:
+            Counter: collapsed stack 문자열 → 샘플 수
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._start
+        return self.stacks
+
+    def _run(self):
+        """샘플링 루프"""
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            # 루트 프레임부터 순서대로
+            self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """
+        flamegraph.pl / speedscope 호환 collapsed stack 텍스트
+
+        Returns:
+            str: "프레임;프레임;... 샘플수" 형식의 줄 목록
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+class ProfileStore:
+    """
+    최근 요청 프로필 저장소 (디렉토리 기반, 개수 제한)
+    프로필마다 collapsed stack 파일(.folded)과 메타데이터 파일(.json)을 저장
+    """
+
+    def __init__(self, directory, max_profiles=50):
+        """
+        ProfileStore 초기화
+
+        Args:
+            directory (str): 저장 디렉토리
+            max_profiles (int): 보관할 최대 프로필 수 (초과 시 오래된 것부터 삭제)
+        """
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def save(self, profiler, name, metadata=None):
+        """
+        프로필 저장
+
+        Args:
+            profiler (SamplingProfiler): 종료된 프로파일러
+            name (str): 프로필 이름 (엔드포인트 등)
+            metadata (dict, optional): 함께 저장할 정보 (요청 경로, 산출물 경로 등)
+
+        Returns:
+            str: 프로필 id
+        """
+        safe_name = re.sub(r"[^A-Za-z0-9_.]", "_", name or "request")
+        # 저장 시각(ns)을 앞에 두어 파일 이름만으로 정렬 가능
+        profile_id = f"{time.time_ns()}-{safe_name}-{uuid.uuid4().hex[:8]}"
+        meta = {
+            "id": profile_id,
+            "name": name,
+            "started_at": profiler.started_at,
+            "duration_ms": round(profiler.duration * 1000, 3),
+            "samples": profiler.samples,
+            "interval_ms": profiler.interval * 1000
+        }
+        meta.update(metadata or {})
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, profile_id + ".folded"), 'w', encoding='utf-8') as f:
+                f.write(profiler.collapsed())
+            with open(os.path.join(self.directory, profile_id + ".json"), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            self._prune()
+        return profile_id
+
+    def _prune(self):
+        """보관 개수를 넘는 오래된 프로필 삭제"""
+        profile_ids = self._profile_ids()
+        for profile_id in profile_ids[:max(0, len(profile_ids) - self.max_profiles)]:
+            for suffix in (".folded", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, profile_id + suffix))
+                except OSError:
+                    pass
+
+    def _profile_ids(self):
+        """저장된 프로필 id 목록 (오래된 순)"""
+        if not os.path.isdir(self.directory):
+            return []
+        profile_ids = [name[:-5] for name in os.listdir(self.directory) if name.endswith(".json")]
+        return sorted(profile_ids, key=lambda profile_id: int(profile_id.split("-", 1)[0]))
+
+    def list(self):
+        """
+        저장된 프로필 메타데이터 목록
+
+        Returns:
+            list: 최신순 메타데이터
+        """
+        profiles = []
+        for profile_id in reversed(self._profile_ids()):
+            try:
+                with open(os.path.join(self.directory, profile_id + ".json"), 'r', encoding='utf-8') as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def path(self, profile_id):
+        """
+        프로필 collapsed stack 파일 경로
+
+        Args:
+            profile_id (str): 프로필 id
+
+        Returns:
+            str: 파일 경로 (id 형식이 잘못되었거나 없으면 None)
+        """
+        if not PROFILE_ID_PATTERN.match(profile_id or ""):
+            return None
+        path = os.path.join(self.directory, profile_id + ".folded")
+        return path if os.path.exists(path) else None
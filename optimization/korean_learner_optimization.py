@@ -1,11 +1,8 @@
-import sys
-import os
 import re
 from collections import defaultdict
 
-# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from api.gemini_client import GeminiClient
+from cache.result_cache import passage_fingerprint
 
 class KoreanLearnerOptimization:
     """
@@ -13,14 +10,17 @@ class KoreanLearnerOptimization:
     관계대명사, 수일치, 가정법, 부정사, 동명사, 분사, 시제 등의 문법 요소에 중점
     """
     
-    def __init__(self, gemini_client=None):
+    def __init__(self, gemini_client=None, corpus_store=None):
         """
         KoreanLearnerOptimization 초기화
         
         Args:
-            gemini_client (GeminiClient, optional): Gemini API 클라이언트 인스턴스
+            gemini_client (GeminiClient, optional): Gemini API 클라이언트 인스턴스.
+                없으면 처음 사용할 때 생성 (문법 분석/HTML 최적화는 API 키 없이 동작)
+            corpus_store (CorpusStore, optional): 문법 요소 분석 결과가 미리 계산된 지문 코퍼스
         """
-        self.gemini_client = gemini_client or GeminiClient()
+        self._gemini_client = gemini_client
+        self.corpus_store = corpus_store
         
         # 한국 영어학습자가 어려워하는 문법 요소
         self.grammar_focus = {
@@ -486,6 +486,13 @@ class KoreanLearnerOptimization:
             }
         }
     
+    @property
+    def gemini_client(self):
+        """Gemini API 클라이언트 (지연 생성)"""
+        if self._gemini_client is None:
+            self._gemini_client = GeminiClient()
+        return self._gemini_client
+    
     def optimize_prompt(self, text):
         """
         한국 영어학습자를 위한 프롬프트 최적화
@@ -496,8 +503,12 @@ class KoreanLearnerOptimization:
         Returns:
             str: 최적화된 프롬프트
         """
-        # 문법 요소 분석
-        grammar_elements = self._analyze_grammar_elements(text)
+        # 문법 요소 분석 (코퍼스에 미리 계산된 결과가 있으면 사용)
+        grammar_elements = None
+        if self.corpus_store is not None:
+            grammar_elements = self.corpus_store.get_grammar(passage_fingerprint(text))
+        if grammar_elements is None:
+            grammar_elements = self._analyze_grammar_elements(text)
         
         # 최적화된 프롬프트 생성
         optimized_prompt = f"""
@@ -726,21 +737,22 @@ class KoreanLearnerOptimization:
             optimized_html = template_selection_html + html_output
         
         # 한국어 학습자를 위한 문법 노트 추가
+        grammar_notes = []
         for grammar_type, info in self.grammar_focus.items():
             description = info["description"]
             korean_note = info["korean_note"]
             examples = info["examples"]
             
-            grammar_note_html = f"""
+            grammar_notes.append(f"""
             <div class="grammar-note">
                 <h4>{description}</h4>
                 <p>{korean_note}</p>
                 <p>예시: {' / '.join(examples)}</p>
             </div>
-            """
-            
-            # 정답 키 섹션 앞에 문법 노트 삽입
-            if "<div class=\"answer-key\">" in optimized_html:
-                optimized_html = optimized_html.replace("<div class=\"answer-key\">", grammar_note_html + "<div class=\"answer-key\">")
+            """)
+        
+        # 정답 키 섹션 앞에 문법 노트 삽입 (노트마다 HTML 전체를 복사하지 않도록 한 번에 삽입)
+        if "<div class=\"answer-key\">" in optimized_html:
+            optimized_html = optimized_html.replace("<div class=\"answer-key\">", "".join(grammar_notes) + "<div class=\"answer-key\">")
         
         return optimized_html
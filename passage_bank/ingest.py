@@ -0,0 +1,73 @@
+import codecs
+
+# 텍스트 입력에서 지문을 구분하는 줄
+PASSAGE_SEPARATOR = "---"
+
+# 지문 하나의 최대 길이 (문자 수, 메모리 상한)
+DEFAULT_MAX_PASSAGE_CHARS = 20000
+
+def iter_lines(stream, chunk_size=64 * 1024, encoding="utf-8", max_line_chars=DEFAULT_MAX_PASSAGE_CHARS):
+    """
+    바이너리 스트림을 조각 단위로 읽어 줄 단위로 반환 (전체 입력을 메모리에 올리지 않음)
+
+    Args:
+        stream: read(size)를 지원하는 바이너리 스트림 (request.stream 등)
+        chunk_size (int): 한 번에 읽을 바이트 수
+        encoding (str): 입력 인코딩
+        max_line_chars (int): 줄 하나의 최대 길이
+
+    Yields:
+        str: 줄 (줄바꿈 문자 포함)
+
+    Raises:
+        ValueError: 줄바꿈 없이 max_line_chars를 넘는 입력인 경우
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        text = decoder.decode(chunk or b"", final=not chunk)
+        if text:
+            lines = (pending + text).splitlines(keepends=True)
+            pending = lines.pop() if not lines[-1].endswith("\n") else ""
+            yield from lines
+            if len(pending) > max_line_chars:
+                raise ValueError(f"줄 하나가 {max_line_chars}자를 넘습니다.")
+        if not chunk:
+            break
+    if pending:
+        yield pending
+
+def split_passages(lines, paragraph=False, max_chars=DEFAULT_MAX_PASSAGE_CHARS):
+    """
+    줄 단위 입력을 지문 단위로 나누어 차례로 반환
+
+    Args:
+        lines (iterable): 줄 목록 또는 파일 객체, iter_lines() 결과
+        paragraph (bool): 빈 줄도 지문 구분으로 사용 (기본값: "---" 줄만 사용)
+        max_chars (int): 지문 하나의 최대 길이
+
+    Yields:
+        str: 앞뒤 공백을 제거한 지문 (빈 지문은 건너뜀)
+
+    Raises:
+        ValueError: 지문 하나가 max_chars를 넘는 경우
+    """
+    chunk = []
+    size = 0
+    for line in lines:
+        stripped = line.strip()
+        if stripped == PASSAGE_SEPARATOR or paragraph and not stripped:
+            text = "".join(chunk).strip()
+            if text:
+                yield text
+            chunk = []
+            size = 0
+            continue
+        size += len(line)
+        if size > max_chars:
+            raise ValueError(f"지문 하나가 {max_chars}자를 넘습니다. 지문 사이에 \"{PASSAGE_SEPARATOR}\" 줄을 넣어주세요.")
+        chunk.append(line)
+    text = "".join(chunk).strip()
+    if text:
+        yield text
@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 프로젝트 루트를 import 경로에 추가 (python passage_bank/populate.py 로 실행하는 경우)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from api.gemini_client import GeminiClient
+from analysis.text_analyzer import TextAnalyzer
+from generator.gapfill_generator import GapfillGenerator, normalize_tiers
+from generator.worker_pool import PostProcessPool
+from optimization.korean_learner_optimization import KoreanLearnerOptimization
+from passage_bank.ingest import split_passages
+from passage_bank.store import CorpusStore
+
+def read_passages(paths):
+    """
+    입력 파일에서 지문 읽기
+    .jsonl은 줄마다 {"text": ..., "source": ...}, 그 외 텍스트 파일은 "---" 줄로 지문 구분
+
+    Args:
+        paths (list): 파일 또는 디렉토리 경로 목록
+
+    Returns:
+        list: (지문, 출처) 튜플 목록
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.endswith((".txt", ".jsonl"))
+            )
+        else:
+            files.append(path)
+
+    passages = []
+    for file_path in files:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            if file_path.endswith(".jsonl"):
+                for line_number, line in enumerate(f, start=1):
+                    if line.strip():
+                        item = json.loads(line)
+                        passages.append((item["text"], item.get("source") or item.get("id") or f"{os.path.basename(file_path)}:{line_number}"))
+            else:
+                for index, text in enumerate(split_passages(f), start=1):
+                    passages.append((text, f"{os.path.basename(file_path)}#{index}"))
+    return passages
+
+def populate_passage(store, generator, optimizer, text, source, tiers, worker_pool=None):
+    """
+    지문 하나의 분석 결과, 문법 요소, 난이도별 문제, HTML을 코퍼스에 저장
+
+    Returns:
+        dict: 저장 결과 (지문 식별값, 저장한 난이도 수, HTML 저장 여부)
+    """
+    fingerprint = store.add_passage(text, source)
+
+    # 이미 저장된 결과는 generator가 코퍼스에서 읽으므로 없는 부분만 API 호출
+    result = generator.generate(text, tiers, as_model=True)
+    if result["analysis"].get("linguistic_analysis"):
+        store.put_analysis(fingerprint, result["analysis"])
+
+    stored_tiers = 0
+    for tier, tier_result in result["gapfill"].tiers.items():
+        if tier_result.text or tier_result.answers:
+            store.put_tier(fingerprint, tier, tier_result)
+            stored_tiers += 1
+
+    extras = {field: result["gapfill"][field] for field in ("korean_translation", "answer_key", "cultural_notes")}
+    if any(extras.values()):
+        store.put_extras(fingerprint, extras)
+    if result["html"]:
+        store.put_html(fingerprint, tiers, result["html"])
+
+    if worker_pool is not None:
+        store.put_grammar(fingerprint, worker_pool.analyze_grammar(text))
+    else:
+        store.put_grammar(fingerprint, dict(optimizer._analyze_grammar_elements(text)))
+
+    return {"fingerprint": fingerprint, "tiers": stored_tiers, "html": bool(result["html"])}
+
+def populate(store, passages, tiers=None, concurrency=2, force=False, gemini_client=None, workers=0):
+    """
+    지문 목록을 코퍼스에 일괄 저장
+
+    Args:
+        store (CorpusStore): 코퍼스 저장소
+        passages (list): (지문, 출처) 튜플 목록
+        tiers (list, optional): 생성할 난이도 목록 (없으면 네 가지 모두)
+        concurrency (int): 동시 처리 지문 수
+        force (bool): 저장된 결과를 무시하고 다시 생성
+        gemini_client (GeminiClient, optional): Gemini API 클라이언트
+        workers (int): 응답 구조화/문법 분석 프로세스 수 (0이면 스레드에서 처리)
+
+    Returns:
+        dict: 처리 요약 (전체, 완료, 실패 수)
+    """
+    tiers = normalize_tiers(tiers)
+    gemini_client = gemini_client or GeminiClient()
+    text_analyzer = TextAnalyzer(gemini_client)
+    worker_pool = PostProcessPool(workers) if workers > 0 else None
+    generator = GapfillGenerator(gemini_client, text_analyzer, corpus_store=None if force else store, worker_pool=worker_pool)
+    optimizer = KoreanLearnerOptimization(gemini_client)
+
+    summary = {"total": len(passages), "completed": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(populate_passage, store, generator, optimizer, text, source, tiers, worker_pool): source
+            for text, source in passages
+        }
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                result = future.result()
+                summary["completed"] += 1
+                print(f"[{summary['completed']}/{summary['total']}] {source}: 난이도 {result['tiers']}개, HTML {'저장' if result['html'] else '없음'}")
+            except Exception as e:
+                summary["failed"] += 1
+                print(f"{source} 처리 오류: {e}")
+    if worker_pool is not None:
+        worker_pool.shutdown()
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="수능/모의고사 지문 코퍼스 일괄 생성 (오프라인)")
+    parser.add_argument("inputs", nargs="+", help='지문 파일(.jsonl 또는 "---"로 구분한 .txt) 또는 디렉토리')
+    parser.add_argument("--db", default=os.environ.get("GAPFILL_CORPUS_PATH", "gapfill_corpus.db"), help="코퍼스 데이터베이스 경로")
+    parser.add_argument("--tiers", help='생성할 난이도 (예: "foundation,expert", 기본값: 전체)')
+    parser.add_argument("--concurrency", type=int, default=2, help="동시 처리 지문 수")
+    parser.add_argument("--workers", type=int, default=0, help="응답 구조화/문법 분석 프로세스 수 (0이면 스레드에서 처리)")
+    parser.add_argument("--force", action="store_true", help="저장된 결과를 무시하고 다시 생성")
+    args = parser.parse_args()
+
+    passages = read_passages(args.inputs)
+    store = CorpusStore(args.db)
+    start = time.perf_counter()
+    summary = populate(store, passages, args.tiers.split(",") if args.tiers else None, args.concurrency, args.force, workers=args.workers)
+    store.close()
+
+    print(f"\n{summary['completed']}/{summary['total']}개 지문 저장 완료 (실패 {summary['failed']}개, {time.perf_counter() - start:.1f}초)")
+    if summary["failed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
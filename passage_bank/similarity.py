@@ -0,0 +1,173 @@
+import random
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+from cache.result_cache import normalize_passage
+
+# 2^61 - 1 (MinHash 해시 함수의 모듈러 소수)
+MERSENNE_PRIME = (1 << 61) - 1
+
+# 슁글 생성용 단어 패턴
+SHINGLE_WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+def shingles(text, size=3):
+    """
+    단어 단위 슁글(연속된 단어 묶음) 집합
+
+    Args:
+        text (str): 지문
+        size (int): 슁글 하나의 단어 수
+
+    Returns:
+        set: 슁글 해시(crc32) 집합
+    """
+    words = SHINGLE_WORD_PATTERN.findall(normalize_passage(text).lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+class MinHasher:
+    """
+    MinHash 서명 생성기
+    서명의 같은 위치 값 비율이 두 슁글 집합의 자카드 유사도 추정치
+    """
+
+    def __init__(self, num_perm=64, seed=1):
+        """
+        MinHasher 초기화
+
+        Args:
+            num_perm (int): 해시 함수(서명 길이) 수
+            seed (int): 해시 함수 계수 생성 시드 (같은 시드끼리만 서명 비교 가능)
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingle_set):
+        """
+        슁글 집합의 MinHash 서명
+
+        Args:
+            shingle_set (set): shingles() 결과
+
+        Returns:
+            tuple: 길이 num_perm의 서명 (빈 집합이면 None)
+        """
+        if not shingle_set:
+            return None
+        return tuple(
+            min((a * value + b) % MERSENNE_PRIME for value in shingle_set)
+            for a, b in self.permutations
+        )
+
+def estimate_similarity(signature, other):
+    """두 MinHash 서명의 자카드 유사도 추정치"""
+    return sum(1 for x, y in zip(signature, other) if x == y) / len(signature)
+
+class SimilarityIndex:
+    """
+    유사 지문 색인 (MinHash + LSH)
+    서명을 band 단위로 나눠 버킷에 넣고, 같은 버킷에 들어온 후보만 비교하여 전체 지문을 훑지 않음
+    """
+
+    def __init__(self, threshold=0.7, num_perm=64, bands=16, max_entries=10000, shingle_size=3):
+        """
+        SimilarityIndex 초기화
+
+        Args:
+            threshold (float): 유사 지문으로 판단할 최소 추정 자카드 유사도
+            num_perm (int): MinHash 서명 길이
+            bands (int): LSH band 수 (num_perm의 약수)
+            max_entries (int): 최대 지문 수 (초과 시 오래된 지문부터 제거)
+            shingle_size (int): 슁글 하나의 단어 수
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다.")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self._entries = OrderedDict()
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature):
+        """서명의 band별 버킷 키"""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def add(self, key, text):
+        """
+        지문 등록
+
+        Args:
+            key (str): 지문 식별값
+            text (str): 지문
+        """
+        signature = self.hasher.signature(shingles(text, self.shingle_size))
+        if signature is None:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (signature, text)
+            for band_key in self._band_keys(signature):
+                self._buckets.setdefault(band_key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        """지문 제거 (잠금 안에서 호출)"""
+        signature, _ = self._entries.pop(key)
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def query(self, text, exclude=None):
+        """
+        가장 유사한 등록 지문 검색
+
+        Args:
+            text (str): 지문
+            exclude (str, optional): 제외할 지문 식별값 (자기 자신)
+
+        Returns:
+            tuple: (지문 식별값, 등록된 지문, 추정 유사도), 임계값 이상인 지문이 없으면 None
+        """
+        signature = self.hasher.signature(shingles(text, self.shingle_size))
+        if signature is None:
+            return None
+
+        best = None
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(signature):
+                candidates.update(self._buckets.get(band_key, ()))
+            candidates.discard(exclude)
+
+            for key in candidates:
+                other_signature, other_text = self._entries[key]
+                similarity = estimate_similarity(signature, other_signature)
+                if similarity >= self.threshold and (best is None or similarity > best[2]):
+                    best = (key, other_text, similarity)
+        return best
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
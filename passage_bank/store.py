@@ -0,0 +1,211 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from cache.result_cache import normalize_passage, passage_fingerprint
+from generator.models import Tier, dumps_json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS passages (
+    fingerprint TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    source TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    fingerprint TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL DEFAULT '',
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (fingerprint, kind, key)
+);
+"""
+
+class CorpusStore:
+    """
+    수능/모의고사 지문 코퍼스 저장소 (sqlite)
+    정규화된 지문 식별값을 키로 분석 결과, 문법 요소, 난이도별 문제, HTML을 미리 계산해 보관
+    """
+
+    def __init__(self, path):
+        """
+        CorpusStore 초기화
+
+        Args:
+            path (str): sqlite 데이터베이스 파일 경로
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        """
+        현재 프로세스의 연결 반환
+        gunicorn이 fork한 워커는 마스터의 연결을 공유하지 않도록 새로 연결
+        """
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def add_passage(self, text, source=None):
+        """
+        지문 등록
+
+        Args:
+            text (str): 수능영어 지문
+            source (str, optional): 출처 (예: "2024 수능 31번")
+
+        Returns:
+            str: 지문 식별값
+        """
+        fingerprint = passage_fingerprint(text)
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR IGNORE INTO passages (fingerprint, text, source, created_at) VALUES (?, ?, ?, ?)",
+                (fingerprint, normalize_passage(text), source, time.time())
+            )
+            connection.commit()
+        return fingerprint
+
+    def get(self, fingerprint, kind, key=""):
+        """
+        저장된 결과 조회
+
+        Args:
+            fingerprint (str): 지문 식별값
+            kind (str): 결과 종류 (analysis, grammar, tier, extras, html)
+            key (str): 세부 키 (난이도 이름 등)
+
+        Returns:
+            object: JSON으로 복원한 값 (없으면 None)
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM results WHERE fingerprint = ? AND kind = ? AND key = ?",
+                (fingerprint, kind, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, fingerprint, kind, value, key=""):
+        """
+        결과 저장 (같은 키가 있으면 덮어씀)
+
+        Args:
+            fingerprint (str): 지문 식별값
+            kind (str): 결과 종류
+            value (object): 저장할 값 (Passage/Tier 포함 가능)
+            key (str): 세부 키
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO results (fingerprint, kind, key, value, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, kind, key, dumps_json(value), time.time())
+            )
+            connection.commit()
+
+    def get_analysis(self, fingerprint):
+        """TextAnalyzer.analyze() 결과 조회"""
+        return self.get(fingerprint, "analysis")
+
+    def put_analysis(self, fingerprint, analysis):
+        """TextAnalyzer.analyze() 결과 저장"""
+        self.put(fingerprint, "analysis", analysis)
+
+    def get_grammar(self, fingerprint):
+        """문법 요소 분석 결과 조회"""
+        return self.get(fingerprint, "grammar")
+
+    def put_grammar(self, fingerprint, grammar_elements):
+        """문법 요소 분석 결과 저장"""
+        self.put(fingerprint, "grammar", grammar_elements)
+
+    def get_tier(self, fingerprint, tier):
+        """
+        난이도별 갭필 문제 조회
+
+        Returns:
+            Tier: 난이도 결과 (없으면 None)
+        """
+        value = self.get(fingerprint, "tier", tier)
+        return Tier.from_dict(value) if value is not None else None
+
+    def put_tier(self, fingerprint, tier, tier_result):
+        """난이도별 갭필 문제 저장 (선택지 순서 포함)"""
+        self.put(fingerprint, "tier", dict(tier_result.to_dict(), order=list(tier_result.order)), tier)
+
+    def get_extras(self, fingerprint):
+        """지문 단위 부가 정보(번역, 정답 키, 문화적 참고사항) 조회"""
+        return self.get(fingerprint, "extras")
+
+    def put_extras(self, fingerprint, extras):
+        """지문 단위 부가 정보 저장"""
+        self.put(fingerprint, "extras", extras)
+
+    def get_html(self, fingerprint, tiers):
+        """난이도 조합별 HTML 조회"""
+        return self.get(fingerprint, "html", ",".join(tiers))
+
+    def put_html(self, fingerprint, tiers, html_output):
+        """난이도 조합별 HTML 저장"""
+        self.put(fingerprint, "html", html_output, ",".join(tiers))
+
+    def result_updated_at(self, fingerprint, tiers):
+        """
+        난이도 조합의 결과(분석, 난이도별 문제, HTML) 중 가장 오래된 저장 시각
+
+        Args:
+            fingerprint (str): 지문 식별값
+            tiers (tuple): 난이도 목록
+
+        Returns:
+            float: 가장 오래된 저장 시각 (하나라도 없으면 None)
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT kind, key, updated_at FROM results WHERE fingerprint = ?", (fingerprint,)
+            ).fetchall()
+        updated = {(kind, key): updated_at for kind, key, updated_at in rows}
+        required = [("analysis", ""), ("html", ",".join(tiers))] + [("tier", tier) for tier in tiers]
+        if any(key not in updated for key in required):
+            return None
+        return min(updated[key] for key in required)
+
+    def iter_passages(self):
+        """
+        저장된 지문 목록
+
+        Returns:
+            list: (지문 식별값, 정규화된 지문) 튜플 목록
+        """
+        with self._lock:
+            return self._connect().execute("SELECT fingerprint, text FROM passages").fetchall()
+
+    def __contains__(self, fingerprint):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM passages WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+
+    def close(self):
+        """연결 종료"""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
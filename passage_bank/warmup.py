@@ -0,0 +1,260 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# 프로젝트 루트를 import 경로에 추가 (python passage_bank/warmup.py 로 실행하는 경우)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from api.gemini_client import GeminiClient
+from analysis.text_analyzer import TextAnalyzer
+from cache.result_cache import passage_fingerprint
+from generator.gapfill_generator import GapfillGenerator, normalize_tiers
+from optimization.korean_learner_optimization import KoreanLearnerOptimization
+from passage_bank.populate import populate_passage, read_passages
+from passage_bank.store import CorpusStore
+
+def parse_window(spec):
+    """
+    한가한 시간대 문자열 파싱
+
+    Args:
+        spec (str): "01:00-06:00" 형식 (자정을 넘는 "22:00-06:00"도 가능, 없으면 하루 종일)
+
+    Returns:
+        tuple: (시작 분, 끝 분) (하루 종일이면 None)
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    if not spec:
+        return None
+    try:
+        start, end = spec.split("-")
+        start_hour, start_minute = map(int, start.split(":"))
+        end_hour, end_minute = map(int, end.split(":"))
+    except ValueError:
+        raise ValueError(f"시간대 형식이 잘못되었습니다 (예: 01:00-06:00): {spec}")
+    return start_hour * 60 + start_minute, end_hour * 60 + end_minute
+
+def _window_intervals(start, end, window):
+    """start~end 사이에 걸친 날짜별 시간대 구간 (자정을 넘는 시간대 포함)"""
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    while day < end:
+        window_start = day + timedelta(minutes=window[0])
+        window_end = day + timedelta(minutes=window[1])
+        if window[1] <= window[0]:
+            window_end += timedelta(days=1)
+        yield window_start, window_end
+        day += timedelta(days=1)
+
+def window_seconds(start, end, window):
+    """
+    start~end 중 한가한 시간대에 속하는 시간
+
+    Args:
+        start (datetime): 시작 시각
+        end (datetime): 끝 시각
+        window (tuple): parse_window() 결과 (None이면 하루 종일)
+
+    Returns:
+        float: 시간(초)
+    """
+    if window is None:
+        return max(0.0, (end - start).total_seconds())
+    return sum(
+        max(0.0, (min(end, window_end) - max(start, window_start)).total_seconds())
+        for window_start, window_end in _window_intervals(start, end, window)
+    )
+
+def next_window_start(now, window):
+    """
+    작업을 시작할 수 있는 가장 빠른 시각
+
+    Args:
+        now (datetime): 현재 시각
+        window (tuple): parse_window() 결과 (None이면 하루 종일)
+
+    Returns:
+        datetime: 현재 시간대 안이면 now, 아니면 다음 시간대 시작 시각
+    """
+    if window is None:
+        return now
+    for window_start, window_end in _window_intervals(now, now + timedelta(days=2), window):
+        if window_end > now:
+            return max(now, window_start)
+    return now
+
+class WarmupScheduler:
+    """
+    시험 시즌 전 지문 결과 미리 생성 스케줄러
+    마감 시각까지 남은 한가한 시간대에 생성 작업을 고르게 나누어 코퍼스를 채우고, 곧 오래되는 결과는 다시 생성
+    """
+
+    def __init__(self, store, generator, optimizer, deadline, window=None, budget=None, tiers=None,
+                 max_age=None, rewarm_before=0, refresh_generator=None, clock=datetime.now, sleep=time.sleep):
+        """
+        WarmupScheduler 초기화
+
+        Args:
+            store (CorpusStore): 코퍼스 저장소 (웹 서버가 캐시에 없을 때 조회)
+            generator (GapfillGenerator): 코퍼스에 없는 부분만 생성하는 생성기
+            optimizer (KoreanLearnerOptimization): 문법 요소 분석용 최적화 모듈
+            deadline (datetime): 마감 시각 (이후에는 작업을 시작하지 않음)
+            window (tuple, optional): 작업할 한가한 시간대 (parse_window() 결과, 없으면 하루 종일)
+            budget (int, optional): 이번 실행에서 생성할 최대 지문 수 (API 할당량, 없으면 제한 없음)
+            tiers (list, optional): 생성할 난이도 목록 (없으면 네 가지 모두)
+            max_age (float, optional): 결과 유효 기간(초) (없으면 저장된 결과는 다시 생성하지 않음)
+            rewarm_before (float): 유효 기간이 끝나기 이 시간(초) 전부터 다시 생성
+            refresh_generator (GapfillGenerator, optional): 오래된 결과를 다시 생성할 때 사용할 생성기 (코퍼스를 읽지 않아야 함)
+            clock (callable): 현재 시각 함수 (테스트용)
+            sleep (callable): 대기 함수 (테스트용)
+        """
+        self.store = store
+        self.generator = generator
+        self.optimizer = optimizer
+        self.deadline = deadline
+        self.window = window
+        self.budget = budget
+        self.tiers = normalize_tiers(tiers)
+        self.max_age = max_age
+        self.rewarm_before = rewarm_before
+        self.refresh_generator = refresh_generator or generator
+        self.clock = clock
+        self.sleep = sleep
+
+    def plan(self, passages):
+        """
+        생성할 지문 목록 (코퍼스에 없는 지문을 먼저, 이어서 오래된 지문을 오래된 순서로)
+
+        Args:
+            passages (list): (지문, 출처) 튜플 목록
+
+        Returns:
+            list: (지문, 출처, 이유) 튜플 목록 (이유는 "missing" 또는 "expiring")
+        """
+        now = self.clock().timestamp()
+        missing = []
+        expiring = []
+        for text, source in passages:
+            updated_at = self.store.result_updated_at(passage_fingerprint(text), self.tiers)
+            if updated_at is None:
+                missing.append((text, source, "missing"))
+            elif self.max_age is not None and now - updated_at >= self.max_age - self.rewarm_before:
+                expiring.append((updated_at, (text, source, "expiring")))
+        expiring.sort(key=lambda item: item[0])
+        return missing + [job for _, job in expiring]
+
+    def _wait_turn(self):
+        """
+        한가한 시간대가 될 때까지 대기
+
+        Returns:
+            bool: 마감 전에 작업을 시작할 수 있으면 True
+        """
+        now = self.clock()
+        start = next_window_start(now, self.window)
+        if start >= self.deadline:
+            return False
+        if start > now:
+            print(f"{start:%Y-%m-%d %H:%M}까지 대기 (한가한 시간대 시작)")
+            self.sleep((start - now).total_seconds())
+        return True
+
+    def run(self, passages):
+        """
+        지문 결과 미리 생성
+
+        Args:
+            passages (list): (지문, 출처) 튜플 목록
+
+        Returns:
+            dict: 처리 요약 (전체, 최신, 예약, 완료, 실패, 할당량 초과로 미룬 수, 마감으로 못한 수)
+        """
+        jobs = self.plan(passages)
+        deferred = []
+        if self.budget is not None and len(jobs) > self.budget:
+            jobs, deferred = jobs[:self.budget], jobs[self.budget:]
+
+        summary = {
+            "total": len(passages),
+            "fresh": len(passages) - len(jobs) - len(deferred),
+            "scheduled": len(jobs),
+            "completed": 0,
+            "failed": 0,
+            "deferred": len(deferred),
+            "missed_deadline": 0
+        }
+        for index, (text, source, reason) in enumerate(jobs):
+            if not self._wait_turn():
+                summary["missed_deadline"] = len(jobs) - index
+                print(f"마감 시각이 지나 {summary['missed_deadline']}개 지문을 생성하지 못했습니다.")
+                break
+
+            started = self.clock()
+            generator = self.generator if reason == "missing" else self.refresh_generator
+            try:
+                populate_passage(self.store, generator, self.optimizer, text, source, self.tiers)
+                summary["completed"] += 1
+            except Exception as e:
+                summary["failed"] += 1
+                print(f"{source} 처리 오류: {e}")
+
+            remaining = len(jobs) - index - 1
+            finished = self.clock()
+            available = window_seconds(finished, self.deadline, self.window)
+            print(f"[{index + 1}/{len(jobs)}] {source} ({reason}): 남은 지문 {remaining}개, 마감까지 작업 가능 시간 {available / 3600:.1f}시간")
+
+            # 남은 작업 가능 시간을 남은 지문 수로 나누어 작업 간격 결정 (한 번에 몰아서 할당량을 쓰지 않도록)
+            if remaining:
+                interval = available / (remaining + 1) - (finished - started).total_seconds()
+                if interval > 0:
+                    self.sleep(interval)
+        return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="시험 시즌 지문 결과 미리 생성 (한가한 시간대에 나누어 실행)")
+    parser.add_argument("inputs", nargs="+", help='지문 파일(.jsonl 또는 "---"로 구분한 .txt) 또는 디렉토리')
+    parser.add_argument("--deadline", required=True, help="마감 시각 (예: 2026-11-12T06:00)")
+    parser.add_argument("--window", default="01:00-06:00", help='작업할 시간대 (예: "22:00-06:00", "all"이면 하루 종일)')
+    parser.add_argument("--budget", type=int, help="이번 실행에서 생성할 최대 지문 수 (API 할당량)")
+    parser.add_argument("--db", default=os.environ.get("GAPFILL_CORPUS_PATH", "gapfill_corpus.db"), help="코퍼스 데이터베이스 경로")
+    parser.add_argument("--tiers", help='생성할 난이도 (예: "foundation,expert", 기본값: 전체)')
+    parser.add_argument("--max-age-days", type=float, help="결과 유효 기간(일) (지나기 전에 다시 생성, 없으면 다시 생성하지 않음)")
+    parser.add_argument("--rewarm-days", type=float, default=1.0, help="유효 기간이 끝나기 며칠 전부터 다시 생성할지")
+    args = parser.parse_args()
+
+    deadline = datetime.fromisoformat(args.deadline)
+    window = None if args.window == "all" else parse_window(args.window)
+    passages = read_passages(args.inputs)
+    store = CorpusStore(args.db)
+
+    gemini_client = GeminiClient()
+    text_analyzer = TextAnalyzer(gemini_client)
+    scheduler = WarmupScheduler(
+        store,
+        GapfillGenerator(gemini_client, text_analyzer, corpus_store=store),
+        KoreanLearnerOptimization(gemini_client),
+        deadline,
+        window=window,
+        budget=args.budget,
+        tiers=args.tiers.split(",") if args.tiers else None,
+        max_age=args.max_age_days * 86400 if args.max_age_days else None,
+        rewarm_before=args.rewarm_days * 86400,
+        refresh_generator=GapfillGenerator(gemini_client, text_analyzer)
+    )
+    summary = scheduler.run(passages)
+    store.close()
+
+    print(
+        f"\n{summary['completed']}/{summary['scheduled']}개 지문 생성 완료 "
+        f"(최신 {summary['fresh']}개, 실패 {summary['failed']}개, 할당량 초과 {summary['deferred']}개, 마감 초과 {summary['missed_deadline']}개)"
+    )
+    if summary["failed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
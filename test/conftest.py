@@ -0,0 +1,97 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+class FakeClock:
+    """수동으로 움직이는 시계 (sleep() 호출만큼 움직임, 숫자 시각과 datetime 모두 사용 가능)"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += timedelta(seconds=seconds) if isinstance(self.now, datetime) else seconds
+
+@pytest.fixture
+def fake_clock():
+    """
+    0초에서 시작하는 가짜 시계 (clock.now를 바꿔 시간을 움직임)
+    """
+    return FakeClock()
+
+def _gemini_response(text, finish_reason=None, usage=None):
+    """Gemini API 응답 형식으로 감싸기"""
+    candidate = {"content": {"parts": [{"text": text}]}}
+    if finish_reason:
+        candidate["finishReason"] = finish_reason
+    response = {"candidates": [candidate]}
+    if usage is not None:
+        response["usageMetadata"] = usage
+    return response
+
+class FakeGeminiClient:
+    """호출을 기록하고 요청한 난이도만 돌려주는 가짜 클라이언트"""
+
+    def __init__(self, answers=None, hints=None, words=None, batch_payload=None):
+        """
+        FakeGeminiClient 초기화
+
+        Args:
+            answers (list, optional): 모든 난이도의 정답 (기본값: 난이도 이름 하나)
+            hints (list, optional): 모든 난이도의 힌트
+            words (list, optional): analyze_text가 돌려줄 단어 분석 결과
+            batch_payload (callable, optional): (지문 ID, 지문) 목록을 받아 analyze_texts 응답 텍스트를 만드는 함수
+        """
+        self.answers = answers
+        self.hints = hints if hints is not None else ["hint"]
+        self.words = words if words is not None else [{"word": "balance", "difficulty": "basic"}]
+        self.batch_payload = batch_payload
+        self.analyze_calls = []
+        self.batch_calls = []
+        self.gapfill_calls = []
+        self.html_calls = 0
+
+    @property
+    def calls(self):
+        """전체 API 호출 수"""
+        return len(self.analyze_calls) + len(self.batch_calls) + len(self.gapfill_calls) + self.html_calls
+
+    def analyze_texts(self, passages):
+        self.batch_calls.append(passages)
+        return _gemini_response(self.batch_payload(passages))
+
+    def analyze_text(self, text):
+        self.analyze_calls.append(text)
+        return _gemini_response(json.dumps({"words": self.words}))
+
+    def generate_gapfill(self, text, analysis=None, tiers=None):
+        self.gapfill_calls.append(list(tiers))
+        payload = {
+            tier: {"text": f"{tier} ___", "answers": list(self.answers or [tier]), "hints": list(self.hints)}
+            for tier in tiers
+        }
+        payload["korean_translation"] = "균형이 핵심이다."
+        return _gemini_response("```json\n" + json.dumps(payload) + "\n```")
+
+    def generate_html_output(self, text, gapfill_result):
+        self.html_calls += 1
+        return "<html>" + ",".join(gapfill_result["tiers"]) + "</html>"
+
+@pytest.fixture
+def gemini_response():
+    """
+    텍스트(와 finishReason, usageMetadata)를 Gemini API 응답 형식으로 감싸는 함수
+    """
+    return _gemini_response
+
+@pytest.fixture
+def fake_gemini_client():
+    """
+    FakeGeminiClient를 만드는 함수 (테스트마다 여러 클라이언트를 만들 수 있도록 클래스를 반환)
+    """
+    return FakeGeminiClient
@@ -0,0 +1,153 @@
+import sys
+import os
+import threading
+import time
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from web.admission import AdmissionController, AdmissionRejected
+
+def _wait_until(condition, timeout=2.0):
+    """조건이 참이 될 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "시간 초과"
+        time.sleep(0.005)
+
+def test_interactive_requests_run_before_bulk():
+    """
+    자리가 없으면 대기하고, 자리가 나면 먼저 온 일괄 작업보다 대화형 요청을 먼저 처리하는지 확인
+    """
+    controller = AdmissionController(max_concurrency=1, max_queue=4, max_wait=5.0, initial_service_time=0.1)
+    controller.acquire("interactive")
+    order = []
+
+    def request(priority):
+        with controller.admit(priority):
+            order.append(priority)
+
+    bulk = threading.Thread(target=request, args=("bulk",))
+    bulk.start()
+    _wait_until(lambda: controller.get_stats()["waiting"] == 1)
+    interactive = threading.Thread(target=request, args=("interactive",))
+    interactive.start()
+    _wait_until(lambda: controller.get_stats()["waiting"] == 2)
+
+    controller.release(0.1)
+    bulk.join(2)
+    interactive.join(2)
+    assert order == ["interactive", "bulk"]
+    assert controller.get_stats()["in_flight"] == 0
+
+def test_over_capacity_is_rejected_fast_with_retry_after():
+    """
+    예상 대기 시간이 최대 대기 시간을 넘거나 대기열이 가득 차면 기다리지 않고 바로 거절하는지 확인
+    """
+    controller = AdmissionController(max_concurrency=1, max_queue=1, max_wait=5.0, initial_service_time=10.0)
+    controller.acquire("interactive")
+    started = time.monotonic()
+    try:
+        controller.acquire("interactive")
+        assert False, "AdmissionRejected가 발생해야 합니다"
+    except AdmissionRejected as e:
+        assert e.retry_after == 10
+    assert time.monotonic() - started < 0.5
+
+    # 대기열이 가득 차면 대화형 요청이 대기 중인 일괄 작업을 밀어냄
+    controller = AdmissionController(max_concurrency=1, max_queue=1, max_wait=5.0, initial_service_time=1.0)
+    controller.acquire("interactive")
+    errors = []
+
+    def bulk_request():
+        try:
+            controller.acquire("bulk")
+        except AdmissionRejected as e:
+            errors.append(e)
+
+    bulk = threading.Thread(target=bulk_request)
+    bulk.start()
+    _wait_until(lambda: controller.get_stats()["waiting"] == 1)
+    interactive = threading.Thread(target=controller.acquire, args=("interactive",))
+    interactive.start()
+    bulk.join(2)
+    assert len(errors) == 1 and errors[0].retry_after >= 1
+    assert controller.get_stats()["shed"] == 1
+
+    controller.release(1.0)
+    interactive.join(2)
+    assert controller.get_stats()["in_flight"] == 1
+
+class BlockingGenerator:
+    """release가 설정될 때까지 생성을 끝내지 않는 가짜 생성기"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def generate(self, text, tiers=None, seed=None, as_model=False):
+        self.release.wait(5)
+        return {"gapfill": {}, "html": "<html></html>"}
+
+def test_api_returns_503_with_retry_after_when_overloaded():
+    """
+    생성 중인 요청이 자리를 모두 차지하면 /api/gapfill이 기다리지 않고 503과 Retry-After를 반환하는지 확인
+    """
+    import web.app as web_app
+    generator = BlockingGenerator()
+    previous = web_app.admission
+    web_app.admission = AdmissionController(max_concurrency=1, max_queue=0, max_wait=10.0, initial_service_time=5.0)
+    web_app._components = {"gapfill_generator": generator}
+    body = {"text": "Balance is key.", "tiers": ["foundation"]}
+    statuses = []
+    try:
+        first = threading.Thread(target=lambda: statuses.append(web_app.app.test_client().post("/api/gapfill", json=body).status_code))
+        first.start()
+        _wait_until(lambda: web_app.admission.get_stats()["in_flight"] == 1)
+
+        started = time.monotonic()
+        response = web_app.app.test_client().post("/api/gapfill", json=body)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+        assert time.monotonic() - started < 0.5
+
+        generator.release.set()
+        first.join(5)
+        assert statuses == [200]
+    finally:
+        generator.release.set()
+        web_app.admission = previous
+        web_app._components = None
+
+def test_default_concurrency_leaves_threads_for_queueing():
+    """
+    기본 동시 처리 수가 gunicorn 요청 스레드 수보다 작아 대기열과 거절 응답에 쓸 스레드가 남는지 확인
+    """
+    import web.app as web_app
+    config = web_app.app.config
+    assert 0 < config["ADMISSION_CONCURRENCY"] < config["WORKER_THREADS"]
+    assert config["ADMISSION_CONCURRENCY"] + config["ADMISSION_QUEUE"] < config["WORKER_THREADS"]
+
+def test_batch_items_wait_instead_of_being_rejected():
+    """
+    동시 처리 수와 대기열보다 지문이 많은 배치도 유휴 서버에서 거절 없이 모두 처리되는지 확인
+    """
+    import json
+    import web.app as web_app
+
+    class FakeGenerator:
+        def generate(self, text, tiers=None, seed=None, as_model=False):
+            time.sleep(0.05)
+            return {"gapfill": {"text": text}, "html": "<html></html>"}
+
+    previous = web_app.admission
+    web_app.admission = AdmissionController(max_concurrency=1, max_queue=0, max_wait=0.01, initial_service_time=5.0)
+    web_app._components = {"gapfill_generator": FakeGenerator()}
+    try:
+        passages = [f"Passage number {index}." for index in range(4)]
+        response = web_app.app.test_client().post("/api/batch/gapfill", json={"passages": passages})
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert lines[-1]["done"] and lines[-1]["failed"] == 0
+        assert all(line["success"] for line in lines[:-1])
+        assert web_app.admission.get_stats()["rejected"] == 0
+    finally:
+        web_app.admission = previous
+        web_app._components = None
@@ -0,0 +1,87 @@
+import sys
+import os
+import json
+import threading
+import time
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from web.batch import BatchRunner
+
+def test_batch_dedupes_and_reports_partial_failures():
+    """
+    동일 지문은 한 번만 처리하고, 실패는 항목별로 보고하는지 확인
+    """
+    calls = []
+
+    def worker(text):
+        calls.append(text)
+        if text == "bad":
+            raise RuntimeError("boom")
+        return {"length": len(text)}
+
+    runner = BatchRunner(max_concurrency=2)
+    items = runner.parse_items({"passages": ["alpha", {"id": "x", "text": "alpha "}, "bad", ""]})
+    lines = [json.loads(line) for line in runner.stream(items, worker)]
+
+    assert sorted(calls) == ["alpha", "bad"]
+    by_index = {tuple(line["indices"]): line for line in lines if "indices" in line}
+    assert by_index[(0, 1)]["success"] and by_index[(0, 1)]["ids"] == [0, "x"]
+    assert by_index[(2,)]["error"] == "boom"
+    assert not by_index[(3,)]["success"]
+    assert lines[-1] == {"done": True, "total": 4, "unique": 3, "failed": 2}
+
+def test_batch_respects_concurrency_cap():
+    """
+    서버 전체 동시 실행 수 제한 확인
+    """
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def worker(text):
+        with lock:
+            active.append(text)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(text)
+        return {}
+
+    runner = BatchRunner(max_concurrency=3)
+    items = runner.parse_items({"passages": [f"passage {i}" for i in range(12)]})
+    list(runner.run(items, worker))
+
+    assert max(peak) <= 3
+
+def test_batch_endpoints_validate_before_creating_components():
+    """
+    배치/스트리밍 API가 요청을 먼저 검증하고, 컴포넌트 생성에 실패하면(API 키 없음 등) JSON 오류로 응답하는지 확인
+    """
+    import web.app as web_app
+    calls = []
+
+    def failing_components():
+        calls.append(1)
+        raise ValueError("Gemini API 키가 필요합니다.")
+
+    previous = web_app._create_components
+    web_app._create_components = failing_components
+    web_app._components = None
+    client = web_app.app.test_client()
+    try:
+        assert client.post("/api/batch/gapfill", json={"passages": []}).status_code == 400
+        assert client.post("/api/batch/analyze", json={}).status_code == 400
+        assert client.post("/api/stream/gapfill?tiers=unknown", data="Balance is key.").status_code == 400
+        assert calls == []
+
+        for response in (
+            client.post("/api/batch/gapfill", json={"passages": ["Balance is key."]}),
+            client.post("/api/batch/analyze", json={"passages": ["Balance is key."]}),
+            client.post("/api/stream/gapfill", data="Balance is key.")
+        ):
+            assert response.status_code == 500
+            assert "API 키" in response.get_json()["error"]
+    finally:
+        web_app._create_components = previous
+        web_app._components = None
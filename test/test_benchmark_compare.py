@@ -0,0 +1,25 @@
+import sys
+import os
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.compare import compare
+
+def test_more_errors_is_a_regression_even_when_faster():
+    """
+    실패가 늘어 처리량과 지연 시간이 좋아진 것처럼 보이는 결과를 회귀로 판단하고, 지표 dict가 아닌 항목은 건너뛰는지 확인
+    """
+    baseline = {"results": {
+        "endpoint./api/gapfill": {"errors": 0, "throughput_per_s": 10.0, "p50_ms": 100.0},
+        "note": 1.5
+    }}
+    current = {"results": {
+        "endpoint./api/gapfill": {"errors": 13, "throughput_per_s": 40.0, "p50_ms": 5.0},
+        "note": 1.5
+    }}
+    rows, regressions = compare(baseline, current, 0.1)
+    assert [(row[0], row[1]) for row in regressions] == [("endpoint./api/gapfill", "errors")]
+    assert {row[1] for row in rows} == {"errors", "throughput_per_s", "p50_ms"}
+
+    rows, regressions = compare(current, current, 0.1)
+    assert regressions == []
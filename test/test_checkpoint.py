@@ -0,0 +1,98 @@
+import sys
+import os
+import json
+import tempfile
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache.checkpoint import StageCheckpoints
+from cache.result_cache import passage_fingerprint
+from generator.gapfill_generator import GapfillGenerator
+
+SAMPLE_TEXT = "Balance is key. If I were you, I would enjoy swimming to relax."
+
+class FlakyHtmlGeminiClient:
+    """작업별 호출 수를 세고, HTML 생성이 처음 한 번 실패하는 가짜 클라이언트"""
+
+    def __init__(self):
+        self.calls = {"analysis": 0, "gapfill": 0, "html": 0}
+
+    def analyze_text(self, text):
+        self.calls["analysis"] += 1
+        return {"candidates": [{"content": {"parts": [{"text": json.dumps({"words": [{"word": "key", "difficulty": "기초"}]})}]}}]}
+
+    def generate_gapfill(self, text, analysis=None, tiers=None):
+        self.calls["gapfill"] += 1
+        payload = {tier: {"text": f"{tier} ___", "answers": ["key"]} for tier in tiers}
+        return {"candidates": [{"content": {"parts": [{"text": json.dumps(payload)}]}}]}
+
+    def generate_html_output(self, text, gapfill_result):
+        self.calls["html"] += 1
+        if self.calls["html"] == 1:
+            raise TimeoutError("HTML 생성 시간 초과")
+        return "<html></html>"
+
+def test_retry_resumes_after_failed_stage_in_another_worker():
+    """
+    HTML 단계가 실패한 뒤 다른 워커(결과 캐시가 비어 있음)에서 다시 요청해도 분석/갭필을 다시 호출하지 않는지 확인
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "checkpoints.db")
+        client = FlakyHtmlGeminiClient()
+        try:
+            GapfillGenerator(client, checkpoints=StageCheckpoints(path)).generate(SAMPLE_TEXT, ["foundation"])
+            assert False, "TimeoutError가 발생해야 합니다"
+        except TimeoutError:
+            pass
+
+        checkpoints = StageCheckpoints(path)
+        result = GapfillGenerator(client, checkpoints=checkpoints).generate(SAMPLE_TEXT, ["foundation"])
+        assert result["html"] == "<html></html>"
+        assert result["gapfill"]["tiers"]["foundation"]["answers"] == ["key"]
+        assert client.calls == {"analysis": 1, "gapfill": 1, "html": 2}
+        # 모든 단계가 끝나면 체크포인트 정리
+        assert len(checkpoints) == 0
+        checkpoints.close()
+
+def test_checkpoints_expire_and_stay_bounded():
+    """
+    체크포인트가 유효 시간 후 만료되고 최대 개수를 넘지 않는지 확인
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoints = StageCheckpoints(os.path.join(directory, "checkpoints.db"), ttl=60, max_entries=2)
+        for index in range(3):
+            checkpoints.save(passage_fingerprint(f"passage {index}"), "gapfill", {"index": index}, "foundation")
+        assert len(checkpoints) == 2
+        assert checkpoints.load(passage_fingerprint("passage 0"), "gapfill", "foundation") is None
+        assert checkpoints.load(passage_fingerprint("passage 2"), "gapfill", "foundation") == {"index": 2}
+
+        checkpoints.ttl = -1
+        checkpoints.save("expired", "analysis", {"words": []})
+        assert checkpoints.load("expired", "analysis") is None
+        checkpoints.close()
+
+class FlakyAnalysisGeminiClient(FlakyHtmlGeminiClient):
+    """분석이 처음 한 번 실패(응답 없음)하는 가짜 클라이언트"""
+
+    def analyze_text(self, text):
+        if self.calls["analysis"] == 0:
+            self.calls["analysis"] += 1
+            return None
+        return super().analyze_text(text)
+
+def test_failed_analysis_is_not_checkpointed():
+    """
+    분석이 실패한 요청이 뒤 단계에서도 실패하면, 재시도에서 실패한 분석 결과를 재사용하지 않고 다시 분석하는지 확인
+    """
+    client = FlakyAnalysisGeminiClient()
+    checkpoints = StageCheckpoints()
+    try:
+        GapfillGenerator(client, checkpoints=checkpoints).generate(SAMPLE_TEXT, ["foundation"])
+        assert False, "TimeoutError가 발생해야 합니다"
+    except TimeoutError:
+        pass
+    assert checkpoints.load(passage_fingerprint(SAMPLE_TEXT), "analysis") is None
+
+    result = GapfillGenerator(client, checkpoints=checkpoints).generate(SAMPLE_TEXT, ["foundation"])
+    assert client.calls["analysis"] == 2
+    assert result["analysis"]["linguistic_analysis"]
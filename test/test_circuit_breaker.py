@@ -0,0 +1,122 @@
+import sys
+import os
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.circuit_breaker import CircuitBreaker, CircuitOpenError
+from api.gemini_client import GeminiClient
+from api.gemini_stub_server import StubConfig, start_stub_server
+from cache.result_cache import ResultCache, passage_fingerprint
+from generator.gapfill_generator import GapfillGenerator
+
+SAMPLE_TEXT = "Balance is key. If I were you, I would enjoy swimming to relax."
+
+def test_breaker_opens_fails_fast_and_closes_after_trial(fake_clock):
+    """
+    실패 비율이 기준을 넘으면 회로가 열리고, 차단 시간 후 시험 요청이 성공하면 닫히는지 확인
+    """
+    breaker = CircuitBreaker(failure_rate=0.5, min_requests=4, open_seconds=10, slow_call_seconds=1.0, clock=fake_clock)
+    for success, elapsed in [(True, 0.1), (False, 0.1), (True, 5.0), (True, 0.1)]:
+        assert breaker.allow()
+        breaker.record(success, elapsed)
+    # 실패 1번 + 느린 응답 1번 = 50%
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow() and breaker.is_open()
+    assert breaker.retry_after() == 10
+
+    fake_clock.now = 10
+    assert breaker.allow()
+    assert not breaker.allow() and breaker.is_open()
+    breaker.record(True, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.get_stats()["opened"] == 1
+
+def test_open_circuit_serves_expired_result_and_refreshes(fake_clock, fake_gemini_client):
+    """
+    회로가 열려 있으면 만료된 이전 결과를 제공하고, 회로가 닫힌 뒤 백그라운드에서 다시 생성하는지 확인
+    """
+    breaker = CircuitBreaker(min_requests=1, open_seconds=10, clock=fake_clock)
+    client = fake_gemini_client(answers=["key"])
+    cache = ResultCache()
+    generator = GapfillGenerator(client, result_cache=cache, circuit_breaker=breaker)
+    generator.generate(SAMPLE_TEXT, ["foundation"])
+    calls = client.calls
+
+    # 캐시 만료 후 회로 열기
+    fingerprint = passage_fingerprint(SAMPLE_TEXT)
+    cache.get_entry((fingerprint, "tier", "foundation")).expires_at = 0
+    breaker.record(False)
+    result = generator.generate(SAMPLE_TEXT, ["foundation"])
+    assert result["stale"] is True
+    assert result["gapfill"]["tiers"]["foundation"]["answers"] == ["key"]
+    assert client.calls == calls
+
+    try:
+        generator.generate("An unseen passage.", ["foundation"])
+        assert False, "CircuitOpenError가 발생해야 합니다"
+    except CircuitOpenError as e:
+        assert e.retry_after == 10
+
+    # 회로가 half-open이 되면 대기 중인 갱신 실행
+    generator.refresh_queue.poll_interval = 0.01
+    fake_clock.now = 10
+    generator.refresh_queue.join()
+    assert client.calls > calls
+    assert cache.get((fingerprint, "tier", "foundation")) is not None
+
+def test_client_stops_calling_failing_api():
+    """
+    API 오류가 계속되면 GeminiClient가 요청을 보내지 않고 바로 실패하는지 확인 (스텁 서버)
+    """
+    server = start_stub_server(config=StubConfig(error_500_rate=1.0))
+    try:
+        breaker = CircuitBreaker(min_requests=3, open_seconds=60)
+        client = GeminiClient(api_key="stub-key", base_url=server.base_url, circuit_breaker=breaker)
+        for _ in range(5):
+            assert client.analyze_text(SAMPLE_TEXT) is None
+        assert server.stats["requests"] == 3
+        assert breaker.get_stats()["rejected"] == 2
+    finally:
+        server.shutdown()
+
+def _trip_before_gapfill(client, breaker):
+    """갭필 요청 직전에 회로가 열려 요청이 거절되게 함 (GeminiClient._post처럼 거절 시 None)"""
+    generate_gapfill = client.generate_gapfill
+
+    def tripping(text, analysis=None, tiers=None):
+        breaker.record(False)
+        if not breaker.allow():
+            return None
+        return generate_gapfill(text, analysis, tiers)
+
+    client.generate_gapfill = tripping
+
+def test_circuit_opening_mid_generation_serves_previous_result(fake_clock, fake_gemini_client):
+    """
+    생성 도중 회로가 열려 갭필 요청이 거절되면 빈 결과 대신 이전 결과(로컬 HTML 포함)를 제공하고,
+    이전 결과가 없으면 CircuitOpenError가 발생하는지 확인
+    """
+    breaker = CircuitBreaker(min_requests=1, open_seconds=10, clock=fake_clock)
+    client = fake_gemini_client(answers=["key"])
+    cache = ResultCache()
+    generator = GapfillGenerator(client, result_cache=cache, circuit_breaker=breaker)
+    generator.generate(SAMPLE_TEXT, ["foundation"])
+
+    fingerprint = passage_fingerprint(SAMPLE_TEXT)
+    cache.get_entry((fingerprint, "tier", "foundation")).expires_at = 0
+    _trip_before_gapfill(client, breaker)
+    # 저장된 HTML이 없는 시드도 로컬에서 만든 HTML을 반환
+    result = generator.generate(SAMPLE_TEXT, ["foundation"], seed=7)
+    assert result["stale"] is True
+    assert result["gapfill"]["tiers"]["foundation"]["answers"] == ["key"]
+    assert "foundation ___" in result["html"]
+
+    # 이전 결과가 없는 지문
+    breaker = CircuitBreaker(min_requests=1, open_seconds=10, clock=fake_clock)
+    client = fake_gemini_client()
+    _trip_before_gapfill(client, breaker)
+    try:
+        GapfillGenerator(client, circuit_breaker=breaker).generate(SAMPLE_TEXT, ["intermediate"])
+        assert False, "CircuitOpenError가 발생해야 합니다"
+    except CircuitOpenError:
+        pass
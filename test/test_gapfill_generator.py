@@ -0,0 +1,67 @@
+import sys
+import os
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generator.gapfill_generator import GapfillGenerator
+
+SAMPLE_TEXT = "Balance is key. Your gestures should highlight your words, not overshadow them."
+
+def test_generate_only_requested_tiers_and_reuse_cache(fake_gemini_client):
+    """
+    요청한 난이도만 생성하고, 이후 요청에서는 없는 난이도만 생성하는지 확인
+    """
+    client = fake_gemini_client()
+    generator = GapfillGenerator(client)
+
+    result = generator.generate(SAMPLE_TEXT, ["intermediate"])
+    assert client.gapfill_calls == [["intermediate"]]
+    assert list(result["gapfill"]["tiers"]) == ["intermediate"]
+    assert result["gapfill"]["korean_translation"] == "균형이 핵심이다."
+
+    result = generator.generate("  " + SAMPLE_TEXT.replace(" ", "\n", 1), ["expert", "intermediate"])
+    assert client.gapfill_calls == [["intermediate"], ["expert"]]
+    assert list(result["gapfill"]["tiers"]) == ["intermediate", "expert"]
+    assert result["html"] == "<html>intermediate,expert</html>"
+
+    # 같은 난이도 조합은 HTML까지 캐시에서 반환
+    generator.generate(SAMPLE_TEXT, ["intermediate", "expert"])
+    assert len(client.gapfill_calls) == 2 and client.html_calls == 2
+
+def test_unknown_tier_is_rejected(fake_gemini_client):
+    """
+    알 수 없는 난이도 요청 시 ValueError
+    """
+    generator = GapfillGenerator(fake_gemini_client())
+    try:
+        generator.generate(SAMPLE_TEXT, ["impossible"])
+    except ValueError as e:
+        assert "impossible" in str(e)
+    else:
+        assert False, "ValueError가 발생해야 합니다."
+
+def test_generate_variant_is_local_and_deterministic(fake_gemini_client):
+    """
+    변형 문제는 분석 한 번 이후 API 호출 없이 시드별로 결정적으로 생성되는지 확인
+    """
+    client = fake_gemini_client(words=[
+        {"word": "Balance", "category": "lexical", "difficulty": "basic", "educational_importance": "핵심 개념"},
+        {"word": "highlight", "category": "lexical", "difficulty": "basic"},
+        {"word": "overshadow", "category": "conceptual", "difficulty": "expert"},
+        {"word": "missing word", "difficulty": "basic"}
+    ])
+    generator = GapfillGenerator(client)
+
+    first = generator.generate_variant(SAMPLE_TEXT, seed=7)
+    again = generator.generate_variant(SAMPLE_TEXT, seed=7)
+    other = [generator.generate_variant(SAMPLE_TEXT, seed=seed)["gapfill"] for seed in range(20)]
+
+    assert len(client.analyze_calls) == 1 and not client.gapfill_calls and first["html"] is None
+    assert first["gapfill"] == again["gapfill"]
+    assert any(variant["tiers"]["foundation"]["shuffled_answers"] != first["gapfill"]["tiers"]["foundation"]["shuffled_answers"] for variant in other)
+
+    foundation = first["gapfill"]["tiers"]["foundation"]
+    assert sorted(foundation["answers"]) == ["Balance", "highlight"]
+    assert sorted(foundation["shuffled_answers"]) == sorted(foundation["answers"])
+    assert "(1) ______" in foundation["text"] and "overshadow" in foundation["text"]
+    assert first["gapfill"]["tiers"]["expert"]["answers"] == ["overshadow"]
@@ -0,0 +1,74 @@
+import sys
+import os
+import json
+import urllib.request
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.gemini_client import GeminiClient
+from api.gemini_stub_server import StubConfig, start_stub_server
+from generator.gapfill_generator import GapfillGenerator
+
+SAMPLE_TEXT = """
+Open-handed gestures, for example, can indicate honesty, creating an atmosphere of trust.
+You invite openness and collaboration when you speak with your palms facing up.
+Too many hand movements can distract from your message, drawing attention away from your words.
+"""
+
+def test_pipeline_runs_offline_against_stub():
+    """
+    스텁 서버로 분석 → 갭필 → HTML 전체 파이프라인이 네트워크 없이 동작하는지 확인
+    """
+    server = start_stub_server()
+    try:
+        client = GeminiClient(api_key="stub-key", base_url=server.base_url)
+        result = GapfillGenerator(client).generate(SAMPLE_TEXT, ["foundation", "expert"])
+
+        assert result["analysis"]["linguistic_analysis"]["words"]
+        assert set(result["gapfill"]["tiers"]) == {"foundation", "expert"}
+        assert "(1) ______" in result["gapfill"]["tiers"]["foundation"]["text"]
+        assert result["html"].startswith("<html>")
+        assert server.stats["requests"] == 3
+    finally:
+        server.shutdown()
+
+def test_stub_injects_errors_and_truncation():
+    """
+    429 응답과 출력 잘림(MAX_TOKENS) 주입 확인
+    """
+    server = start_stub_server(config=StubConfig(error_429_rate=1.0))
+    try:
+        client = GeminiClient(api_key="stub-key", base_url=server.base_url)
+        assert client.generate_content("hello") is None
+        assert server.stats["status_429"] == 1
+    finally:
+        server.shutdown()
+
+    server = start_stub_server(config=StubConfig(truncate_rate=1.0, seed=1))
+    try:
+        client = GeminiClient(api_key="stub-key", base_url=server.base_url)
+        response = client.analyze_text(SAMPLE_TEXT)
+        assert response["candidates"][0]["finishReason"] == "MAX_TOKENS"
+        assert response["usageMetadata"]["candidatesTokenCount"] > 0
+    finally:
+        server.shutdown()
+
+def test_stub_streaming_wire_format():
+    """
+    streamGenerateContent (SSE) 응답 형식 확인
+    """
+    server = start_stub_server()
+    try:
+        body = json.dumps({"contents": [{"role": "user", "parts": [{"text": "Summarize this passage please."}]}]}).encode()
+        request = urllib.request.Request(
+            f"{server.base_url}/models/stub-model:streamGenerateContent?alt=sse",
+            data=body,
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request) as response:
+            events = [line[6:] for line in response.read().decode().split("\r\n") if line.startswith("data: ")]
+        chunks = [json.loads(event) for event in events]
+        assert chunks[-1]["candidates"][0]["finishReason"] == "STOP"
+        assert "".join(chunk["candidates"][0]["content"]["parts"][0]["text"] for chunk in chunks)
+    finally:
+        server.shutdown()
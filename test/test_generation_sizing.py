@@ -0,0 +1,108 @@
+import sys
+import os
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.gemini_client import GeminiClient, finish_reason, is_valid_json_response, response_text
+from api.gemini_stub_server import start_stub_server
+from api.generation_sizing import GenerationSizer
+
+SAMPLE_TEXT = """
+Open-handed gestures, for example, can indicate honesty, creating an atmosphere of trust.
+You invite openness and collaboration when you speak with your palms facing up.
+"""
+
+def test_output_limit_scales_with_task_passage_and_tiers():
+    """
+    작업 유형, 지문 길이, 난이도 수에 따라 maxOutputTokens가 달라지는지 확인
+    """
+    sizer = GenerationSizer()
+    one_tier = sizer.config_for("generate_gapfill", 300, tiers=1)["maxOutputTokens"]
+    four_tiers = sizer.config_for("generate_gapfill", 300, tiers=4)["maxOutputTokens"]
+    assert one_tier < four_tiers <= 8192
+    assert sizer.config_for("analyze_text", 100)["maxOutputTokens"] < sizer.config_for("analyze_text", 300)["maxOutputTokens"]
+    assert sizer.config_for("generate_html_output", 100000)["maxOutputTokens"] == 8192
+    assert sizer.config_for("analyze_text", 100)["temperature"] < sizer.config_for("generate_gapfill", 100)["temperature"]
+
+def test_truncation_raises_future_limits():
+    """
+    잘린 응답이 관찰되면 이후 요청의 출력 한도가 늘어나는지 확인
+    """
+    sizer = GenerationSizer()
+    before = sizer.config_for("analyze_text", 200)["maxOutputTokens"]
+    estimated = sizer.estimate("analyze_text", 200)
+    sizer.observe("analyze_text", estimated, estimated, truncated=True, continuations=1)
+    assert sizer.config_for("analyze_text", 200)["maxOutputTokens"] > before
+    assert sizer.get_stats()["analyze_text"]["truncation_rate"] == 1.0
+
+def test_truncated_response_is_continued_from_cut_point():
+    """
+    MAX_TOKENS로 잘린 응답은 잘린 부분만 이어서 생성하여 전체 응답과 같은 텍스트가 되는지 확인 (스텁 서버)
+    """
+    server = start_stub_server()
+    try:
+        full = GeminiClient(api_key="stub-key", base_url=server.base_url).analyze_text(SAMPLE_TEXT)
+        requests_before = server.stats["requests"]
+
+        # 출력 한도를 실제 출력의 절반 정도로 제한
+        tight = GenerationSizer(headroom=0.1, min_tokens=full["usageMetadata"]["candidatesTokenCount"] // 2 + 1)
+        client = GeminiClient(api_key="stub-key", base_url=server.base_url, sizer=tight)
+        response = client.analyze_text(SAMPLE_TEXT)
+
+        assert server.stats["requests"] - requests_before == 2
+        assert finish_reason(response) == "STOP"
+        assert response["continuations"] == 1
+        assert response_text(response) == response_text(full)
+        assert is_valid_json_response(response)
+    finally:
+        server.shutdown()
+
+class ScriptedGeminiClient(GeminiClient):
+    """정해진 응답을 차례로 반환하는 클라이언트 (네트워크 요청 없음)"""
+
+    def __init__(self, responses, **kwargs):
+        super().__init__(api_key="stub-key", **kwargs)
+        self.responses = list(responses)
+
+    def _send(self, body, task, model):
+        return self.responses.pop(0)
+
+def test_continuation_without_candidates_keeps_partial_response(gemini_response):
+    """
+    이어서 생성한 응답에 후보가 없으면(promptFeedback 차단) 오류 없이 잘린 응답을 그대로 반환하는지 확인
+    """
+    partial = gemini_response('{"words": [', "MAX_TOKENS", {"candidatesTokenCount": 10})
+    blocked = {"promptFeedback": {"blockReason": "OTHER"}, "usageMetadata": {"promptTokenCount": 5}}
+    client = ScriptedGeminiClient([partial, blocked])
+    response = client.generate_content("prompt", task="analyze_text", model="gemini-test")
+    assert response_text(response) == '{"words": ['
+    assert finish_reason(response) == "MAX_TOKENS"
+
+def test_sizer_counts_thinking_tokens(gemini_response):
+    """
+    출력 크기 학습과 이어서 생성한 응답의 사용량 합산에 생각(thinking) 토큰이 포함되는지 확인
+    """
+    sizer = GenerationSizer()
+    client = ScriptedGeminiClient([
+        gemini_response('{"words": [', "MAX_TOKENS", {"candidatesTokenCount": 10, "thoughtsTokenCount": 300}),
+        gemini_response("]}", "STOP", {"candidatesTokenCount": 2, "thoughtsTokenCount": 100})
+    ], sizer=sizer)
+    response = client.generate_content("prompt", task="analyze_text", model="gemini-test")
+    assert response["usageMetadata"]["thoughtsTokenCount"] == 400
+    assert sizer.get_stats()["analyze_text"]["output_tokens"] == 412
+
+def test_thinking_budget_is_reserved_in_output_limit():
+    """
+    thinkingBudget을 함께 보내고 그만큼 maxOutputTokens에 더하며, 보정 계수는 생각 토큰을 뺀 출력으로 학습하는지 확인
+    """
+    sizer = GenerationSizer(thinking_budget=512)
+    plain = GenerationSizer(thinking_budget=-1)
+    config = sizer.config_for("analyze_text", 200)
+    assert config["thinkingConfig"] == {"thinkingBudget": 512}
+    assert config["maxOutputTokens"] == plain.config_for("analyze_text", 200)["maxOutputTokens"] + 512
+    assert "thinkingConfig" not in plain.config_for("analyze_text", 200)
+
+    estimated = sizer.estimate("analyze_text", 200)
+    sizer.observe("analyze_text", estimated, estimated + 500, thinking_tokens=500)
+    assert sizer.config_for("analyze_text", 200) == config
+    assert sizer.get_stats()["analyze_text"]["thinking_tokens"] == 500
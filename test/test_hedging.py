@@ -0,0 +1,90 @@
+import sys
+import os
+import threading
+import time
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.hedging import HedgingPolicy
+
+def _warm(policy, key, latency=0.01, count=10):
+    """지연 시간 측정값 채우기"""
+    for _ in range(count):
+        policy.observe(key, latency)
+
+def test_slow_request_is_hedged_and_hedge_wins():
+    """
+    백분위수보다 오래 걸리는 요청은 헤지 요청을 보내고, 먼저 끝난 응답을 사용하는지 확인
+    """
+    policy = HedgingPolicy(percentile=90, budget=1.0, min_samples=10)
+    _warm(policy, ("analyze_text", "m"))
+    calls = []
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            calls.append(len(calls))
+            attempt = len(calls)
+        time.sleep(0.5 if attempt == 1 else 0.01)
+        return {"attempt": attempt}
+
+    start = time.perf_counter()
+    assert policy.run("analyze_text", "m", call) == {"attempt": 2}
+    assert time.perf_counter() - start < 0.4
+    stats = policy.get_stats()["analyze_text"]
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+    assert stats["hedge_win_rate"] == 1.0
+
+def test_hedges_are_capped_by_budget():
+    """
+    예산을 다 쓰면 헤지 요청 없이 원래 요청을 기다리는지 확인
+    """
+    policy = HedgingPolicy(percentile=50, budget=0.5, min_samples=10)
+    _warm(policy, ("generate_gapfill", "m"), latency=0.001)
+    calls = []
+
+    def call():
+        calls.append(1)
+        time.sleep(0.03)
+        return {"ok": True}
+
+    for _ in range(4):
+        assert policy.run("generate_gapfill", "m", call) == {"ok": True}
+    stats = policy.get_stats()["generate_gapfill"]
+    # 요청 4번에 예산 0.5씩: 2번째, 4번째 요청만 헤지
+    assert stats["hedges"] == 2
+    assert stats["skipped_by_budget"] == 2
+    assert len(calls) == 6
+
+def test_hedging_is_opt_in():
+    """
+    GEMINI_HEDGE_PERCENTILE이 없으면 헤징을 사용하지 않는지 확인
+    """
+    assert HedgingPolicy.from_env({}) is None
+    policy = HedgingPolicy.from_env({"GEMINI_HEDGE_PERCENTILE": "99", "GEMINI_HEDGE_BUDGET": "0.1"})
+    assert policy.percentile == 99.0 and policy.budget == 0.1
+
+def test_hedged_call_records_request_usage():
+    """
+    헤징 정책이 작업 스레드에서 보낸 요청도 현재 요청의 타이밍/사용량(Server-Timing, X-Gapfill-Usage)에 기록되는지 확인 (스텁 서버)
+    """
+    from api.gemini_client import GeminiClient
+    from api.gemini_stub_server import start_stub_server
+    from monitoring.metrics import start_request_timings, stop_request_timings
+
+    server = start_stub_server()
+    try:
+        policy = HedgingPolicy(percentile=50, budget=1.0, min_samples=1)
+        client = GeminiClient(api_key="stub-key", base_url=server.base_url, hedging=policy)
+        # 첫 요청으로 지연 시간을 채워 이후 요청은 작업 스레드에서 실행
+        assert client.analyze_text("Balance is key.") is not None
+
+        timings, token = start_request_timings()
+        try:
+            assert client.analyze_text("Balance is key.") is not None
+        finally:
+            stop_request_timings(token)
+        assert timings.usage["prompt_tokens"] > 0 and timings.usage["bytes_received"] > 0
+        assert any(stage.startswith("gemini.") for stage, _ in timings.stages)
+    finally:
+        server.shutdown()
@@ -0,0 +1,59 @@
+import sys
+import os
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.gemini_client import GeminiClient
+from api.gemini_stub_server import StubConfig, start_stub_server
+from api.key_pool import KeyPool
+
+def test_pool_prefers_key_with_most_headroom_and_quarantines_throttled_keys(fake_clock):
+    """
+    여유가 가장 많은 키를 고르고, 429를 받은 키는 Retry-After 동안 사용하지 않는지 확인
+    """
+    pool = KeyPool(["key-aaaa", "key-bbbb"], requests_per_minute=10, tokens_per_minute=1000, clock=fake_clock)
+    first = pool.acquire()
+    pool.release(first)
+    pool.record_tokens(first, 900)
+    # 토큰을 많이 쓴 키는 피함
+    assert pool.acquire() != first
+
+    pool.throttled("key-bbbb", retry_after=5)
+    assert pool.acquire() == "key-aaaa"
+    assert not pool.has_available(exclude=["key-aaaa"])
+    fake_clock.now = 5
+    assert pool.has_available(exclude=["key-aaaa"])
+    assert pool.get_stats()["...bbbb"]["throttled"] == 1
+
+    # 1분이 지나면 사용량 초기화
+    fake_clock.now = 61
+    assert pool.get_stats()["...aaaa"]["tokens_last_minute"] == 0
+
+def test_keys_from_env():
+    """
+    GEMINI_API_KEYS의 여러 키를 읽고, 직접 지정한 키가 우선하는지 확인
+    """
+    environ = {"GEMINI_API_KEYS": "k1, k2,k3", "GEMINI_KEY_RPM": "60"}
+    pool = KeyPool.from_env(environ=environ)
+    assert pool.get_keys() == ["k1", "k2", "k3"]
+    assert pool.requests_per_minute == 60
+    assert KeyPool.from_env("explicit", environ=environ).get_keys() == ["explicit"]
+
+def test_throughput_scales_with_number_of_keys():
+    """
+    키별 분당 한도가 있을 때 키 수만큼 더 많은 요청이 성공하는지 확인 (스텁 서버)
+    """
+    server = start_stub_server(config=StubConfig(key_requests_per_minute=2))
+    try:
+        pool = KeyPool(["key-0001", "key-0002", "key-0003"])
+        client = GeminiClient(base_url=server.base_url, key_pool=pool)
+        results = [client.analyze_text("Balance is key.") for _ in range(7)]
+        assert all(result is not None for result in results[:6])
+        # 모든 키가 한도에 도달하면 키마다 한 번씩 429를 받은 뒤 실패
+        assert results[6] is None
+        assert server.stats["status_429"] == 3
+        stats = pool.get_stats()
+        assert [key_stats["requests"] for key_stats in stats.values()] == [2, 2, 2]
+        assert all(key_stats["tokens"] > 0 and key_stats["throttled"] == 1 for key_stats in stats.values())
+    finally:
+        server.shutdown()
@@ -0,0 +1,63 @@
+import sys
+import os
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.gemini_client import GeminiClient
+from api.gemini_stub_server import start_stub_server
+from monitoring.metrics import Metrics, metrics
+
+SAMPLE_TEXT = """
+Open-handed gestures, for example, can indicate honesty, creating an atmosphere of trust.
+You invite openness and collaboration when you speak with your palms facing up.
+"""
+
+def test_disabled_metrics_record_nothing():
+    """
+    비활성화된 레지스트리는 빈 측정 객체를 반환하고 아무것도 기록하지 않는지 확인
+    """
+    registry = Metrics(enabled=False)
+    with registry.span("stage"):
+        pass
+    registry.inc("counter")
+    assert registry.snapshot() == {}
+    assert registry.render_prometheus() == "\n"
+
+def test_gemini_usage_and_timing_headers(monkeypatch):
+    """
+    Gemini 호출의 토큰/바이트 사용량이 /metrics와 Server-Timing 헤더에 반영되는지 확인
+    """
+    server = start_stub_server()
+    try:
+        # 테스트가 끝나면 환경 변수 복원 (다음 테스트가 스텁 키로 실제 API를 호출하지 않도록)
+        monkeypatch.setenv("GEMINI_API_KEY", "stub-key")
+        monkeypatch.setenv("GEMINI_API_BASE_URL", server.base_url)
+        import web.app as web_app
+        web_app._components = None
+        client = web_app.app.test_client()
+
+        metrics.reset()
+        response = client.post("/api/analyze", json={"text": SAMPLE_TEXT}, headers={"X-Gapfill-Timing": "1"})
+        assert response.status_code == 200
+        assert "gemini.analyze_text;dur=" in response.headers["Server-Timing"]
+        assert "prompt_tokens=0" not in response.headers["X-Gapfill-Usage"]
+
+        # 요청 헤더가 없으면 타이밍 헤더도 없음
+        assert "Server-Timing" not in client.post("/api/analyze", json={"text": SAMPLE_TEXT}).headers
+
+        body = client.get("/metrics").get_data(as_text=True)
+        assert 'gapfill_gemini_prompt_tokens_total{task="analyze_text"}' in body
+        assert 'gapfill_stage_seconds_count{stage="analysis.linguistic"} 2' in body
+        assert 'gapfill_http_requests_total{endpoint="analyze",status="200"} 2' in body
+    finally:
+        web_app._components = None
+        server.shutdown()
+
+def test_client_counts_failed_requests():
+    """
+    실패한 Gemini 호출이 상태 코드별로 집계되는지 확인
+    """
+    metrics.reset()
+    client = GeminiClient(api_key="stub-key", base_url="http://127.0.0.1:9/v1beta")
+    assert client.generate_content("hello", task="probe") is None
+    assert metrics.snapshot()[("gapfill_gemini_requests_total", (("status", "error"), ("task", "probe")))] == 1
@@ -0,0 +1,81 @@
+import sys
+import os
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.gemini_client import GeminiClient, gapfill_validator
+from api.gemini_stub_server import start_stub_server
+from api.model_router import ModelRouter
+
+def test_router_reads_per_task_models_from_env():
+    """
+    작업별 모델과 cascade 설정을 환경 변수에서 읽는지 확인
+    """
+    router = ModelRouter.from_env({
+        "GEMINI_MODEL": "base-model",
+        "GEMINI_MODEL_GENERATE_HTML_OUTPUT": "flash-model",
+        "GEMINI_CASCADE_GENERATE_GAPFILL": "flash-model, pro-model"
+    })
+    assert router.model_for("analyze_text") == "base-model"
+    assert router.model_for("generate_html_output") == "flash-model"
+    assert router.cascade_for("generate_gapfill") == ["flash-model", "pro-model"]
+
+def test_cascade_escalates_only_when_validation_fails(gemini_response):
+    """
+    빠른 모델 결과가 검증에 실패한 경우에만 상위 모델을 호출하고 통계를 기록하는지 확인
+    """
+    router = ModelRouter(cascades={"generate_gapfill": ["flash", "pro"]})
+    validate = gapfill_validator(["foundation"])
+    calls = []
+    answers = {"flash": ['{"foundation": {"text": "___", "answers": []}}', '{"foundation": {"text": "___", "answers": ["key"]}}']}
+
+    def call(model):
+        calls.append(model)
+        if model == "pro":
+            return gemini_response('{"foundation": {"text": "___", "answers": ["key"]}}')
+        return gemini_response(answers["flash"].pop(0))
+
+    assert router.run("generate_gapfill", call, validate)["candidates"]
+    assert calls == ["flash", "pro"]
+    router.run("generate_gapfill", call, validate)
+    assert calls == ["flash", "pro", "flash"]
+
+    stats = router.get_stats()["generate_gapfill"]
+    assert stats["requests"] == 2 and stats["escalations"] == 1
+    assert stats["escalation_rate"] == 0.5
+    assert stats["accepted_by_model"] == {"pro": 1, "flash": 1}
+    assert set(stats["model_latency_seconds"]) == {"flash", "pro"}
+
+def test_client_sends_request_to_routed_model():
+    """
+    GeminiClient가 작업별로 선택된 모델의 URL로 요청하는지 확인 (스텁 서버)
+    """
+    server = start_stub_server()
+    try:
+        router = ModelRouter(models={"analyze_text": "flash-model"}, cascades={"generate_gapfill": ["flash-model", "pro-model"]})
+        client = GeminiClient(api_key="stub-key", base_url=server.base_url, router=router)
+        assert client.analyze_text("Balance is key.")["modelVersion"] == "flash-model"
+        assert client.generate_gapfill("Balance is key. Your gestures matter.", tiers=["foundation"])["modelVersion"] == "flash-model"
+    finally:
+        server.shutdown()
+
+def test_latency_saved_is_unknown_without_baseline(gemini_response):
+    """
+    빠른 모델이 항상 통과하여 마지막 모델의 지연 시간을 모를 때 절약한 시간을 0이 아닌 None으로 보고하고,
+    설정한 예상 지연 시간이 있으면 그 값을 기준으로 계산하는지 확인
+    """
+    validate = gapfill_validator(["foundation"])
+    call = lambda model: gemini_response('{"foundation": {"text": "___", "answers": ["key"]}}')
+
+    router = ModelRouter(cascades={"generate_gapfill": ["flash", "pro"]})
+    router.run("generate_gapfill", call, validate)
+    stats = router.get_stats()["generate_gapfill"]
+    assert stats["latency_saved_seconds"] is None and stats["net_latency_saved_seconds"] is None
+    assert stats["savings_unmeasured"] == 1
+
+    router = ModelRouter.from_env({"GEMINI_CASCADE_GENERATE_GAPFILL": "flash,pro", "GEMINI_MODEL_LATENCY": "pro=30, flash=8"})
+    assert router.baseline_latency == {"pro": 30.0, "flash": 8.0}
+    router.run("generate_gapfill", call, validate)
+    stats = router.get_stats()["generate_gapfill"]
+    assert 29 < stats["latency_saved_seconds"] <= 30
+    assert stats["savings_measured"] == 1
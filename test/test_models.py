@@ -0,0 +1,51 @@
+import sys
+import os
+import json
+import random
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generator.models import Passage, Tier, dumps_json
+
+LEGACY_RESULT = {
+    "tiers": {
+        "foundation": {
+            "text": "Balance is (1) ______.",
+            "blanks": ["(1)", "(2)"],
+            "answers": ["key", "words"],
+            "hints": [{"grammatical": "명사", "semantic": "핵심", "direct": "k..."}, "단순 힌트"]
+        }
+    },
+    "korean_translation": "균형이 핵심이다.",
+    "answer_key": ["key", "words"],
+    "cultural_notes": []
+}
+
+def test_passage_keeps_dict_shape():
+    """
+    결과 객체가 기존 dict 형식과 같은 값으로 조회/비교/직렬화되는지 확인
+    """
+    passage = Passage.from_dict(LEGACY_RESULT)
+    tier = passage["tiers"]["foundation"]
+    tier.shuffle(random.Random(1))
+
+    assert tier["hints"] == LEGACY_RESULT["tiers"]["foundation"]["hints"]
+    assert sorted(tier["shuffled_answers"]) == ["key", "words"]
+    assert tier.get("missing") is None and "seed" not in passage
+    assert [blank.answer for blank in tier.iter_blanks()] == ["key", "words"]
+
+    expected = json.loads(json.dumps(LEGACY_RESULT))
+    expected["tiers"]["foundation"]["shuffled_answers"] = tier.shuffled_answers
+    assert passage == expected
+    assert json.loads(dumps_json({"gapfill": passage})) == {"gapfill": expected}
+    assert " " not in dumps_json(Tier(answers=["a", "b"]))
+
+def test_api_serializes_result_model():
+    """
+    API 응답에서 결과 객체가 JSON으로 직렬화되는지 확인
+    """
+    from flask import json as flask_json
+    import web.app as web_app
+    with web_app.app.app_context():
+        data = flask_json.dumps({"gapfill": Passage.from_dict(LEGACY_RESULT)})
+    assert json.loads(data)["gapfill"]["tiers"]["foundation"]["answers"] == ["key", "words"]
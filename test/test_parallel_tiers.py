@@ -0,0 +1,70 @@
+import sys
+import os
+import json
+import time
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.gemini_client import GeminiClient, GAPFILL_TIERS
+from api.gemini_stub_server import StubConfig, start_stub_server
+from generator.gapfill_generator import GapfillGenerator, merge_tier_texts
+
+SAMPLE_TEXT = "Balance is key. If I were you, I would enjoy swimming to relax and read novels at night."
+
+def test_parallel_tiers_match_single_request_structure():
+    """
+    난이도별 요청을 동시에 보내 네 난이도가 모두 생성되고, 응답 시간이 한 번에 생성할 때보다 짧은지 확인 (스텁 서버)
+    """
+    server = start_stub_server(config=StubConfig(latency="fixed:0.3"))
+    try:
+        client = GeminiClient(api_key="stub-key", base_url=server.base_url)
+        generator = GapfillGenerator(client, parallel_tiers=True)
+        started = time.perf_counter()
+        result = generator.generate(SAMPLE_TEXT)
+        elapsed = time.perf_counter() - started
+
+        assert server.stats["task_gapfill"] == len(GAPFILL_TIERS)
+        gapfill = result["gapfill"]
+        for tier in GAPFILL_TIERS:
+            assert gapfill["tiers"][tier]["text"] and gapfill["tiers"][tier]["answers"]
+        assert gapfill["korean_translation"] == "(스텁 서버 번역)"
+        assert len(gapfill["answer_key"]) == len(GAPFILL_TIERS)
+        # 분석 + 갭필(동시 4건) + HTML = 지연 3번 (순서대로 보냈다면 6번)
+        assert elapsed < 1.5
+    finally:
+        server.shutdown()
+
+def test_merge_tier_texts_handles_raw_and_missing_responses():
+    """
+    JSON이 아닌 응답과 응답이 없는 난이도가 섞여 있어도 병합되는지 확인
+    """
+    merged = json.loads(merge_tier_texts({
+        "foundation": json.dumps({"foundation": {"text": "A ___", "answers": ["key"]}, "korean_translation": "번역"}),
+        "intermediate": "## 중급 단계\n\n### 빈칸 지문\nB ___\n\n### 정답\n1. relax",
+        "advanced": None
+    }))
+    assert merged["foundation"]["answers"] == ["key"]
+    assert merged["korean_translation"] == "번역"
+    assert merged["advanced"]["answers"] == []
+    assert merge_tier_texts({"foundation": None, "expert": None}) is None
+
+def test_tier_workers_follow_concurrency_settings():
+    """
+    난이도별 요청 스레드 수를 설정할 수 있고, 웹 앱 기본값이 동시에 생성하는 지문 수(수용 제어 + 배치) × 난이도 수인지 확인
+    """
+    generator = GapfillGenerator(GeminiClient(api_key="stub-key"), parallel_tiers=True, tier_workers=6)
+    assert generator._get_tier_executor()._max_workers == 6
+
+    import web.app as web_app
+    config = web_app.app.config
+    assert config["TIER_WORKERS"] == len(GAPFILL_TIERS) * (config["ADMISSION_CONCURRENCY"] + config["BATCH_MAX_CONCURRENCY"])
+
+def test_web_app_import_stays_lazy():
+    """
+    web.app을 import해도 Gemini 클라이언트와 requests를 불러오지 않는지 확인 (컴포넌트는 첫 사용 시 생성)
+    """
+    import subprocess
+    code = "import sys, web.app; print('api.gemini_client' in sys.modules, 'requests' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=root, text=True)
+    assert output.split()[-2:] == ["False", "False"]
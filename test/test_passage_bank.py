@@ -0,0 +1,55 @@
+import sys
+import os
+import tempfile
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.gemini_client import GeminiClient
+from api.gemini_stub_server import start_stub_server
+from cache.result_cache import passage_fingerprint
+from generator.gapfill_generator import GapfillGenerator
+from passage_bank.populate import populate, read_passages
+from passage_bank.store import CorpusStore
+
+SAMPLE_TEXT = """Open-handed gestures, for example, can indicate honesty, creating an atmosphere of trust.
+You invite openness and collaboration when you speak with your palms facing up."""
+
+class OfflineGeminiClient:
+    """API를 호출하면 실패하는 클라이언트 (코퍼스만으로 응답하는지 확인용)"""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"Gemini API 호출 발생: {name}")
+
+def test_fingerprint_ignores_whitespace_and_soft_hyphens():
+    """
+    줄바꿈/들여쓰기와 소프트 하이픈 차이는 같은 지문으로 취급
+    """
+    assert passage_fingerprint("atmo­sphere of\n  trust") == passage_fingerprint("atmosphere of trust")
+
+def test_populated_corpus_answers_without_api_calls():
+    """
+    오프라인으로 채운 코퍼스에 있는 지문은 API 호출 없이 생성되는지 확인
+    """
+    server = start_stub_server()
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "passages.txt")
+        with open(input_path, 'w', encoding='utf-8') as f:
+            f.write(SAMPLE_TEXT + "\n---\nBalance is key. Your gestures should highlight your words.\n")
+
+        store = CorpusStore(os.path.join(directory, "corpus.db"))
+        try:
+            passages = read_passages([directory])
+            assert len(passages) == 2
+            summary = populate(store, passages, gemini_client=GeminiClient(api_key="stub-key", base_url=server.base_url))
+            assert summary == {"total": 2, "completed": 2, "failed": 0}
+            assert len(store) == 2
+        finally:
+            server.shutdown()
+
+        generator = GapfillGenerator(OfflineGeminiClient(), text_analyzer=object(), corpus_store=store)
+        result = generator.generate(SAMPLE_TEXT.replace("\n", " ").replace("atmosphere", "atmo­sphere"))
+        assert list(result["gapfill"]["tiers"]) == ["foundation", "intermediate", "advanced", "expert"]
+        assert result["gapfill"]["tiers"]["foundation"]["answers"]
+        assert result["html"].startswith("<html>")
+        assert store.get_grammar(passage_fingerprint(SAMPLE_TEXT))["gerunds"]
+        store.close()
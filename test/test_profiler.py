@@ -0,0 +1,66 @@
+import sys
+import os
+import tempfile
+import time
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from monitoring.profiler import ProfileStore, SamplingProfiler
+
+def _busy_wait(seconds):
+    """샘플링 대상 함수"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def test_profiler_collects_collapsed_stacks():
+    """
+    샘플링 결과가 호출 함수를 포함한 collapsed stack 형식으로 저장되는지 확인
+    """
+    profiler = SamplingProfiler(interval=0.001).start()
+    _busy_wait(0.05)
+    profiler.stop()
+
+    assert profiler.samples > 0
+    line = profiler.collapsed().splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert "_busy_wait (test_profiler.py:" in stack
+    assert int(count) > 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ProfileStore(directory, max_profiles=2)
+        profile_ids = [store.save(profiler, "gapfill") for _ in range(3)]
+        assert [meta["id"] for meta in store.list()] == profile_ids[:0:-1]
+        assert store.path(profile_ids[-1]).endswith(".folded")
+        assert store.path("../" + profile_ids[-1]) is None
+
+def test_profile_endpoints(monkeypatch):
+    """
+    X-Gapfill-Profile 헤더로 요청을 프로파일링하고 목록/다운로드 엔드포인트로 조회되는지 확인
+    """
+    import web.app as web_app
+    client = web_app.app.test_client()
+    with tempfile.TemporaryDirectory() as directory:
+        # 모듈 전역 설정은 테스트가 끝나면 복원 (다른 테스트가 삭제된 디렉토리에 저장하지 않도록)
+        monkeypatch.setattr(web_app.profile_store, "directory", directory)
+        # 기본값에서는 헤더로 프로파일링할 수 없음
+        assert "X-Gapfill-Profile" not in client.get("/metrics", headers={"X-Gapfill-Profile": "1"}).headers
+        monkeypatch.setitem(web_app.app.config, 'PROFILE_ALLOW_HEADER', True)
+
+        response = client.get("/metrics", headers={"X-Gapfill-Profile": "1"})
+        profile_id = response.headers["X-Gapfill-Profile"]
+
+        profiles = client.get("/api/profiles").get_json()["profiles"]
+        assert profiles[0]["id"] == profile_id
+        assert profiles[0]["path"] == "/metrics"
+
+        assert client.get(f"/api/profiles/{profile_id}").status_code == 200
+        assert client.get("/api/profiles/missing").status_code == 404
+        assert "X-Gapfill-Profile" not in client.get("/metrics").headers
+
+        # 토큰을 설정하면 헤더 값과 조회 요청의 토큰이 일치해야 함
+        monkeypatch.setitem(web_app.app.config, 'PROFILE_TOKEN', "secret")
+        assert "X-Gapfill-Profile" not in client.get("/metrics", headers={"X-Gapfill-Profile": "1"}).headers
+        assert "X-Gapfill-Profile" in client.get("/metrics", headers={"X-Gapfill-Profile": "secret"}).headers
+        assert client.get("/api/profiles").status_code == 403
+        assert client.get("/api/profiles", headers={"X-Gapfill-Profile-Token": "secret"}).status_code == 200
@@ -0,0 +1,94 @@
+import sys
+import os
+import random
+import re
+import time
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generator.gapfill_generator import GapfillGenerator
+from generator.section_parser import parse_sections
+
+HEADINGS = [
+    "Foundation Tier", "Intermediate Tier", "Advanced Tier", "Expert Tier",
+    "Text:", "Blanks:", "Answers:", "Hints:", "Korean Translation:", "Answer Key:", "Cultural Notes:"
+]
+
+FRAGMENTS = ["balance", "(1)", "  ", "\n", "\n\n", "Tier", "Text", "Answer", "Key:", ":", "빈칸", "Hint", "Expert", "\t"]
+
+def legacy_parse(raw_result):
+    """
+    기존 정규식 단계별 파서 (비교 기준)
+    """
+    result = {
+        "tiers": {tier: {"text": "", "blanks": [], "answers": [], "hints": []} for tier in ["foundation", "intermediate", "advanced", "expert"]},
+        "korean_translation": "",
+        "answer_key": [],
+        "cultural_notes": []
+    }
+    tier_patterns = {
+        "foundation": r"Foundation Tier.*?(?=Intermediate Tier|$)",
+        "intermediate": r"Intermediate Tier.*?(?=Advanced Tier|$)",
+        "advanced": r"Advanced Tier.*?(?=Expert Tier|$)",
+        "expert": r"Expert Tier.*?(?=$)"
+    }
+    for tier, pattern in tier_patterns.items():
+        tier_match = re.search(pattern, raw_result, re.DOTALL)
+        if tier_match:
+            tier_content = tier_match.group(0)
+            for field, label, pattern in [
+                ("text", "Text:", r"Text:.*?(?=Blanks:|$)"),
+                ("blanks", "Blanks:", r"Blanks:.*?(?=Answers:|$)"),
+                ("answers", "Answers:", r"Answers:.*?(?=Hints:|$)"),
+                ("hints", "Hints:", r"Hints:.*?(?=$)")
+            ]:
+                match = re.search(pattern, tier_content, re.DOTALL)
+                if match:
+                    content = match.group(0).replace(label, "").strip()
+                    result["tiers"][tier][field] = content if field == "text" else [line.strip() for line in content.split("\n") if line.strip()]
+    for field, label, pattern in [
+        ("korean_translation", "Korean Translation:", r"Korean Translation:.*?(?=Answer Key:|$)"),
+        ("answer_key", "Answer Key:", r"Answer Key:.*?(?=Cultural Notes:|$)"),
+        ("cultural_notes", "Cultural Notes:", r"Cultural Notes:.*?(?=$)")
+    ]:
+        match = re.search(pattern, raw_result, re.DOTALL)
+        if match:
+            content = match.group(0).replace(label, "").strip()
+            result[field] = content if field == "korean_translation" else [line.strip() for line in content.split("\n") if line.strip()]
+    return result
+
+def _structured(generator, raw_result):
+    """구조화 결과에서 무작위 선택지 순서 제외"""
+    result = generator._structure_gapfill_result({"raw_result": raw_result}).to_dict()
+    for tier in result["tiers"].values():
+        tier.pop("shuffled_answers")
+    return result
+
+def test_fuzz_matches_legacy_regex_parser():
+    """
+    제목 순서가 뒤섞이거나 빠지고 반복된 응답에서도 기존 정규식 파서와 같은 결과인지 확인
+    """
+    generator = GapfillGenerator(gemini_client=object(), text_analyzer=object())
+    rng = random.Random(1234)
+    for _ in range(500):
+        pieces = [rng.choice(HEADINGS if rng.random() < 0.4 else FRAGMENTS) for _ in range(rng.randint(0, 40))]
+        raw_result = "".join(piece + rng.choice(["", " ", "\n"]) for piece in pieces)
+        assert _structured(generator, raw_result) == legacy_parse(raw_result), raw_result
+
+def test_large_malformed_response_is_linear():
+    """
+    닫는 제목이 없는 긴 응답도 선형 시간에 파싱되는지 확인
+    """
+    sections = ["Foundation Tier", "Text: " + "word " * 20000, "Blanks:", "(1)\n" * 20000, "Hints:" * 5000]
+    raw_result = "\n".join(sections * 5)
+
+    start = time.perf_counter()
+    result = parse_sections(raw_result)
+    elapsed = time.perf_counter() - start
+
+    # Answers: 제목이 없으므로 빈칸 목록은 응답 끝까지 이어짐
+    legacy = legacy_parse(raw_result)["tiers"]["foundation"]
+    assert result["tiers"]["foundation"]["blanks"] == legacy["blanks"]
+    assert result["tiers"]["foundation"]["text"] == legacy["text"]
+    assert "intermediate" not in result["tiers"]
+    assert elapsed < 1.0
@@ -0,0 +1,70 @@
+import sys
+import os
+import json
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generator.gapfill_generator import GapfillGenerator
+from generator.models import dumps_json
+
+SAMPLE_TEXT = "Balance is key. If I were you, I would enjoy swimming to relax."
+# 정답이 여러 개여야 시드별 선택지 순서가 달라짐
+ANSWERS = ["balance", "key", "enjoy", "swimming", "relax", "would"]
+
+def test_same_passage_and_seed_give_identical_bytes(fake_gemini_client):
+    """
+    캐시가 다른 두 생성기에서도 같은 지문과 시드는 같은 결과를, 다른 시드는 다른 선택지 순서를 반환하는지 확인
+    """
+    first = GapfillGenerator(fake_gemini_client(answers=ANSWERS)).generate(SAMPLE_TEXT, ["foundation"])
+    second = GapfillGenerator(fake_gemini_client(answers=ANSWERS)).generate(SAMPLE_TEXT, ["foundation"])
+    assert dumps_json(first["gapfill"]) == dumps_json(second["gapfill"])
+    assert first["gapfill"]["seed"] == 0
+
+    generator = GapfillGenerator(fake_gemini_client(answers=ANSWERS))
+    orders = {
+        tuple(generator.generate(SAMPLE_TEXT, ["foundation"], seed)["gapfill"]["tiers"]["foundation"]["shuffled_answers"])
+        for seed in range(5)
+    }
+    assert len(orders) > 1
+    again = generator.generate(SAMPLE_TEXT, ["foundation"], 3)["gapfill"]
+    assert again["seed"] == 3
+    assert dumps_json(again) == dumps_json(generator.generate(SAMPLE_TEXT, ["foundation"], 3)["gapfill"])
+
+def test_api_returns_etag_and_not_modified(fake_gemini_client):
+    """
+    /api/gapfill이 ETag를 붙이고, 같은 요청에 If-None-Match를 보내면 304를 반환하는지 확인
+    """
+    import web.app as web_app
+    web_app._components = {"gapfill_generator": GapfillGenerator(fake_gemini_client(answers=ANSWERS))}
+    try:
+        client = web_app.app.test_client()
+        body = {"text": SAMPLE_TEXT, "tiers": ["foundation"], "seed": "7"}
+        response = client.post("/api/gapfill", json=body)
+        assert response.status_code == 200
+        assert response.get_json()["gapfill"]["seed"] == 7
+        etag = response.headers["ETag"]
+
+        cached = client.post("/api/gapfill", json=body, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.data == b""
+
+        other = client.post("/api/gapfill", json=dict(body, seed=8), headers={"If-None-Match": etag})
+        assert other.status_code == 200 and other.headers["ETag"] != etag
+    finally:
+        web_app._components = None
+
+def test_generate_returns_plain_dicts_by_default(fake_gemini_client):
+    """
+    generate()의 gapfill이 기본적으로 기존 dict 형식이어서 json.dumps와 항목 대입이 되고,
+    as_model=True이면 같은 내용의 Passage 객체를 반환하는지 확인
+    """
+    generator = GapfillGenerator(fake_gemini_client(answers=ANSWERS))
+    result = generator.generate(SAMPLE_TEXT, ["foundation"])
+    assert isinstance(result["gapfill"], dict)
+    assert json.loads(json.dumps(result["gapfill"]))["tiers"]["foundation"]["answers"][0] == "balance"
+    result["gapfill"]["tiers"]["foundation"]["text"] = "수정한 지문"
+
+    model = generator.generate(SAMPLE_TEXT, ["foundation"], as_model=True)["gapfill"]
+    assert model.tiers["foundation"].text == "foundation ___"
+    assert dumps_json(model) == dumps_json(generator.generate(SAMPLE_TEXT, ["foundation"])["gapfill"])
+    assert isinstance(generator.generate_variant(SAMPLE_TEXT, seed=1)["gapfill"], dict)
@@ -0,0 +1,65 @@
+import sys
+import os
+import json
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.text_analyzer import TextAnalyzer, split_sentences
+from benchmarks.corpus import CSAT_PASSAGES
+from cache.result_cache import passage_fingerprint
+from generator.gapfill_generator import GapfillGenerator
+from passage_bank.similarity import SimilarityIndex
+
+class RecordingGeminiClient:
+    """analyze_text 호출을 기록하고 문장별 마지막 단어를 분석 결과로 돌려주는 가짜 클라이언트"""
+
+    def __init__(self):
+        self.calls = []
+
+    def analyze_text(self, text):
+        self.calls.append(text)
+        words = [{"word": sentence.split()[-1].strip(".!?"), "difficulty": "medium"} for sentence in split_sentences(text)]
+        return {"candidates": [{"content": {"parts": [{"text": json.dumps({"words": words})}]}}]}
+
+def test_index_finds_edited_passages_only():
+    """
+    오타 수정, 줄바꿈 변경, 마지막 문장 삭제는 유사 지문으로 찾고 다른 지문은 찾지 않는지 확인
+    """
+    index = SimilarityIndex()
+    for passage in CSAT_PASSAGES[:4]:
+        index.add(passage_fingerprint(passage), passage)
+
+    original = CSAT_PASSAGES[0]
+    key = passage_fingerprint(original)
+    edits = [
+        original.replace("gestures", "gestrues", 1),
+        original.replace("\n", "\n\n    "),
+        " ".join(split_sentences(original)[:-1])
+    ]
+    for edited in edits:
+        match = index.query(edited)
+        assert match is not None and match[0] == key
+
+    assert index.query(CSAT_PASSAGES[5]) is None
+    assert index.query(original, exclude=key) is None
+
+def test_generator_reanalyzes_only_changed_sentences():
+    """
+    유사 지문의 분석 결과를 재사용하고 달라진 문장만 Gemini로 분석하는지 확인
+    """
+    client = RecordingGeminiClient()
+    generator = GapfillGenerator(client, TextAnalyzer(client), similarity_index=SimilarityIndex())
+
+    original = CSAT_PASSAGES[0]
+    generator._get_analysis(original, passage_fingerprint(original))
+    assert len(client.calls) == 1
+
+    sentences = split_sentences(original)
+    edited = " ".join(sentences[:3] + ["Closed fists, however, can signal tension."] + sentences[4:-1])
+    analysis = generator._get_analysis(edited, passage_fingerprint(edited))
+
+    assert client.calls[1] == "Closed fists, however, can signal tension."
+    words = [entry["word"] for entry in analysis["linguistic_analysis"]["words"]]
+    assert "tension" in words and "trust" in words
+    assert "up" not in words and "them" not in words
+    assert analysis["basic_stats"]["word_count"] == len(edited.replace(",", "").replace(".", "").split())
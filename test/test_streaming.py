@@ -0,0 +1,52 @@
+import sys
+import os
+import io
+import json
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from passage_bank.ingest import iter_lines, split_passages
+from web.batch import BatchRunner
+
+def test_split_passages_reads_stream_in_chunks():
+    """
+    조각 경계에 걸친 한글/CRLF를 처리하고 지문 단위로 나누는지 확인
+    """
+    body = "첫 번째 지문입니다.\r\nSecond line.\r\n---\r\n두 번째 지문.\r\n\r\nStill second.\r\n---\r\n\r\n".encode("utf-8")
+    lines = list(iter_lines(io.BytesIO(body), chunk_size=5))
+    assert "".join(lines) == body.decode("utf-8")
+
+    assert list(split_passages(lines)) == ["첫 번째 지문입니다.\r\nSecond line.", "두 번째 지문.\r\n\r\nStill second."]
+    assert list(split_passages(lines, paragraph=True))[1:] == ["두 번째 지문.", "Still second."]
+
+    try:
+        list(split_passages(iter_lines(io.BytesIO(b"word " * 100), chunk_size=16, max_line_chars=50), max_chars=50))
+        assert False, "긴 입력은 ValueError가 발생해야 함"
+    except ValueError:
+        pass
+
+def test_run_iter_reads_input_incrementally():
+    """
+    처리 중인 지문 수만큼만 입력을 미리 읽고, 입력 오류는 요약 줄에 보고하는지 확인
+    """
+    finished = []
+    in_flight = []
+
+    def passages():
+        for index in range(6):
+            # 다음 지문을 읽는 시점에 처리 중인 지문 수
+            in_flight.append(index - len(finished))
+            yield f"passage {index}"
+        raise ValueError("too long")
+
+    def worker(text):
+        finished.append(text)
+        return {"length": len(text)}
+
+    runner = BatchRunner(max_concurrency=2)
+    lines = [json.loads(line) for line in runner.stream_iter(passages(), worker)]
+
+    assert max(in_flight) < 2
+    assert sorted(line["indices"][0] for line in lines[:-1]) == list(range(6))
+    assert all(line["success"] for line in lines[:-1])
+    assert lines[-1] == {"done": True, "total": 6, "failed": 0, "error": "too long"}
@@ -0,0 +1,48 @@
+import sys
+import os
+import json
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.text_analyzer import TextAnalyzer
+
+def test_analyze_batch_splits_combined_response(fake_gemini_client):
+    """
+    배치 응답을 지문별 결과로 나누는지 확인
+    """
+    def payload(passages):
+        return "```json\n" + json.dumps({pid: {"words": [{"word": text.split()[0]}]} for pid, text in passages}) + "\n```"
+
+    client = fake_gemini_client(batch_payload=payload)
+    analyzer = TextAnalyzer(client, max_batch_size=3)
+    results = analyzer.analyze_batch(["alpha one.", "beta two.", "gamma three."])
+
+    assert len(client.batch_calls) == 1 and not client.analyze_calls
+    assert [r["linguistic_analysis"]["words"][0]["word"] for r in results] == ["alpha", "beta", "gamma"]
+    assert results[0]["basic_stats"]["word_count"] == 2
+    assert analyzer.get_batch_stats()["passages_per_call"] == 3
+
+def test_analyze_batch_falls_back_for_missing_passages(fake_gemini_client):
+    """
+    응답에서 빠진 지문이나 파싱 실패 시 단일 호출로 대체하는지 확인
+    """
+    client = fake_gemini_client(batch_payload=lambda passages: json.dumps({"p1": {"words": []}}), words=[{"word": "single"}])
+    analyzer = TextAnalyzer(client)
+    results = analyzer.analyze_batch(["first passage", "second passage"])
+
+    assert client.analyze_calls == ["second passage"]
+    assert results[1]["linguistic_analysis"]["words"][0]["word"] == "single"
+
+    client = fake_gemini_client(batch_payload=lambda passages: "not json at all")
+    analyzer = TextAnalyzer(client)
+    analyzer.analyze_batch(["first passage", "second passage"])
+    assert client.analyze_calls == ["first passage", "second passage"]
+
+def test_pack_passages_respects_token_budget(fake_gemini_client):
+    """
+    토큰 예산과 최대 지문 수에 맞게 묶는지 확인
+    """
+    analyzer = TextAnalyzer(fake_gemini_client(), batch_token_budget=100, max_batch_size=2)
+    groups = analyzer.pack_passages(["a" * 200, "b" * 200, "c" * 40, "d" * 40, "e" * 40])
+
+    assert [len(group) for group in groups] == [1, 2, 2]
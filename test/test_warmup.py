@@ -0,0 +1,61 @@
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.gemini_client import GeminiClient
+from api.gemini_stub_server import start_stub_server
+from analysis.text_analyzer import TextAnalyzer
+from generator.gapfill_generator import GapfillGenerator
+from optimization.korean_learner_optimization import KoreanLearnerOptimization
+from passage_bank.store import CorpusStore
+from passage_bank.warmup import WarmupScheduler, next_window_start, parse_window, window_seconds
+
+PASSAGES = [
+    ("Balance is key. Your gestures should highlight your words.", "q18"),
+    ("Open-handed gestures can indicate honesty, creating an atmosphere of trust.", "q19"),
+    ("If I were you, I would enjoy swimming to relax.", "q20")
+]
+
+def test_off_peak_window_arithmetic():
+    """
+    자정을 넘는 시간대와 마감까지 남은 작업 가능 시간 계산 확인
+    """
+    night = parse_window("22:00-06:00")
+    assert next_window_start(datetime(2026, 11, 1, 12, 0), night) == datetime(2026, 11, 1, 22, 0)
+    assert next_window_start(datetime(2026, 11, 1, 3, 0), night) == datetime(2026, 11, 1, 3, 0)
+    assert window_seconds(datetime(2026, 11, 1, 12, 0), datetime(2026, 11, 3, 0, 0), parse_window("01:00-06:00")) == 5 * 3600
+
+def test_scheduler_spreads_work_within_budget_and_rewarms_old_results(fake_clock):
+    """
+    한가한 시간대까지 기다린 뒤 할당량만큼 나누어 생성하고, 유효 기간이 끝나가는 결과는 다시 생성하는지 확인
+    """
+    server = start_stub_server()
+    with tempfile.TemporaryDirectory() as directory:
+        store = CorpusStore(os.path.join(directory, "corpus.db"))
+        try:
+            client = GeminiClient(api_key="stub-key", base_url=server.base_url)
+            analyzer = TextAnalyzer(client)
+            fake_clock.now = datetime(2026, 11, 1, 12, 0)
+            scheduler = WarmupScheduler(
+                store, GapfillGenerator(client, analyzer, corpus_store=store), KoreanLearnerOptimization(client),
+                deadline=datetime(2026, 11, 3, 0, 0), window=parse_window("01:00-06:00"), budget=2, tiers=["foundation"],
+                max_age=7 * 86400, rewarm_before=86400, refresh_generator=GapfillGenerator(client, analyzer),
+                clock=fake_clock, sleep=fake_clock.sleep
+            )
+            summary = scheduler.run(PASSAGES)
+            assert summary["completed"] == 2 and summary["deferred"] == 1 and summary["fresh"] == 0
+            # 01:00까지 13시간 대기 후, 남은 5시간을 두 지문에 나누어 2.5시간 간격
+            assert fake_clock.sleeps == [13 * 3600, 2.5 * 3600]
+            assert len(store) == 2
+
+            # 6.5일 뒤: 저장하지 못한 지문이 먼저, 유효 기간(7일)이 하루 안으로 남은 지문은 다시 생성 대상
+            fake_clock.now = datetime.now() + timedelta(days=6, hours=12)
+            assert [(source, reason) for _, source, reason in scheduler.plan(PASSAGES)] == [
+                ("q20", "missing"), ("q18", "expiring"), ("q19", "expiring")
+            ]
+        finally:
+            store.close()
+            server.shutdown()
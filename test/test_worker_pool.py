@@ -0,0 +1,35 @@
+import sys
+import os
+
+# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generator.gapfill_generator import GapfillGenerator, structure_gapfill_text
+from generator.worker_pool import PostProcessPool
+from optimization.korean_learner_optimization import KoreanLearnerOptimization
+
+SAMPLE_TEXT = "Balance is key. If I were you, I would enjoy swimming to relax."
+
+def test_pool_matches_inline_post_processing(fake_gemini_client):
+    """
+    프로세스 풀의 구조화/문법 분석/HTML 최적화 결과가 현재 프로세스에서 실행한 결과와 같은지 확인
+    """
+    optimizer = KoreanLearnerOptimization()
+    raw = "Foundation Tier\nText: Balance is ___.\nBlanks:\n(1)\nAnswers:\nkey\nHints:\nk...\nKorean Translation: 균형이 핵심이다."
+    html = '<html><body><div class="answer-key"></div></body></html>'
+
+    pool = PostProcessPool(processes=1)
+    try:
+        structured = pool.structure(raw, ["foundation"])
+        assert structured.to_dict()["tiers"]["foundation"]["answers"] == ["key"]
+        assert structured.korean_translation == "균형이 핵심이다."
+        assert structure_gapfill_text(raw, ["foundation"])["tiers"]["foundation"]["text"] == structured["tiers"]["foundation"]["text"]
+
+        assert pool.analyze_grammar(SAMPLE_TEXT) == dict(optimizer._analyze_grammar_elements(SAMPLE_TEXT))
+        assert pool.optimize_html(html) == optimizer.optimize_html_output(html)
+
+        generator = GapfillGenerator(fake_gemini_client(answers=["key", "balance"], hints=[{"direct": "k..."}, "b"]), worker_pool=pool)
+        result = generator.generate(SAMPLE_TEXT, ["expert"])
+        assert sorted(result["gapfill"]["tiers"]["expert"]["shuffled_answers"]) == ["balance", "key"]
+        assert result["gapfill"]["tiers"]["expert"]["hints"] == [{"direct": "k..."}, "b"]
+    finally:
+        pool.shutdown()
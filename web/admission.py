@@ -0,0 +1,236 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from monitoring.metrics import metrics
+
+# 요청 우선순위 (값이 작을수록 먼저 처리)
+PRIORITIES = {"interactive": 0, "bulk": 1}
+
+class AdmissionRejected(RuntimeError):
+    """
+    서버가 처리할 수 있는 양을 넘어 요청을 받지 않을 때 발생하는 예외
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class _Ticket:
+    """대기 중인 요청 하나"""
+    __slots__ = ("priority", "sequence", "enqueued_at", "admitted", "shed", "patient")
+
+    def __init__(self, priority, sequence, enqueued_at, patient=False):
+        self.priority = priority
+        self.sequence = sequence
+        self.enqueued_at = enqueued_at
+        self.admitted = False
+        self.shed = False
+        self.patient = patient
+
+    def __lt__(self, other):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+class AdmissionController:
+    """
+    웹 요청 수용 제어기
+    동시에 처리하는 요청 수를 제한하고, 나머지는 우선순위 대기열(교사의 대화형 요청 → 일괄 작업)에서 기다리게 하며,
+    대기열이 가득 찼거나 예상 대기 시간이 너무 길면 기다리지 않고 바로 거절 (503 + Retry-After)
+    """
+
+    def __init__(self, max_concurrency=8, max_queue=32, max_wait=20.0, initial_service_time=5.0, alpha=0.2, clock=time.monotonic):
+        """
+        AdmissionController 초기화
+
+        Args:
+            max_concurrency (int): 동시에 처리할 최대 요청 수
+            max_queue (int): 최대 대기 요청 수
+            max_wait (float): 최대 대기 시간(초) (예상 대기 시간이 이보다 길면 바로 거절, 기다리다 초과해도 거절)
+            initial_service_time (float): 처리 시간 기록이 없을 때 사용할 요청 하나의 처리 시간(초)
+            alpha (float): 평균 처리 시간(지수 이동 평균)의 가중치
+            clock (callable): 현재 시각 함수 (테스트용)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self.alpha = alpha
+        self.clock = clock
+        self._service_time = initial_service_time
+        self._in_flight = 0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stats = {"admitted": 0, "queued": 0, "rejected": 0, "shed": 0, "timed_out": 0}
+
+    def _estimated_wait(self, ahead):
+        """
+        앞에 있는 요청 수로 예상 대기 시간 계산 (잠금을 잡은 상태에서 호출)
+
+        Args:
+            ahead (int): 먼저 처리될 대기 요청 수
+
+        Returns:
+            float: 예상 대기 시간(초)
+        """
+        if self._in_flight + ahead < self.max_concurrency:
+            return 0.0
+        rounds = (self._in_flight + ahead - self.max_concurrency) // self.max_concurrency + 1
+        return rounds * self._service_time
+
+    def estimated_wait(self, priority="interactive"):
+        """
+        지금 요청하면 처리를 시작할 때까지의 예상 대기 시간
+
+        Args:
+            priority (str): 요청 우선순위 (interactive, bulk)
+
+        Returns:
+            float: 예상 대기 시간(초)
+        """
+        rank = PRIORITIES[priority]
+        with self._condition:
+            return self._estimated_wait(sum(1 for ticket in self._waiting if ticket.priority <= rank))
+
+    def _reject(self, priority, reason, retry_after):
+        """거절 기록 후 예외 생성 (잠금을 잡은 상태에서 호출)"""
+        self._stats["timed_out" if reason == "timeout" else "rejected"] += 1
+        metrics.inc("gapfill_admission_rejected_total", priority=priority, reason=reason)
+        return AdmissionRejected(
+            "요청이 많아 지금은 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            max(1, math.ceil(retry_after))
+        )
+
+    def _shed_lower_priority(self, rank):
+        """
+        대기열이 가득 찼을 때 더 낮은 우선순위의 가장 최근 대기 요청을 내보냄 (잠금을 잡은 상태에서 호출)
+
+        Returns:
+            bool: 자리를 비웠으면 True
+        """
+        victims = [ticket for ticket in self._waiting if ticket.priority > rank and not ticket.patient]
+        if not victims:
+            return False
+        victim = max(victims)
+        victim.shed = True
+        self._waiting.remove(victim)
+        heapq.heapify(self._waiting)
+        self._stats["shed"] += 1
+        self._condition.notify_all()
+        return True
+
+    def _dispatch(self):
+        """빈 자리만큼 대기열 앞의 요청 처리 시작 (잠금을 잡은 상태에서 호출)"""
+        while self._waiting and self._in_flight < self.max_concurrency:
+            ticket = heapq.heappop(self._waiting)
+            ticket.admitted = True
+            self._in_flight += 1
+        self._condition.notify_all()
+
+    def acquire(self, priority="interactive", wait=False):
+        """
+        요청 처리 자리 확보 (자리가 없으면 우선순위 순서대로 대기)
+
+        Args:
+            priority (str): 요청 우선순위 (interactive, bulk)
+            wait (bool): True면 거절하지 않고 자리가 날 때까지 대기
+                (배치 실행기처럼 동시 실행 수가 따로 제한된 호출자용, 대기열 한도에 세지 않고 밀려나지 않음)
+
+        Raises:
+            AdmissionRejected: 대기열이 가득 찼거나, 예상/실제 대기 시간이 max_wait를 넘거나, 더 높은 우선순위 요청에 밀려난 경우
+                (wait=True이면 발생하지 않음)
+            ValueError: 알 수 없는 우선순위인 경우
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"알 수 없는 우선순위입니다: {priority} (사용 가능: {', '.join(PRIORITIES)})")
+        rank = PRIORITIES[priority]
+        with self._condition:
+            ahead = sum(1 for ticket in self._waiting if ticket.priority <= rank)
+            if not ahead and self._in_flight < self.max_concurrency:
+                self._in_flight += 1
+                self._stats["admitted"] += 1
+                return
+
+            ticket = _Ticket(rank, next(self._sequence), self.clock(), patient=wait)
+            if not wait:
+                # 기다려도 제시간에 처리할 수 없으면 바로 거절 (대기열에서 시간 초과될 요청을 받지 않음)
+                estimated = self._estimated_wait(ahead)
+                if estimated > self.max_wait:
+                    raise self._reject(priority, "wait", estimated)
+                queued = sum(1 for waiting in self._waiting if not waiting.patient)
+                if queued >= self.max_queue and not self._shed_lower_priority(rank):
+                    raise self._reject(priority, "queue_full", estimated)
+
+            heapq.heappush(self._waiting, ticket)
+            self._stats["queued"] += 1
+            deadline = ticket.enqueued_at + self.max_wait
+            while not ticket.admitted and not ticket.shed:
+                if wait:
+                    self._condition.wait()
+                    continue
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    raise self._reject(priority, "timeout", self._estimated_wait(ahead))
+                self._condition.wait(remaining)
+            if ticket.shed:
+                raise self._reject(priority, "shed", self._estimated_wait(len(self._waiting)))
+            self._stats["admitted"] += 1
+        metrics.observe("gapfill_admission_wait_seconds", self.clock() - ticket.enqueued_at, priority=priority)
+
+    def release(self, elapsed=None):
+        """
+        요청 처리 완료 기록 및 다음 대기 요청 시작
+
+        Args:
+            elapsed (float, optional): 처리 시간(초) (평균 처리 시간 갱신에 사용)
+        """
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            if elapsed is not None:
+                self._service_time += self.alpha * (elapsed - self._service_time)
+            self._dispatch()
+
+    @contextmanager
+    def admit(self, priority="interactive", wait=False):
+        """
+        with 문으로 요청 처리 자리를 확보하고 끝나면 반환
+
+        Args:
+            priority (str): 요청 우선순위 (interactive, bulk)
+            wait (bool): True면 거절하지 않고 자리가 날 때까지 대기 (acquire() 참고)
+
+        Raises:
+            AdmissionRejected: acquire() 참고
+        """
+        self.acquire(priority, wait)
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.release(self.clock() - started)
+
+    def get_stats(self):
+        """
+        수용 제어 통계
+
+        Returns:
+            dict: 처리 중/대기 중 요청 수, 평균 처리 시간, 우선순위별 예상 대기 시간, 누적 수용/대기/거절 수
+        """
+        with self._condition:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "max_wait": self.max_wait,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiting),
+                "service_time": round(self._service_time, 3),
+                "estimated_wait": {
+                    priority: round(self._estimated_wait(sum(1 for ticket in self._waiting if ticket.priority <= rank)), 3)
+                    for priority, rank in PRIORITIES.items()
+                },
+                **self._stats
+            }
@@ -1,28 +1,449 @@
 import os
 import sys
+import hmac
 import json
-from flask import Flask, render_template, request, jsonify, send_file, make_response
+import random
+import threading
+import time
+from contextlib import nullcontext
+from flask import Flask, Response, g, render_template, request, jsonify, send_file, make_response, stream_with_context
 from werkzeug.utils import secure_filename
 import tempfile
 
-# 상위 디렉토리 추가하여 다른 모듈 import 가능하게 함
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from api.gemini_client import GeminiClient
-from analysis.text_analyzer import TextAnalyzer
-from generator.gapfill_generator import GapfillGenerator
+# 프로젝트 루트를 import 경로에 추가 (cd web && python app.py 로 실행하는 경우)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from api.circuit_breaker import CircuitOpenError
+from generator.models import TIER_NAMES, dumps_msgpack, msgpack, to_serializable
+from monitoring.metrics import metrics, start_request_timings, stop_request_timings
+from monitoring.profiler import ProfileStore, SamplingProfiler
+from passage_bank.ingest import iter_lines, split_passages
+from web.admission import PRIORITIES, AdmissionController, AdmissionRejected
+from web.batch import BatchRunner
+
+try:
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:  # Flask 2.1 이하
+    DefaultJSONProvider = None
+    from flask.json import JSONEncoder
+
+if DefaultJSONProvider is not None:
+    class GapfillJSONProvider(DefaultJSONProvider):
+        """갭필 결과 객체(Passage, Tier)를 직렬화하는 JSON 제공자"""
+        compact = True
+        
+        @staticmethod
+        def default(value):
+            try:
+                return to_serializable(value)
+            except TypeError:
+                return DefaultJSONProvider.default(value)
+else:
+    class GapfillJSONEncoder(JSONEncoder):
+        """갭필 결과 객체(Passage, Tier)를 직렬화하는 JSON 인코더"""
+        
+        def default(self, value):
+            try:
+                return to_serializable(value)
+            except TypeError:
+                return super().default(value)
 
 app = Flask(__name__)
+if DefaultJSONProvider is not None:
+    app.json = GapfillJSONProvider(app)
+else:
+    app.json_encoder = GapfillJSONEncoder
 app.config['SECRET_KEY'] = os.urandom(24)
 app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB 제한
+app.config['BATCH_MAX_ITEMS'] = int(os.environ.get('BATCH_MAX_ITEMS', '100'))  # 배치당 최대 지문 수
+app.config['BATCH_MAX_CONCURRENCY'] = int(os.environ.get('BATCH_MAX_CONCURRENCY', '4'))  # 서버 전체 동시 처리 수
+app.config['STREAM_MAX_PASSAGE_CHARS'] = int(os.environ.get('STREAM_MAX_PASSAGE_CHARS', '20000'))  # 스트리밍 업로드의 지문 하나 최대 길이
+app.config['RESULT_CACHE_MAX_ENTRIES'] = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', '1024'))  # 결과 캐시 최대 항목 수
+app.config['RESULT_CACHE_TTL'] = int(os.environ.get('RESULT_CACHE_TTL', str(24 * 60 * 60)))  # 결과 캐시 유효 시간(초)
+app.config['CORPUS_PATH'] = os.environ.get('GAPFILL_CORPUS_PATH')  # 미리 계산된 지문 코퍼스(sqlite) 경로
+app.config['CHECKPOINT_PATH'] = os.environ.get('GAPFILL_CHECKPOINT_PATH')  # 단계별 체크포인트(sqlite) 경로 (없으면 워커 메모리, 있으면 워커 간 공유)
+app.config['CHECKPOINT_TTL'] = int(os.environ.get('GAPFILL_CHECKPOINT_TTL', '900'))  # 체크포인트 유효 시간(초)
+app.config['CHECKPOINT_MAX_ENTRIES'] = int(os.environ.get('GAPFILL_CHECKPOINT_MAX_ENTRIES', '512'))  # 최대 체크포인트 수
+app.config['PARALLEL_TIERS'] = os.environ.get('GAPFILL_PARALLEL_TIERS', '0') == '1'  # 난이도별 갭필 요청을 동시에 보낼지 여부
+app.config['POSTPROCESS_WORKERS'] = int(os.environ.get('GAPFILL_POSTPROCESS_WORKERS', '0'))  # 응답 파싱/구조화 프로세스 수 (0이면 요청 스레드에서 처리)
+app.config['NEAR_DUPLICATE_THRESHOLD'] = float(os.environ.get('GAPFILL_NEAR_DUPLICATE_THRESHOLD', '0.7'))  # 분석 결과를 재사용할 유사 지문 최소 유사도 (0이면 사용 안 함)
+app.config['TIMING_HEADERS'] = os.environ.get('GAPFILL_TIMING_HEADERS', '0') == '1'  # 모든 응답에 단계별 타이밍 헤더 추가
+app.config['PROFILE_SAMPLE_RATE'] = float(os.environ.get('GAPFILL_PROFILE_SAMPLE_RATE', '0'))  # 자동 프로파일링 요청 비율 (0~1)
+app.config['PROFILE_ALLOW_HEADER'] = os.environ.get('GAPFILL_PROFILE_ALLOW_HEADER', '0') == '1'  # X-Gapfill-Profile 헤더로 프로파일링 허용 (기본값: 사용 안 함)
+app.config['PROFILE_TOKEN'] = os.environ.get('GAPFILL_PROFILE_TOKEN')  # 설정하면 X-Gapfill-Profile 헤더 값과 /api/profiles 요청의 토큰이 일치해야 함
+app.config['PROFILE_INTERVAL'] = float(os.environ.get('GAPFILL_PROFILE_INTERVAL', '0.005'))  # 샘플링 간격(초)
+app.config['PROFILE_FOLDER'] = os.environ.get('GAPFILL_PROFILE_FOLDER', os.path.join(app.config['UPLOAD_FOLDER'], 'gapfill_profiles'))
+app.config['PROFILE_MAX_COUNT'] = int(os.environ.get('GAPFILL_PROFILE_MAX_COUNT', '50'))  # 보관할 최대 프로필 수
+app.config['WORKER_THREADS'] = int(os.environ.get('GUNICORN_THREADS', '4'))  # 워커당 요청 처리 스레드 수 (gunicorn.conf.py의 threads)
+# 동시 생성 수가 요청 스레드 수보다 작아야 요청이 대기열에서 우선순위대로 기다리거나 바로 503을 받음
+# (같거나 크면 수용 제어기에 닿기 전에 gunicorn 대기열에 쌓임). 남는 스레드는 대기 요청, 거절 응답, 조회 API가 사용
+app.config['ADMISSION_CONCURRENCY'] = int(os.environ.get('GAPFILL_ADMISSION_CONCURRENCY', str(max(1, app.config['WORKER_THREADS'] // 2))))  # 워커당 동시 생성 요청 수 (0이면 수용 제어 사용 안 함)
+if app.config['WORKER_THREADS'] > 1 and app.config['ADMISSION_CONCURRENCY'] >= app.config['WORKER_THREADS']:
+    print(f"GAPFILL_ADMISSION_CONCURRENCY({app.config['ADMISSION_CONCURRENCY']})는 GUNICORN_THREADS({app.config['WORKER_THREADS']})보다 작아야 합니다. {app.config['WORKER_THREADS'] - 1}로 조정합니다.")
+    app.config['ADMISSION_CONCURRENCY'] = app.config['WORKER_THREADS'] - 1
+app.config['ADMISSION_QUEUE'] = int(os.environ.get('GAPFILL_ADMISSION_QUEUE', str(max(1, app.config['WORKER_THREADS'] - app.config['ADMISSION_CONCURRENCY'] - 1))))  # 최대 대기 요청 수 (거절 응답용 스레드 하나를 남김)
+app.config['ADMISSION_MAX_WAIT'] = float(os.environ.get('GAPFILL_ADMISSION_MAX_WAIT', '20'))  # 최대 대기 시간(초) (예상 대기 시간이 더 길면 바로 503)
+# 난이도별 동시 생성 스레드 수: 동시에 생성할 수 있는 지문 수(대화형 요청 + 배치) × 난이도 수
+app.config['TIER_WORKERS'] = int(os.environ.get('GAPFILL_TIER_WORKERS', str(
+    len(TIER_NAMES) * ((app.config['ADMISSION_CONCURRENCY'] or app.config['WORKER_THREADS']) + app.config['BATCH_MAX_CONCURRENCY'])
+)))
+
+batch_runner = BatchRunner(app.config['BATCH_MAX_CONCURRENCY'], app.config['BATCH_MAX_ITEMS'])
+profile_store = ProfileStore(app.config['PROFILE_FOLDER'], app.config['PROFILE_MAX_COUNT'])
+admission = None
+if app.config['ADMISSION_CONCURRENCY'] > 0:
+    admission = AdmissionController(
+        app.config['ADMISSION_CONCURRENCY'], app.config['ADMISSION_QUEUE'], app.config['ADMISSION_MAX_WAIT']
+    )
+
+# 컴포넌트는 첫 사용 시 생성 (import 시점에 API 키나 무거운 모듈을 요구하지 않음)
+_components = None
+_components_lock = threading.Lock()
+
+def _create_components():
+    """
+    GeminiClient, TextAnalyzer, GapfillGenerator 인스턴스 생성
+    
+    Returns:
+        dict: 컴포넌트 이름별 인스턴스
+    """
+    # requests 등 무거운 의존성은 실제로 필요할 때 import
+    from api.gemini_client import GeminiClient
+    from analysis.text_analyzer import TextAnalyzer
+    from generator.gapfill_generator import GapfillGenerator
+    from cache.result_cache import ResultCache
+    from cache.checkpoint import StageCheckpoints
+    
+    gemini_client = GeminiClient()
+    text_analyzer = TextAnalyzer(gemini_client)
+    result_cache = ResultCache(app.config['RESULT_CACHE_MAX_ENTRIES'], app.config['RESULT_CACHE_TTL'])
+    
+    corpus_store = None
+    if app.config['CORPUS_PATH']:
+        from passage_bank.store import CorpusStore
+        corpus_store = CorpusStore(app.config['CORPUS_PATH'])
+    
+    similarity_index = None
+    if app.config['NEAR_DUPLICATE_THRESHOLD'] > 0:
+        from passage_bank.similarity import SimilarityIndex
+        similarity_index = SimilarityIndex(app.config['NEAR_DUPLICATE_THRESHOLD'])
+        # 코퍼스에 저장된 지문도 유사 지문 후보로 등록
+        if corpus_store is not None:
+            for fingerprint, text in corpus_store.iter_passages():
+                similarity_index.add(fingerprint, text)
+    
+    worker_pool = None
+    if app.config['POSTPROCESS_WORKERS'] > 0:
+        from generator.worker_pool import PostProcessPool
+        worker_pool = PostProcessPool(app.config['POSTPROCESS_WORKERS'])
+    
+    checkpoints = StageCheckpoints(
+        app.config['CHECKPOINT_PATH'], app.config['CHECKPOINT_TTL'], app.config['CHECKPOINT_MAX_ENTRIES']
+    )
+    
+    gapfill_generator = GapfillGenerator(
+        gemini_client, text_analyzer, result_cache,
+        corpus_store=corpus_store, similarity_index=similarity_index, worker_pool=worker_pool,
+        circuit_breaker=gemini_client.circuit_breaker, checkpoints=checkpoints,
+        parallel_tiers=app.config['PARALLEL_TIERS'], tier_workers=app.config['TIER_WORKERS']
+    )
+    
+    return {
+        'gemini_client': gemini_client,
+        'text_analyzer': text_analyzer,
+        'gapfill_generator': gapfill_generator
+    }
+
+def get_components():
+    """
+    지연 초기화된 컴포넌트 반환 (스레드 안전, 이중 확인 잠금)
+    
+    Returns:
+        dict: 컴포넌트 이름별 인스턴스
+    """
+    global _components
+    if _components is None:
+        with _components_lock:
+            if _components is None:
+                _components = _create_components()
+    return _components
+
+def preload_components():
+    """
+    gunicorn 마스터 프로세스에서 fork 전에 컴포넌트를 미리 생성
+    워커들은 copy-on-write로 메모리 페이지를 공유
+    
+    Returns:
+        bool: 미리 생성 성공 여부
+    """
+    try:
+        get_components()
+        return True
+    except ValueError as e:
+        # API 키가 없으면 워커에서 첫 요청 시 다시 시도
+        print(f"컴포넌트 사전 로드 건너뜀: {e}")
+        return False
+
+def _result_response(payload):
+    """
+    결과 응답 생성 (Accept 헤더가 msgpack을 요청하고 msgpack이 설치되어 있으면 바이너리, 아니면 JSON)
+    같은 요청은 같은 바이트를 반환하므로 본문 해시를 ETag로 붙이고, If-None-Match가 일치하면 본문 없이 304 반환
+    
+    Args:
+        payload (dict): 응답 데이터
+        
+    Returns:
+        Response: 응답
+    """
+    response = None
+    if msgpack is not None:
+        best = request.accept_mimetypes.best_match(['application/json', 'application/x-msgpack', 'application/msgpack'])
+        if best in ('application/x-msgpack', 'application/msgpack'):
+            response = Response(dumps_msgpack(payload), mimetype=best)
+    if response is None:
+        response = jsonify(payload)
+    
+    response.add_etag()
+    response.vary.add('Accept')
+    etag, _ = response.get_etag()
+    if request.if_none_match.contains(etag):
+        metrics.inc('gapfill_http_not_modified_total', endpoint=request.endpoint or 'unknown')
+        return Response(status=304, headers={'ETag': response.headers['ETag'], 'Vary': 'Accept'})
+    return response
+
+def _parse_seed(value):
+    """
+    요청의 변형 시드 파싱 (숫자 문자열은 정수로 변환하여 같은 시드가 같은 결과/캐시 키를 갖도록 함)
+    
+    Args:
+        value (int | str): 요청 값
+        
+    Returns:
+        int | str: 시드 (값이 없으면 None)
+        
+    Raises:
+        ValueError: 정수나 문자열이 아닌 경우
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError("seed는 정수 또는 문자열이어야 합니다.")
+    if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        return int(value)
+    return value
+
+def _parse_tiers(value):
+    """
+    요청의 난이도 목록 파싱 및 검증 ("foundation,expert" 문자열 또는 배열)
+    
+    Args:
+        value (str | list): 요청 값
+        
+    Returns:
+        tuple: 난이도 이름 목록 (값이 없으면 네 가지 모두)
+        
+    Raises:
+        ValueError: 형식이 잘못되었거나 알 수 없는 난이도가 포함된 경우
+    """
+    from generator.gapfill_generator import normalize_tiers
+    
+    if isinstance(value, str):
+        value = value.split(',')
+    if value is not None and not isinstance(value, list):
+        raise ValueError("tiers는 난이도 이름 배열 또는 쉼표로 구분된 문자열이어야 합니다.")
+    return normalize_tiers([str(tier) for tier in value] if value else None)
+
+@app.before_request
+def _start_request_metrics():
+    """요청 계측 시작 (타이밍 헤더는 설정 또는 X-Gapfill-Timing 요청 헤더로 활성화)"""
+    if not metrics.enabled:
+        return
+    g.request_start = time.perf_counter()
+    if app.config['TIMING_HEADERS'] or request.headers.get('X-Gapfill-Timing'):
+        g.request_timings, g.request_timings_token = start_request_timings()
+
+@app.after_request
+def _finish_request_metrics(response):
+    """요청 지표 기록 및 Server-Timing 헤더 추가"""
+    if 'request_start' not in g:
+        return response
+    duration = time.perf_counter() - g.request_start
+    endpoint = request.endpoint or 'unknown'
+    metrics.observe('gapfill_http_request_seconds', duration, endpoint=endpoint)
+    metrics.inc('gapfill_http_requests_total', endpoint=endpoint, status=response.status_code)
+    
+    timings = g.get('request_timings')
+    if timings is not None:
+        # 스트리밍(배치) 응답은 본문 생성 전에 헤더가 전송되므로 요청 전체 시간만 기록됨
+        timings.stages.append(('total', duration))
+        response.headers['Server-Timing'] = timings.server_timing_header()
+        response.headers['X-Gapfill-Usage'] = timings.usage_header()
+    return response
+
+@app.teardown_request
+def _stop_request_metrics(exc):
+    """요청별 측정 컨텍스트 정리"""
+    token = g.pop('request_timings_token', None)
+    if token is not None:
+        try:
+            stop_request_timings(token)
+        except ValueError:
+            # 다른 컨텍스트에서 정리되는 경우 (테스트 클라이언트 등) 무시
+            pass
+
+def _profile_token_matches(value):
+    """
+    프로파일링 토큰 확인 (GAPFILL_PROFILE_TOKEN을 설정하지 않았으면 항상 일치)
+    
+    Args:
+        value (str): 요청의 토큰 값 (없으면 None)
+        
+    Returns:
+        bool: 일치 여부
+    """
+    token = app.config['PROFILE_TOKEN']
+    if not token:
+        return True
+    return value is not None and hmac.compare_digest(value.encode('utf-8'), token.encode('utf-8'))
+
+def _should_profile():
+    """현재 요청의 프로파일링 여부 (요청 헤더 또는 샘플링 비율)"""
+    if request.path.startswith('/api/profiles'):
+        return False
+    if app.config['PROFILE_ALLOW_HEADER'] and request.headers.get('X-Gapfill-Profile'):
+        return _profile_token_matches(request.headers['X-Gapfill-Profile'])
+    rate = app.config['PROFILE_SAMPLE_RATE']
+    return rate > 0 and random.random() < rate
+
+@app.before_request
+def _start_request_profile():
+    """선택된 요청의 샘플링 프로파일링 시작"""
+    if _should_profile():
+        g.profiler = SamplingProfiler(interval=app.config['PROFILE_INTERVAL']).start()
+
+@app.after_request
+def _finish_request_profile(response):
+    """프로파일링 종료 후 저장 (생성된 HTML 파일이 있으면 함께 기록)"""
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    profiler.stop()
+    try:
+        profile_id = profile_store.save(profiler, request.endpoint or 'unknown', {
+            'path': request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'artifact': g.get('artifact_path')
+        })
+        response.headers['X-Gapfill-Profile'] = profile_id
+        # 생성된 HTML 파일 옆에도 같은 프로필 저장 (/download로 함께 받을 수 있음)
+        if g.get('artifact_path'):
+            with open(g.artifact_path + '.profile.folded', 'w', encoding='utf-8') as f:
+                f.write(profiler.collapsed())
+    except OSError as e:
+        print(f"프로필 저장 오류: {e}")
+    return response
+
+@app.teardown_request
+def _stop_request_profile(exc):
+    """처리되지 않은 예외로 after_request가 실행되지 않은 경우 샘플링 스레드 정리"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
+
+@app.route('/api/profiles')
+def list_profiles():
+    """최근 요청 프로필 목록 (호출 스택이 담기므로 공개하지 않음, 토큰을 설정했으면 X-Gapfill-Profile-Token 필요)"""
+    if not _profile_token_matches(request.headers.get('X-Gapfill-Profile-Token')):
+        return jsonify({'error': '프로필을 조회할 권한이 없습니다.'}), 403
+    return jsonify({'profiles': profile_store.list()})
+
+@app.route('/api/profiles/<profile_id>')
+def download_profile(profile_id):
+    """요청 프로필 다운로드 (collapsed stack, flamegraph.pl/speedscope 호환)"""
+    if not _profile_token_matches(request.headers.get('X-Gapfill-Profile-Token')):
+        return jsonify({'error': '프로필을 조회할 권한이 없습니다.'}), 403
+    path = profile_store.path(profile_id)
+    if path is None:
+        return jsonify({'error': '프로필을 찾을 수 없습니다.'}), 404
+    return send_file(path, mimetype='text/plain', as_attachment=True, download_name=f'{profile_id}.folded')
 
-# Gemini API 키 환경 변수 설정
-os.environ["GEMINI_API_KEY"] = os.environ.get("GEMINI_API_KEY", "")
+@app.route('/api/models')
+def model_stats():
+    """작업별 Gemini 모델 설정과 cascade 통계 (상위 모델로 넘어간 비율, 절약한 시간)"""
+    return jsonify(get_components()['gemini_client'].router.get_stats())
 
-# 인스턴스 생성
-gemini_client = GeminiClient()
-text_analyzer = TextAnalyzer(gemini_client)
-gapfill_generator = GapfillGenerator(gemini_client, text_analyzer)
+@app.route('/api/hedging')
+def hedging_stats():
+    """Gemini 요청 헤징 통계 (헤지 요청 수, 헤지가 먼저 끝난 비율)"""
+    hedging = get_components()['gemini_client'].hedging
+    return jsonify({'enabled': hedging is not None, 'tasks': hedging.get_stats() if hedging else {}})
+
+@app.route('/api/keys')
+def key_stats():
+    """API 키별 최근 1분 요청/토큰 사용량과 격리 상태 (키는 마지막 4자리만 표시)"""
+    return jsonify(get_components()['gemini_client'].key_pool.get_stats())
+
+@app.route('/api/circuit')
+def circuit_stats():
+    """Gemini API 회로 차단기 상태"""
+    breaker = get_components()['gemini_client'].circuit_breaker
+    return jsonify({'enabled': breaker is not None, **(breaker.get_stats() if breaker else {})})
+
+def _admitted(priority, wait=False):
+    """
+    생성 작업을 수용 제어 아래에서 실행하는 with 문 컨텍스트
+    
+    Args:
+        priority (str): 요청 우선순위 (interactive, bulk)
+        wait (bool): True면 거절하지 않고 자리가 날 때까지 대기 (배치 실행기 스레드에서 실행하는 일괄 작업용)
+        
+    Returns:
+        contextmanager: 자리를 확보하고 끝나면 반환 (수용 제어를 사용하지 않으면 아무것도 하지 않음)
+    """
+    return admission.admit(priority, wait) if admission is not None else nullcontext()
+
+def _request_priority(default='interactive'):
+    """
+    요청 우선순위 (X-Gapfill-Priority 헤더로 일괄 작업임을 표시할 수 있음, 일괄 작업이 대화형으로 올릴 수는 없음)
+    
+    Args:
+        default (str): 엔드포인트 기본 우선순위
+        
+    Returns:
+        str: 우선순위 (interactive, bulk)
+    """
+    priority = request.headers.get('X-Gapfill-Priority', default)
+    if priority not in PRIORITIES or PRIORITIES[priority] < PRIORITIES[default]:
+        return default
+    return priority
+
+def _overloaded_response(error):
+    """처리할 수 있는 양을 넘었을 때의 503 응답 (대기열에서 기다리지 않고 바로 반환)"""
+    response = jsonify({'error': str(error)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+@app.route('/api/admission')
+def admission_stats():
+    """요청 수용 제어 상태 (처리 중/대기 중 요청 수, 우선순위별 예상 대기 시간)"""
+    return jsonify({'enabled': admission is not None, **(admission.get_stats() if admission else {})})
+
+def _circuit_open_response(error):
+    """회로가 열려 있고 이전 결과도 없을 때의 503 응답"""
+    response = jsonify({'error': str(error)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus 형식 지표 (단계별 소요 시간, Gemini 토큰/바이트 사용량)"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/')
 def index():
@@ -37,13 +458,20 @@ def generate():
         text = request.form.get('text', '')
         if not text:
             return jsonify({'error': '텍스트를 입력해주세요.'}), 400
+        try:
+            tiers = _parse_tiers(','.join(request.form.getlist('tiers')))
+            seed = _parse_seed(request.form.get('seed'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # 갭필 문제 생성
-        result = gapfill_generator.generate(text)
+        # 갭필 문제 생성 (처리할 수 있는 양을 넘으면 바로 503)
+        with _admitted(_request_priority()):
+            result = get_components()['gapfill_generator'].generate(text, tiers, seed)
         
         # 임시 HTML 파일 생성
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.html', dir=app.config['UPLOAD_FOLDER'])
         temp_file_path = temp_file.name
+        g.artifact_path = temp_file_path
         
         # HTML 파일 저장
         with open(temp_file_path, 'w', encoding='utf-8') as f:
@@ -56,6 +484,10 @@ def generate():
             'html_path': temp_file_path
         })
     
+    except AdmissionRejected as e:
+        return _overloaded_response(e)
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
     except Exception as e:
         return jsonify({'error': f'오류가 발생했습니다: {str(e)}'}), 500
 
@@ -92,7 +524,7 @@ def analyze():
             return jsonify({'error': '텍스트를 입력해주세요.'}), 400
         
         # 텍스트 분석
-        analysis_result = text_analyzer.analyze(text)
+        analysis_result = get_components()['text_analyzer'].analyze(text)
         
         # 결과 반환
         return jsonify({
@@ -112,19 +544,128 @@ def gapfill():
         text = data.get('text', '')
         if not text:
             return jsonify({'error': '텍스트를 입력해주세요.'}), 400
+        try:
+            tiers = _parse_tiers(data.get('tiers'))
+            seed = _parse_seed(data.get('seed'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # 갭필 문제 생성
-        result = gapfill_generator.generate(text)
+        # 갭필 문제 생성 (요청한 난이도만, 시드가 없으면 지문별 기본 변형, 처리할 수 있는 양을 넘으면 바로 503)
+        with _admitted(_request_priority()):
+            result = get_components()['gapfill_generator'].generate(text, tiers, seed, as_model=True)
         
         # 결과 반환
-        return jsonify({
+        return _result_response({
             'success': True,
             'gapfill': result['gapfill'],
-            'html': result['html']
+            'html': result['html'],
+            'stale': result.get('stale', False)
+        })
+    
+    except AdmissionRejected as e:
+        return _overloaded_response(e)
+    except CircuitOpenError as e:
+        return _circuit_open_response(e)
+    except Exception as e:
+        return jsonify({'error': f'갭필 문제 생성 중 오류가 발생했습니다: {str(e)}'}), 500
+
+@app.route('/api/gapfill/variant', methods=['POST'])
+def gapfill_variant():
+    """갭필 변형 문제 생성 API (분석 결과 재사용, 시드별 로컬 빈칸 배치)"""
+    try:
+        # 입력 텍스트 가져오기
+        data = request.get_json()
+        text = data.get('text', '')
+        if not text:
+            return jsonify({'error': '텍스트를 입력해주세요.'}), 400
+        try:
+            tiers = _parse_tiers(data.get('tiers'))
+            seed = _parse_seed(data.get('seed'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # 변형 문제 생성
+        result = get_components()['gapfill_generator'].generate_variant(text, 0 if seed is None else seed, tiers, as_model=True)
+        
+        # 결과 반환
+        return _result_response({
+            'success': True,
+            'gapfill': result['gapfill']
         })
     
+    except Exception as e:
+        return jsonify({'error': f'변형 문제 생성 중 오류가 발생했습니다: {str(e)}'}), 500
+
+@app.route('/api/batch/analyze', methods=['POST'])
+def batch_analyze():
+    """여러 지문 일괄 분석 API (NDJSON 스트리밍, 여러 지문을 하나의 Gemini 요청으로 묶어 분석)"""
+    # 요청을 먼저 검증하고 컴포넌트 생성 (API 키가 없는 등 생성에 실패해도 JSON 오류로 응답)
+    try:
+        items = batch_runner.parse_items(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        text_analyzer = get_components()['text_analyzer']
+    except Exception as e:
+        return jsonify({'error': f'분석 중 오류가 발생했습니다: {str(e)}'}), 500
+    
+    def worker(texts):
+        return [{'analysis': analysis} for analysis in text_analyzer.analyze_batch(texts)]
+    
+    return Response(batch_runner.stream(items, worker, text_analyzer.pack_passages), mimetype='application/x-ndjson')
+
+@app.route('/api/batch/gapfill', methods=['POST'])
+def batch_gapfill():
+    """여러 지문 일괄 갭필 문제 생성 API (NDJSON 스트리밍)"""
+    try:
+        items = batch_runner.parse_items(request.get_json(silent=True))
+        tiers = _parse_tiers((request.get_json(silent=True) or {}).get('tiers'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        gapfill_generator = get_components()['gapfill_generator']
+    except Exception as e:
+        return jsonify({'error': f'갭필 문제 생성 중 오류가 발생했습니다: {str(e)}'}), 500
+    
+    def worker(text):
+        # 일괄 작업은 대화형 요청보다 뒤에 처리하되 거절하지 않고 기다림
+        # (배치 실행기가 동시 실행 수를 BATCH_MAX_CONCURRENCY로 제한하고, 요청 스레드가 아닌 배치 스레드에서 기다림)
+        with _admitted('bulk', wait=True):
+            result = gapfill_generator.generate(text, tiers, as_model=True)
+        return {'gapfill': result['gapfill'], 'html': result['html']}
+    
+    return Response(batch_runner.stream(items, worker), mimetype='application/x-ndjson')
+
+@app.route('/api/stream/gapfill', methods=['POST'])
+def stream_gapfill():
+    """
+    대용량 텍스트(시험지 전체 등) 스트리밍 갭필 문제 생성 API (NDJSON 스트리밍)
+    요청 본문을 조각 단위로 읽어 지문별로 나누고, 지문이 나오는 대로 처리하여 결과를 전송
+    (지문 구분: "---" 줄, ?split=paragraph이면 빈 줄도 구분)
+    """
+    try:
+        tiers = _parse_tiers(request.args.get('tiers'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        gapfill_generator = get_components()['gapfill_generator']
     except Exception as e:
         return jsonify({'error': f'갭필 문제 생성 중 오류가 발생했습니다: {str(e)}'}), 500
+    
+    max_chars = app.config['STREAM_MAX_PASSAGE_CHARS']
+    passages = split_passages(
+        iter_lines(request.stream, max_line_chars=max_chars),
+        paragraph=request.args.get('split') == 'paragraph',
+        max_chars=max_chars
+    )
+    
+    def worker(text):
+        with _admitted('bulk', wait=True):
+            result = gapfill_generator.generate(text, tiers, as_model=True)
+        return {'gapfill': result['gapfill'], 'html': result['html']}
+    
+    return Response(stream_with_context(batch_runner.stream_iter(passages, worker)), mimetype='application/x-ndjson')
 
 if __name__ == '__main__':
     # templates 디렉토리 생성
@@ -0,0 +1,240 @@
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+from generator.models import to_serializable
+
+class BatchRunner:
+    """
+    여러 지문을 한 번에 처리하는 배치 실행기
+    동일한 지문은 한 번만 처리하고, 서버 전체 동시 실행 수를 제한하며,
+    완료된 순서대로 결과를 반환
+    """
+
+    def __init__(self, max_concurrency=4, max_items=100):
+        """
+        BatchRunner 초기화
+
+        Args:
+            max_concurrency (int): 서버 전체에서 동시에 처리할 최대 지문 수
+            max_items (int): 배치 하나에 허용되는 최대 지문 수
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_items = max_items
+        # 여러 배치 요청이 동시에 들어와도 전체 동시 실행 수를 제한
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+
+    def parse_items(self, data):
+        """
+        요청 데이터에서 배치 항목 추출
+
+        Args:
+            data (dict): {"passages": [str 또는 {"id": ..., "text": ...}, ...]}
+
+        Returns:
+            list: (index, id, text) 튜플 목록
+
+        Raises:
+            ValueError: 요청 형식이 잘못된 경우
+        """
+        passages = (data or {}).get('passages')
+        if not isinstance(passages, list) or not passages:
+            raise ValueError("passages 배열을 입력해주세요.")
+        if len(passages) > self.max_items:
+            raise ValueError(f"한 번에 최대 {self.max_items}개의 지문까지 처리할 수 있습니다.")
+
+        items = []
+        for index, passage in enumerate(passages):
+            if isinstance(passage, dict):
+                items.append((index, passage.get('id', index), passage.get('text') or ''))
+            else:
+                items.append((index, index, passage if isinstance(passage, str) else ''))
+        return items
+
+    def run(self, items, worker, packer=None):
+        """
+        배치 항목을 동시에 처리하고 완료 순서대로 결과 반환
+
+        Args:
+            items (list): parse_items()가 반환한 (index, id, text) 목록
+            worker (callable): 지문 하나를 받아 결과 dict를 반환하는 함수.
+                packer가 있으면 지문 목록을 받아 결과 dict 목록을 반환하는 함수
+            packer (callable, optional): 지문 목록을 요청 단위 묶음 목록으로 나누는 함수
+
+        Yields:
+            dict: 지문별 처리 결과 (실패 시 success=False와 오류 메시지)
+        """
+        # 동일한 지문 묶기
+        groups = OrderedDict()
+        for index, item_id, text in items:
+            key = text.strip()
+            groups.setdefault(key, []).append((index, item_id))
+
+        failed = 0
+
+        # 빈 지문은 바로 오류로 보고
+        empty_members = groups.pop('', None)
+        if empty_members:
+            failed += 1
+            yield self._make_line(empty_members, error='텍스트를 입력해주세요.')
+
+        if groups:
+            # 작업 단위: 지문 하나 또는 packer가 만든 지문 묶음
+            if packer:
+                tasks = [list(chunk) for chunk in packer(list(groups.keys()))]
+            else:
+                tasks = [[text] for text in groups.keys()]
+
+            executor = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(tasks)))
+            futures = {}
+            try:
+                futures = {
+                    executor.submit(self._run_one, worker, texts, packer is not None): texts
+                    for texts in tasks
+                }
+                for future in as_completed(futures):
+                    texts = futures[future]
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        failed += len(texts)
+                        for text in texts:
+                            yield self._make_line(groups[text], error=str(e))
+                        continue
+                    for text, result in zip(texts, results):
+                        yield self._make_line(groups[text], result=result)
+            finally:
+                # 클라이언트 연결이 끊기면 대기 중인 작업 취소
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=False)
+
+        yield {
+            'done': True,
+            'total': len(items),
+            'unique': len(groups) + (1 if empty_members else 0),
+            'failed': failed
+        }
+
+    def run_iter(self, passages, worker):
+        """
+        지문 이터레이터를 읽으면서 처리하고 완료 순서대로 결과 반환
+        처리 중인 지문은 최대 max_concurrency개이므로 메모리 사용량은 입력 전체가 아닌 지문 크기에 비례
+
+        Args:
+            passages (iterable): 지문 이터레이터 (split_passages() 결과 등)
+            worker (callable): 지문 하나를 받아 결과 dict를 반환하는 함수
+
+        Yields:
+            dict: 지문별 처리 결과 (실패 시 success=False와 오류 메시지)
+        """
+        passages = iter(passages)
+        total = 0
+        failed = 0
+        error = None
+        exhausted = False
+
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        pending = {}
+        try:
+            while True:
+                # 처리 중인 지문 수만큼만 입력을 미리 읽음
+                while not exhausted and len(pending) < self.max_concurrency:
+                    try:
+                        text = next(passages)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    except ValueError as e:
+                        error = str(e)
+                        exhausted = True
+                        break
+                    if total >= self.max_items:
+                        error = f"한 번에 최대 {self.max_items}개의 지문까지 처리할 수 있습니다."
+                        exhausted = True
+                        break
+                    pending[executor.submit(self._run_one, worker, [text], False)] = total
+                    total += 1
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        result = future.result()[0]
+                    except Exception as e:
+                        failed += 1
+                        yield self._make_line([(index, index)], error=str(e))
+                        continue
+                    yield self._make_line([(index, index)], result=result)
+        finally:
+            # 클라이언트 연결이 끊기면 대기 중인 작업 취소
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        summary = {'done': True, 'total': total, 'failed': failed}
+        if error:
+            summary['error'] = error
+        yield summary
+
+    def stream(self, items, worker, packer=None):
+        """
+        배치 결과를 NDJSON 줄 단위로 반환
+
+        Args:
+            items (list): parse_items()가 반환한 (index, id, text) 목록
+            worker (callable): 지문(또는 지문 묶음)을 처리하는 함수
+            packer (callable, optional): 지문 목록을 요청 단위 묶음 목록으로 나누는 함수
+
+        Yields:
+            str: JSON 한 줄
+        """
+        return self._ndjson(self.run(items, worker, packer))
+
+    def stream_iter(self, passages, worker):
+        """
+        지문 이터레이터의 처리 결과를 NDJSON 줄 단위로 반환
+
+        Args:
+            passages (iterable): 지문 이터레이터
+            worker (callable): 지문 하나를 처리하는 함수
+
+        Yields:
+            str: JSON 한 줄
+        """
+        return self._ndjson(self.run_iter(passages, worker))
+
+    def _ndjson(self, lines):
+        """
+        결과 dict를 JSON 한 줄씩 변환
+        """
+        for line in lines:
+            yield json.dumps(line, ensure_ascii=False, default=to_serializable) + "\n"
+
+    def _run_one(self, worker, texts, grouped):
+        """
+        동시 실행 제한 하에서 작업 하나(지문 하나 또는 지문 묶음) 처리
+        """
+        with self._semaphore:
+            if grouped:
+                return worker(texts)
+            return [worker(texts[0])]
+
+    def _make_line(self, members, result=None, error=None):
+        """
+        결과 한 줄 생성 (중복 지문은 모든 index/id를 함께 보고)
+        """
+        line = {
+            'indices': [index for index, _ in members],
+            'ids': [item_id for _, item_id in members],
+            'success': error is None
+        }
+        if error is None:
+            line.update(result or {})
+        else:
+            line['error'] = error
+        return line